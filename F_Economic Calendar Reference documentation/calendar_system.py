@@ -7,21 +7,40 @@ Converting Excel-VBA system to pure Python solution
 import asyncio
 from typing import Any, Dict, List, Optional
 import re
+import bisect
+import difflib
+import hashlib
+import heapq
+import itertools
 import logging
+import os
+import csv
+import mmap
+import socket
+import struct
 import sqlite3
+import queue
 import json
-from datetime import datetime, timedelta
+import time
+from abc import ABC, abstractmethod
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, asdict, field
 from enum import Enum
+from zoneinfo import ZoneInfo
 
 # Try importing optional dependencies
 try:
     import pandas as pd
+    PANDAS_AVAILABLE = True
 except ImportError:
     print("pandas not available - using basic CSV parsing")
     pd = None
+    PANDAS_AVAILABLE = False
     
     # Basic CSV parsing fallback
     import csv
@@ -131,6 +150,14 @@ except ImportError:
     print("websockets not available - real-time updates disabled")
     websockets = None
 
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    print("watchdog not available - calendar downloads are polled")
+    Observer = None
+    FileSystemEventHandler = object
+
 # ============================================================================
 # CONFIGURATION MANAGEMENT (Replaces Excel Named Ranges)
 # ============================================================================
@@ -203,8 +230,11 @@ class SystemConfig(BaseModel):
     retry_interval_hours: int = 1
     max_retry_attempts: int = 24
     import_timeout_seconds: int = 30
+    import_mode: str = "best"  # "best" = newest file only, "merge" = all matching files
+    merge_title_similarity: float = 0.8  # Fuzzy title match ratio for merging sources
     
     # Processing Configuration  
+    calendar_timezone: str = ""  # IANA zone of calendar date/time columns, "" = system local time
     anticipation_hours: List[int] = [1, 2, 4]
     anticipation_enabled: bool = True
     minimum_gap_minutes: int = 30
@@ -225,14 +255,30 @@ class SystemConfig(BaseModel):
         4: {"lot_size": 0.04, "stop_loss": 20, "take_profit": 40, "buy_distance": 10, "sell_distance": 10}
     }
     
+    # Download Watching
+    watch_downloads: bool = False  # Import new calendar files as they land in downloads_path
+    watch_debounce_seconds: float = 2.0  # Quiet period before a written file is imported
+    
     # File Paths
     downloads_path: str = "~/Downloads"
     archive_path: str = "./calendar_archive"
     signals_export_path: str = "./signals"
     database_path: str = "./calendar_system.db"
     
+    # Signal Export
+    signal_sinks: List[str] = ["csv"]  # Any of "csv", "journal", "ring", "socket"
+    signal_journal_file: str = "signals.journal"  # NDJSON journal, relative to signals_export_path
+    signal_ring_file: str = "signals.ring"  # Memory-mapped ring buffer, relative to signals_export_path
+    signal_ring_bytes: int = 1 << 20
+    signal_socket_address: str = ""  # Unix socket path or host:port
+    signal_batch_size: int = 64
+    signal_flush_interval_ms: int = 5  # How long a batch waits for more signals
+    
+    # Database
+    database_pool_size: int = 4  # Persistent connections / executor threads
+    
     # Monitoring
-    monitor_interval_seconds: int = 15
+    monitor_interval_seconds: int = 15  # Longest trigger-scheduler sleep (absorbs wall-clock changes)
     health_check_interval_minutes: int = 5
 
 # ============================================================================
@@ -272,6 +318,7 @@ class CalendarEvent:
     status: EventStatus = EventStatus.PENDING
     quality_score: int = 0
     processing_notes: str = ""
+    id: Optional[int] = None  # Database row id, set when loaded from the database
 
 @dataclass
 class TradingSignal:
@@ -294,16 +341,141 @@ class TradingSignal:
 # DATABASE MANAGER (Replaces Excel DataStore)
 # ============================================================================
 
+class SQLiteConnectionPool:
+    """Fixed-size pool of persistent SQLite connections
+    
+    File databases are opened in WAL mode so readers (the event monitor) and the
+    writer (signal/event saves) no longer block each other. An in-memory database
+    only exists inside its connection, so ":memory:" always gets a single connection.
+    """
+    
+    def __init__(self, db_path: str, size: int = 4, timeout: float = 30.0):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.size = 1 if db_path == ":memory:" else max(1, size)
+        self._idle: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._all: List[sqlite3.Connection] = []
+        for _ in range(self.size):
+            conn = self._connect()
+            self._all.append(conn)
+            self._idle.put(conn)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open one connection; sqlite3 keeps a per-connection cache of prepared statements"""
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False,
+                               cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        if self.db_path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of the block"""
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+    
+    def close(self):
+        """Close every pooled connection"""
+        for conn in self._all:
+            conn.close()
+        self._all.clear()
+
 class DatabaseManager:
-    """SQLite database replacing Excel data storage"""
+    """SQLite database replacing Excel data storage
+    
+    Queries run on a dedicated thread pool against pooled connections, so the
+    async methods never block the event loop.
+    """
+    
+    # Statements are kept as constants so every call reuses the same SQL text and
+    # hits sqlite3's prepared-statement cache on the pooled connection.
+    # Upsert on the natural key; created_at is kept and a re-import never re-arms an
+    # event that has already left PENDING/READY.
+    SQL_SAVE_EVENT = """
+        INSERT INTO calendar_events 
+        (title, country, event_date, event_time, impact, forecast, previous, url,
+         event_type, trigger_time, parameter_set, enabled, status, quality_score, processing_notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (title, country, event_date, event_time) DO UPDATE SET
+            impact = excluded.impact,
+            forecast = excluded.forecast,
+            previous = excluded.previous,
+            url = excluded.url,
+            event_type = excluded.event_type,
+            trigger_time = excluded.trigger_time,
+            parameter_set = excluded.parameter_set,
+            enabled = excluded.enabled,
+            status = CASE WHEN calendar_events.status IN ('PENDING', 'READY')
+                          THEN excluded.status ELSE calendar_events.status END,
+            quality_score = excluded.quality_score,
+            processing_notes = excluded.processing_notes,
+            updated_at = CURRENT_TIMESTAMP
+    """
+    
+    SQL_EVENT_KEYS_BETWEEN = """
+        SELECT id, status, title, country, event_date, event_time FROM calendar_events
+        WHERE event_date BETWEEN ? AND ?
+    """
+    
+    SQL_DELETE_EVENT = "DELETE FROM calendar_events WHERE id = ?"
+    
+    SQL_FILE_IMPORTED = "SELECT 1 FROM imported_files WHERE content_hash = ?"
+    
+    SQL_RECORD_FILE = """
+        INSERT OR REPLACE INTO imported_files (content_hash, file_path, event_count)
+        VALUES (?, ?, ?)
+    """
+    
+    SQL_UPDATE_STATUS = """
+        UPDATE calendar_events SET status = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """
+    
+    SQL_ACTIVE_EVENTS = """
+        SELECT * FROM calendar_events 
+        WHERE enabled = TRUE AND status IN ('PENDING', 'READY')
+        AND datetime(event_date || ' ' || event_time) > datetime('now')
+        ORDER BY event_date, event_time
+    """
+    
+    SQL_SAVE_SIGNAL = """
+        INSERT INTO trading_signals 
+        (symbol, buy_distance, sell_distance, stop_loss, take_profit, lot_size,
+         expire_hours, trailing_stop, comment, strategy_id, parameter_set_id,
+         timestamp, event_title)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool_size: int = 4):
         self.db_path = db_path
+        self.pool = SQLiteConnectionPool(db_path, pool_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.pool.size, thread_name_prefix="calendar-db")
         self.init_database()
     
+    def _execute(self, fn, *args):
+        """Run fn(conn, *args) in a transaction on a pooled connection"""
+        with self.pool.connection() as conn:
+            with conn:
+                return fn(conn, *args)
+    
+    async def _run(self, fn, *args):
+        """Run a database function on the database executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._execute, fn, *args)
+    
+    def close(self):
+        """Stop the executor and close pooled connections"""
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+    
     def init_database(self):
         """Initialize database tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.pool.connection() as conn, conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS calendar_events (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -361,81 +533,183 @@ class DatabaseManager:
                     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS imported_files (
+                    content_hash TEXT PRIMARY KEY,
+                    file_path TEXT,
+                    event_count INTEGER,
+                    imported_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Natural key for upserts; collapse duplicates left by the old insert-only path first
+            conn.execute("""
+                DELETE FROM calendar_events WHERE id NOT IN (
+                    SELECT MAX(id) FROM calendar_events
+                    GROUP BY title, country, event_date, event_time
+                )
+            """)
+            conn.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_calendar_events_natural_key
+                ON calendar_events (title, country, event_date, event_time)
+            """)
     
     async def save_events(self, events: List[CalendarEvent]):
-        """Save calendar events to database"""
-        with sqlite3.connect(self.db_path) as conn:
-            for event in events:
-                conn.execute("""
-                    INSERT OR REPLACE INTO calendar_events 
-                    (title, country, event_date, event_time, impact, forecast, previous, url,
-                     event_type, trigger_time, parameter_set, enabled, status, quality_score, processing_notes)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    event.title, event.country, event.date.date(), event.time,
-                    event.impact, event.forecast, event.previous, event.url,
-                    event.event_type.value, event.trigger_time, event.parameter_set,
-                    event.enabled, event.status.value, event.quality_score, event.processing_notes
-                ))
+        """Upsert calendar events in one executemany batch
+        
+        Events without an id get the row id and the stored status filled in, since an
+        upsert may have kept a status the event had already moved on to.
+        """
+        await self._run(self._save_events, events)
+    
+    def _save_events(self, conn: sqlite3.Connection, events: List[CalendarEvent]):
+        conn.executemany(self.SQL_SAVE_EVENT, [(
+            event.title, event.country, event.date.date(), event.time,
+            event.impact, event.forecast, event.previous, event.url,
+            event.event_type.value, event.trigger_time, event.parameter_set,
+            event.enabled, event.status.value, event.quality_score, event.processing_notes
+        ) for event in events])
+        
+        # Read back ids and stored statuses with one query over the batch's date span
+        unsaved = [event for event in events if event.id is None]
+        if not unsaved:
+            return
+        dates = [event.date.date() for event in unsaved]
+        stored = {
+            (row['title'], row['country'], row['event_date'], row['event_time']): row
+            for row in conn.execute(self.SQL_EVENT_KEYS_BETWEEN, (min(dates), max(dates)))
+        }
+        for event in unsaved:
+            row = stored.get((event.title, event.country, event.date.date().isoformat(), event.time))
+            if row:
+                event.id = row['id']
+                event.status = EventStatus(row['status'])
+    
+    async def delete_events(self, event_ids: List[int]) -> int:
+        """Delete events by id"""
+        return await self._run(self._delete_events, event_ids)
+    
+    def _delete_events(self, conn: sqlite3.Connection, event_ids: List[int]) -> int:
+        cursor = conn.executemany(self.SQL_DELETE_EVENT, [(event_id,) for event_id in event_ids])
+        return cursor.rowcount
+    
+    async def is_file_imported(self, content_hash: str) -> bool:
+        """Check whether a calendar file with this content was already imported"""
+        return await self._run(self._is_file_imported, content_hash)
+    
+    def _is_file_imported(self, conn: sqlite3.Connection, content_hash: str) -> bool:
+        return conn.execute(self.SQL_FILE_IMPORTED, (content_hash,)).fetchone() is not None
+    
+    async def record_file_import(self, content_hash: str, file_path: Path, event_count: int):
+        """Remember an imported calendar file by content hash"""
+        await self._run(self._record_file_import, content_hash, file_path, event_count)
+    
+    def _record_file_import(self, conn: sqlite3.Connection, content_hash: str, file_path: Path, event_count: int):
+        conn.execute(self.SQL_RECORD_FILE, (content_hash, str(file_path), event_count))
+    
+    async def update_status(self, event_ids: List[int], status: EventStatus) -> int:
+        """Set the status of events by id without rewriting the rest of the row"""
+        return await self._run(self._update_status, event_ids, status)
+    
+    def _update_status(self, conn: sqlite3.Connection, event_ids: List[int], status: EventStatus) -> int:
+        cursor = conn.executemany(self.SQL_UPDATE_STATUS, [(status.value, event_id) for event_id in event_ids])
+        return cursor.rowcount
     
     async def get_active_events(self) -> List[CalendarEvent]:
         """Get active events for monitoring"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT * FROM calendar_events 
-                WHERE enabled = TRUE AND status IN ('PENDING', 'READY')
-                AND datetime(event_date || ' ' || event_time) > datetime('now')
-                ORDER BY event_date, event_time
-            """)
-            
-            events = []
-            for row in cursor.fetchall():
-                event = CalendarEvent(
-                    title=row['title'],
-                    country=row['country'],
-                    date=datetime.fromisoformat(row['event_date']),
-                    time=row['event_time'],
-                    impact=row['impact'],
-                    forecast=row['forecast'],
-                    previous=row['previous'],
-                    url=row['url'],
-                    event_type=EventType(row['event_type']),
-                    trigger_time=datetime.fromisoformat(row['trigger_time']) if row['trigger_time'] else None,
-                    parameter_set=row['parameter_set'],
-                    enabled=bool(row['enabled']),
-                    status=EventStatus(row['status']),
-                    quality_score=row['quality_score'],
-                    processing_notes=row['processing_notes']
-                )
-                events.append(event)
-            
-            return events
+        return await self._run(self._get_active_events)
+    
+    @staticmethod
+    def _stored_time(value: Optional[str]) -> Optional[datetime]:
+        """Aware datetime from a stored ISO string; older rows hold naive system-local times"""
+        if not value:
+            return None
+        parsed = datetime.fromisoformat(value)
+        return parsed if parsed.tzinfo is not None else parsed.astimezone()
+    
+    def _get_active_events(self, conn: sqlite3.Connection) -> List[CalendarEvent]:
+        events = []
+        for row in conn.execute(self.SQL_ACTIVE_EVENTS).fetchall():
+            event = CalendarEvent(
+                title=row['title'],
+                country=row['country'],
+                date=datetime.fromisoformat(row['event_date']),
+                time=row['event_time'],
+                impact=row['impact'],
+                forecast=row['forecast'],
+                previous=row['previous'],
+                url=row['url'],
+                event_type=EventType(row['event_type']),
+                trigger_time=self._stored_time(row['trigger_time']),
+                parameter_set=row['parameter_set'],
+                enabled=bool(row['enabled']),
+                status=EventStatus(row['status']),
+                quality_score=row['quality_score'],
+                processing_notes=row['processing_notes'],
+                id=row['id']
+            )
+            events.append(event)
+        
+        return events
     
     async def save_signal(self, signal: TradingSignal):
         """Save trading signal to database"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO trading_signals 
-                (symbol, buy_distance, sell_distance, stop_loss, take_profit, lot_size,
-                 expire_hours, trailing_stop, comment, strategy_id, parameter_set_id,
-                 timestamp, event_title)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                signal.symbol, signal.buy_distance, signal.sell_distance,
-                signal.stop_loss, signal.take_profit, signal.lot_size,
-                signal.expire_hours, signal.trailing_stop, signal.comment,
-                signal.strategy_id, signal.parameter_set_id, signal.timestamp,
-                signal.event_title
-            ))
+        await self._run(self._save_signal, signal)
+    
+    def _save_signal(self, conn: sqlite3.Connection, signal: TradingSignal):
+        conn.execute(self.SQL_SAVE_SIGNAL, (
+            signal.symbol, signal.buy_distance, signal.sell_distance,
+            signal.stop_loss, signal.take_profit, signal.lot_size,
+            signal.expire_hours, signal.trailing_stop, signal.comment,
+            signal.strategy_id, signal.parameter_set_id, signal.timestamp,
+            signal.event_title
+        ))
 
 # ============================================================================
 # CALENDAR IMPORT ENGINE (Replaces calendar_import_engine.bas)
 # ============================================================================
 
+@dataclass
+class EventDiff:
+    """Difference between the stored active events and a fresh import"""
+    inserted: List[CalendarEvent] = field(default_factory=list)
+    changed: List[Tuple[CalendarEvent, CalendarEvent]] = field(default_factory=list)  # (stored, incoming)
+    removed: List[CalendarEvent] = field(default_factory=list)
+    
+    def __bool__(self) -> bool:
+        return bool(self.inserted or self.changed or self.removed)
+
 class CalendarImportEngine:
     """Calendar import and processing system"""
     
+    REQUIRED_FIELDS = ('title', 'country', 'date', 'time', 'impact')
+    
+    CALENDAR_FILE_PATTERNS = [
+        "ff_calendar*.csv",  # ForexFactory - highest priority
+        "*calendar*thisweek*.csv",
+        "*economic*calendar*.csv", 
+        "*calendar*.csv",
+        "*forex*.csv"
+    ]
+    
+    COUNTRY_CODE_MAP = {
+        'US': 'USD', 'USA': 'USD', 'UNITED STATES': 'USD',
+        'EU': 'EUR', 'EURO': 'EUR', 'EUROZONE': 'EUR', 
+        'UK': 'GBP', 'GB': 'GBP', 'BRITAIN': 'GBP',
+        'JP': 'JPY', 'JAPAN': 'JPY',
+        'CA': 'CAD', 'CANADA': 'CAD',
+        'AU': 'AUD', 'AUSTRALIA': 'AUD',
+        'NZ': 'NZD', 'NEW ZEALAND': 'NZD',
+        'CH': 'CHF', 'SWITZERLAND': 'CHF'
+    }
+    
+    IMPACT_MAP = {
+        'HIGH': 'High', 'H': 'High', '3': 'High',
+        'MEDIUM': 'Medium', 'MED': 'Medium', 'M': 'Medium', '2': 'Medium',
+        'LOW': 'Low', 'L': 'Low', '1': 'Low'
+    }
+    
     def __init__(self, config: SystemConfig, db_manager: DatabaseManager):
         self.config = config
         try:
@@ -449,50 +723,230 @@ class CalendarImportEngine:
         """Find calendar CSV files in downloads folder"""
         downloads_path = Path(self.config.downloads_path).expanduser()
         
-        patterns = [
-            "ff_calendar*.csv",  # ForexFactory - highest priority
-            "*calendar*thisweek*.csv",
-            "*economic*calendar*.csv", 
-            "*calendar*.csv",
-            "*forex*.csv"
-        ]
-        
         found_files = []
-        for pattern in patterns:
+        for pattern in self.CALENDAR_FILE_PATTERNS:
             files = list(downloads_path.glob(pattern))
             if files:
                 # Sort by modification time, newest first
                 files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-                found_files.extend(files)
+                # A file matching several patterns keeps its highest-priority position
+                found_files.extend(f for f in files if f not in found_files)
         
         return found_files
     
+    async def fingerprint_file(self, file_path: Path) -> str:
+        """SHA-256 of the file contents, hashed off the event loop"""
+        def digest() -> str:
+            sha = hashlib.sha256()
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 16), b''):
+                    sha.update(chunk)
+            return sha.hexdigest()
+        
+        return await asyncio.to_thread(digest)
+    
+    @staticmethod
+    def event_key(event: CalendarEvent) -> Tuple:
+        """Natural key of an event, matching the database unique index"""
+        return (event.title, event.country, event.date.date(), event.time)
+    
+    @staticmethod
+    def _event_content(event: CalendarEvent) -> Tuple:
+        return (event.impact, event.forecast, event.previous, event.url, event.event_type,
+                event.trigger_time, event.parameter_set, event.enabled, event.quality_score,
+                event.processing_notes)
+    
+    def diff_events(self, stored: List[CalendarEvent], incoming: List[CalendarEvent]) -> EventDiff:
+        """Compare processed events from a file with the stored active events
+        
+        Only pending events on the days the file covers can be reported as removed,
+        so a file for next week never drops what is left of this one.
+        """
+        diff = EventDiff()
+        stored_by_key = {self.event_key(event): event for event in stored}
+        incoming_keys = set()
+        
+        for event in incoming:
+            key = self.event_key(event)
+            incoming_keys.add(key)
+            current = stored_by_key.get(key)
+            if current is None:
+                diff.inserted.append(event)
+            elif self._event_content(current) != self._event_content(event):
+                diff.changed.append((current, event))
+        
+        if incoming:
+            first_day = min(event.date.date() for event in incoming)
+            last_day = max(event.date.date() for event in incoming)
+            diff.removed = [
+                event for key, event in stored_by_key.items()
+                if key not in incoming_keys and event.status == EventStatus.PENDING
+                and first_day <= event.date.date() <= last_day
+            ]
+        
+        return diff
+    
+    @staticmethod
+    def _normalize_title(title: str) -> str:
+        """Lowercase alphanumeric title without period qualifiers such as (MoM) or y/y"""
+        title = re.sub(r"\([^)]*\)|\b[mqy]/[mqy]\b", " ", title.lower())
+        return re.sub(r"[^a-z0-9]+", "", title)
+    
+    @staticmethod
+    def _merge_bucket(event: CalendarEvent) -> Tuple:
+        """Country and release timestamp an event is indexed under when merging"""
+        try:
+            release = datetime.combine(event.date.date(), datetime.strptime(event.time, "%H:%M").time())
+        except ValueError:
+            release = (event.date.date(), event.time.strip().lower())
+        return (event.country, release)
+    
+    def merge_events(self, sources: List[List[CalendarEvent]]) -> List[CalendarEvent]:
+        """Merge events from several sources, keeping one record per real event
+        
+        Events are indexed by (country, release timestamp); within a bucket titles
+        match when their normalized forms are similar enough. The record with the
+        highest quality_score wins, earlier sources win ties.
+        """
+        index: Dict[Tuple, List[List]] = {}  # bucket -> [[normalized title, event], ...]
+        merged_count = 0
+        
+        for events in sources:
+            for event in events:
+                title = self._normalize_title(event.title)
+                bucket = index.setdefault(self._merge_bucket(event), [])
+                for entry in bucket:
+                    if entry[0] == title or difflib.SequenceMatcher(None, entry[0], title).ratio() >= self.config.merge_title_similarity:
+                        merged_count += 1
+                        if event.quality_score > entry[1].quality_score:
+                            entry[1] = event
+                        break
+                else:
+                    bucket.append([title, event])
+        
+        merged = [entry[1] for bucket in index.values() for entry in bucket]
+        self.logger.info(f"Merged {len(sources)} sources into {len(merged)} events ({merged_count} duplicates dropped)")
+        return merged
+    
     async def parse_calendar_csv(self, file_path: Path) -> List[CalendarEvent]:
-        """Parse calendar CSV file"""
+        """Parse calendar CSV file on a worker thread"""
+        return await asyncio.to_thread(self._read_calendar_csv, file_path)
+    
+    async def parse_calendar_files(self, file_paths: List[Path]) -> List[List[CalendarEvent]]:
+        """Parse several calendar files concurrently, one event list per file"""
+        return list(await asyncio.gather(*(self.parse_calendar_csv(path) for path in file_paths)))
+    
+    def _read_calendar_csv(self, file_path: Path) -> List[CalendarEvent]:
+        """Read and parse one calendar CSV; failures are logged and yield no events"""
         try:
-            # Read CSV with pandas
-            df = pd.read_csv(file_path)
+            if not PANDAS_AVAILABLE:
+                return self._parse_csv_rows(pd.read_csv(file_path), file_path)
+            
+            # Read every cell as text so whole columns can be normalized at once
+            df = pd.read_csv(file_path, dtype=str, keep_default_na=False)
             
             # Flexible column mapping
             column_mapping = self._map_csv_columns(df.columns.tolist())
             
-            events = []
-            for _, row in df.iterrows():
-                try:
-                    event = self._parse_csv_row(row, column_mapping)
-                    if event:
-                        events.append(event)
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse row: {e}")
-                    continue
+            events, rejections = self._parse_csv_frame(df, column_mapping)
+            for row_index, reason in rejections:
+                self.logger.warning(f"Rejected row {row_index} of {file_path.name}: {reason}")
             
-            self.logger.info(f"Parsed {len(events)} events from {file_path}")
+            self.logger.info(f"Parsed {len(events)} events from {file_path} ({len(rejections)} rows rejected)")
             return events
             
         except Exception as e:
             self.logger.error(f"Failed to parse CSV {file_path}: {e}")
             return []
     
+    def _parse_csv_rows(self, df, file_path: Path) -> List[CalendarEvent]:
+        """Row-by-row parse used when pandas is not installed"""
+        columns = list(df.data[0].keys()) if df.data else []
+        column_mapping = self._map_csv_columns(columns)
+        
+        events = []
+        for _, row in df.iterrows():
+            try:
+                event = self._parse_csv_row(row, column_mapping)
+                if event:
+                    events.append(event)
+            except Exception as e:
+                self.logger.warning(f"Failed to parse row: {e}")
+                continue
+        
+        self.logger.info(f"Parsed {len(events)} events from {file_path}")
+        return events
+    
+    def _parse_csv_frame(self, df: "pd.DataFrame", column_mapping: Dict[str, str]) -> Tuple[List[CalendarEvent], List[Tuple[int, str]]]:
+        """Columnar parse of a text-typed DataFrame
+        
+        Returns the parsed events and (row index, reason) for every rejected row.
+        """
+        def text(column: Optional[str]) -> "pd.Series":
+            if column is None or column not in df.columns:
+                return pd.Series("", index=df.index, dtype=object)
+            return df[column].fillna("").astype(str).str.strip()
+        
+        fields = {name: text(column_mapping.get(name)) for name in self.REQUIRED_FIELDS}
+        forecast, previous, url = text('forecast'), text('previous'), text('url')
+        
+        # Required fields
+        missing = pd.DataFrame({name: values == "" for name, values in fields.items()})
+        has_all = ~missing.any(axis=1)
+        
+        # Dates: one vectorized pass, then per-value parsing only for the leftovers
+        # (pandas infers a single format per column, mixed-format files fall through)
+        date_str = fields['date'].where(has_all)
+        dates = pd.to_datetime(date_str, errors='coerce')
+        retry = dates.isna() & has_all
+        if retry.any():
+            dates = dates.astype(object)
+            dates[retry] = date_str[retry].map(lambda value: pd.to_datetime(value, errors='coerce'))
+            dates = pd.to_datetime(dates, errors='coerce')
+        valid = has_all & dates.notna()
+        
+        rejections = []
+        for row_index in df.index[~valid]:
+            if has_all[row_index]:
+                rejections.append((row_index, f"unparseable date '{fields['date'][row_index]}'"))
+            else:
+                absent = missing.columns[missing.loc[row_index]].tolist()
+                rejections.append((row_index, f"missing {', '.join(absent)}"))
+        
+        # Standardize country codes and impact levels
+        country = fields['country'].str.upper()
+        country = country.map(self.COUNTRY_CODE_MAP).fillna(country)
+        impact = fields['impact'].str.upper().map(self.IMPACT_MAP).fillna('Medium')
+        
+        # Quality scores, same weights as _calculate_quality_score
+        score = sum((values != "").astype(int) * 20 for values in fields.values())
+        score += sum((values != "").astype(int) * 5 for values in (forecast, previous, url))
+        score += (fields['title'].str.len() > 20).astype(int) * 5
+        score += impact.map({'High': 10, 'Medium': 5}).fillna(0).astype(int)
+        score = score.clip(upper=100)
+        
+        events = [
+            CalendarEvent(
+                title=row_title,
+                country=row_country,
+                date=row_date,
+                time=row_time,
+                impact=row_impact,
+                forecast=row_forecast or None,
+                previous=row_previous or None,
+                url=row_url or None,
+                quality_score=int(row_score)
+            )
+            for row_title, row_country, row_date, row_time, row_impact,
+                row_forecast, row_previous, row_url, row_score in zip(
+                fields['title'][valid], country[valid], dates[valid].dt.to_pydatetime(),
+                fields['time'][valid], impact[valid], forecast[valid], previous[valid],
+                url[valid], score[valid]
+            )
+        ]
+        
+        return events, rejections
+    
     def _map_csv_columns(self, columns: List[str]) -> Dict[str, str]:
         """Map CSV columns to standard fields"""
         column_map = {}
@@ -530,7 +984,7 @@ class CalendarImportEngine:
         
         return column_map
     
-    def _parse_csv_row(self, row: pd.Series, column_mapping: Dict[str, str]) -> Optional[CalendarEvent]:
+    def _parse_csv_row(self, row: "pd.Series", column_mapping: Dict[str, str]) -> Optional[CalendarEvent]:
         """Parse individual CSV row into CalendarEvent"""
         try:
             # Extract required fields
@@ -576,31 +1030,12 @@ class CalendarImportEngine:
     
     def _standardize_country_code(self, country: str) -> str:
         """Convert country to 3-letter currency code"""
-        country_map = {
-            'US': 'USD', 'USA': 'USD', 'UNITED STATES': 'USD',
-            'EU': 'EUR', 'EURO': 'EUR', 'EUROZONE': 'EUR', 
-            'UK': 'GBP', 'GB': 'GBP', 'BRITAIN': 'GBP',
-            'JP': 'JPY', 'JAPAN': 'JPY',
-            'CA': 'CAD', 'CANADA': 'CAD',
-            'AU': 'AUD', 'AUSTRALIA': 'AUD',
-            'NZ': 'NZD', 'NEW ZEALAND': 'NZD',
-            'CH': 'CHF', 'SWITZERLAND': 'CHF'
-        }
-        
         country_upper = country.upper()
-        return country_map.get(country_upper, country_upper)
+        return self.COUNTRY_CODE_MAP.get(country_upper, country_upper)
     
     def _standardize_impact(self, impact: str) -> str:
         """Standardize impact levels"""
-        impact_upper = impact.upper()
-        if impact_upper in ['HIGH', 'H', '3']:
-            return 'High'
-        elif impact_upper in ['MEDIUM', 'MED', 'M', '2']:
-            return 'Medium'
-        elif impact_upper in ['LOW', 'L', '1']:
-            return 'Low'
-        else:
-            return 'Medium'  # Default
+        return self.IMPACT_MAP.get(impact.upper(), 'Medium')  # Default Medium
     
     def _calculate_quality_score(self, event: CalendarEvent) -> int:
         """Calculate data quality score (0-100)"""
@@ -629,41 +1064,100 @@ class CalendarImportEngine:
 # EVENT PROCESSING ENGINE (Replaces calendar_data_processor.bas)
 # ============================================================================
 
+class TriggerSchedule:
+    """Compact, time-sorted trigger schedule
+    
+    trigger_times holds POSIX timestamps in ascending order, parallel to events, so
+    due and upcoming lookups are bisections. Built once per processing run or
+    import and shared read-only by the trigger scheduler and the dashboard.
+    """
+    
+    def __init__(self, events: List[CalendarEvent], reference_time: datetime):
+        scheduled = sorted((event for event in events if event.trigger_time is not None),
+                           key=lambda event: event.trigger_time)
+        self.reference_time = reference_time
+        self.events = scheduled
+        self.trigger_times = array('d', (event.trigger_time.timestamp() for event in scheduled))
+    
+    def __len__(self) -> int:
+        return len(self.events)
+    
+    def due(self, at: datetime) -> List[CalendarEvent]:
+        """Events whose trigger time is at or before `at`"""
+        return self.events[:bisect.bisect_right(self.trigger_times, at.timestamp())]
+    
+    def upcoming(self, at: datetime, limit: Optional[int] = None) -> List[CalendarEvent]:
+        """Events triggering after `at`, earliest first"""
+        start = bisect.bisect_right(self.trigger_times, at.timestamp())
+        return self.events[start:] if limit is None else self.events[start:start + limit]
+
 class EventProcessor:
-    """Process and enhance calendar events"""
+    """Process and enhance calendar events
     
-    def __init__(self, config: SystemConfig):
+    Each run parses every event's release time once into an aware datetime and
+    judges all events against one reference clock, so a run can be replayed by
+    passing the same `now`.
+    """
+    
+    def __init__(self, config: SystemConfig, clock: Optional[Callable[[], datetime]] = None):
         self.config = config
         try:
             ensure_strategy_id_defaults(self.config)
         except Exception:
             pass
+        self.tz = ZoneInfo(config.calendar_timezone) if getattr(config, "calendar_timezone", "") else None
+        self.clock = clock or (lambda: datetime.now(self.tz) if self.tz else datetime.now().astimezone())
+        self.schedule = TriggerSchedule([], self.clock())
         self.logger = logging.getLogger(__name__)
     
-    async def process_events(self, events: List[CalendarEvent]) -> List[CalendarEvent]:
+    def _aware(self, value: datetime) -> datetime:
+        """Attach the calendar timezone to a naive datetime"""
+        if value.tzinfo is not None:
+            return value
+        return value.replace(tzinfo=self.tz) if self.tz else value.astimezone()
+    
+    def _release_time(self, event: CalendarEvent) -> datetime:
+        """Aware release time from the event's date and HH:MM time"""
+        return self._aware(datetime.combine(event.date.date(), datetime.strptime(event.time, "%H:%M").time()))
+    
+    async def process_events(self, events: List[CalendarEvent], now: Optional[datetime] = None) -> List[CalendarEvent]:
         """Main event processing pipeline"""
+        now = self._aware(now if now is not None else self.clock())
+        
+        # Parse release times once
+        timed = []
+        for event in events:
+            try:
+                timed.append((event, self._release_time(event)))
+            except ValueError:
+                self.logger.warning(f"Skipping event with unparseable time '{event.time}': {event.title}")
+        
         # Filter and validate events
-        valid_events = self._filter_events(events)
+        valid_events = self._filter_events(timed, now)
         
         # Generate anticipation events
         if self.config.anticipation_enabled:
-            anticipation_events = self._generate_anticipation_events(valid_events)
+            anticipation_events = self._generate_anticipation_events(valid_events, now)
             valid_events.extend(anticipation_events)
         
         # Calculate trigger times
-        for event in valid_events:
-            event.trigger_time = self._calculate_trigger_time(event)
+        for event, release in valid_events:
+            event.trigger_time = self._trigger_time(event, release)
         
         # Sort chronologically
-        valid_events.sort(key=lambda x: x.trigger_time or datetime.max)
+        processed = [event for event, _ in valid_events]
+        processed.sort(key=lambda x: x.trigger_time)
+        self.schedule = TriggerSchedule(processed, now)
         
-        return valid_events
+        return processed
     
-    def _filter_events(self, events: List[CalendarEvent]) -> List[CalendarEvent]:
+    def _filter_events(self, timed: List[Tuple[CalendarEvent, datetime]], now: datetime) -> List[Tuple[CalendarEvent, datetime]]:
         """Filter events by quality and relevance"""
         filtered = []
+        earliest = now - timedelta(days=1)  # Past events tolerance
+        latest = now + timedelta(days=14)  # Future events range
         
-        for event in events:
+        for event, release in timed:
             # Quality filter
             if event.quality_score < 60:
                 continue
@@ -673,35 +1167,32 @@ class EventProcessor:
                 continue
             
             # Date range filter
-            now = datetime.now()
-            if event.date < now - timedelta(days=1):  # Past events tolerance
-                continue
-            if event.date > now + timedelta(days=14):  # Future events range
+            if not earliest <= release <= latest:
                 continue
             
-            filtered.append(event)
+            filtered.append((event, release))
         
         return filtered
     
-    def _generate_anticipation_events(self, events: List[CalendarEvent]) -> List[CalendarEvent]:
+    def _generate_anticipation_events(self, timed: List[Tuple[CalendarEvent, datetime]], now: datetime) -> List[Tuple[CalendarEvent, datetime]]:
         """Generate anticipation events"""
         anticipation_events = []
         
-        for event in events:
+        for event, release in timed:
             if event.impact != 'High':  # Only for high impact events
                 continue
                 
             for hours_offset in self.config.anticipation_hours:
-                anticipation_time = event.date - timedelta(hours=hours_offset)
+                anticipation_time = release - timedelta(hours=hours_offset)
                 
                 # Skip if anticipation time is in the past
-                if anticipation_time < datetime.now():
+                if anticipation_time < now:
                     continue
                 
                 anticipation_event = CalendarEvent(
                     title=f"#{hours_offset}H Before {event.title} Anticipation - {event.country} - {event.impact}",
                     country=event.country,
-                    date=anticipation_time,
+                    date=anticipation_time.replace(tzinfo=None),
                     time=anticipation_time.strftime("%H:%M"),
                     impact=event.impact,
                     event_type=EventType.ANTICIPATION,
@@ -709,28 +1200,27 @@ class EventProcessor:
                     processing_notes=f"Anticipation for: {event.title}"
                 )
                 
-                anticipation_events.append(anticipation_event)
+                anticipation_events.append((anticipation_event, anticipation_time))
         
         return anticipation_events
     
-    def _calculate_trigger_time(self, event: CalendarEvent) -> datetime:
-        """Calculate trigger time based on event type and impact"""
-        # Get offset from configuration
+    def _trigger_offset(self, event: CalendarEvent) -> int:
+        """Trigger offset in minutes based on event type and impact"""
         if event.event_type == EventType.ANTICIPATION:
-            offset = self.config.trigger_offsets["ANTICIPATION"]
+            return self.config.trigger_offsets["ANTICIPATION"]
         elif event.impact == 'High':
-            offset = self.config.trigger_offsets["EMO-E"]
+            return self.config.trigger_offsets["EMO-E"]
         elif event.impact == 'Medium':
-            offset = self.config.trigger_offsets["EMO-A"]
-        else:
-            offset = -1  # Default 1 minute before
-        
-        # Calculate trigger time
-        event_datetime = datetime.combine(event.date.date(), 
-                                        datetime.strptime(event.time, "%H:%M").time())
-        trigger_time = event_datetime + timedelta(minutes=offset)
-        
-        return trigger_time
+            return self.config.trigger_offsets["EMO-A"]
+        return -1  # Default 1 minute before
+    
+    def _trigger_time(self, event: CalendarEvent, release: datetime) -> datetime:
+        """Aware trigger time, comparable with self.clock() whatever the calendar timezone"""
+        return release + timedelta(minutes=self._trigger_offset(event))
+    
+    def _calculate_trigger_time(self, event: CalendarEvent) -> datetime:
+        """Calculate trigger time based on event type and impact"""
+        return self._trigger_time(event, self._release_time(event))
 
 # ============================================================================
 # SIGNAL GENERATION ENGINE (Replaces event_trigger_engine.bas)
@@ -739,13 +1229,15 @@ class EventProcessor:
 class SignalGenerator:
     """Generate trading signals from calendar events"""
     
-    def __init__(self, config: SystemConfig, db_manager: DatabaseManager):
+    def __init__(self, config: SystemConfig, db_manager: DatabaseManager,
+                 clock: Optional[Callable[[], datetime]] = None):
         self.config = config
         try:
             ensure_strategy_id_defaults(self.config)
         except Exception:
             pass
         self.db = db_manager
+        self.clock = clock or datetime.now
         self.last_parameter_set = 1
         self.logger = logging.getLogger(__name__)
     
@@ -771,7 +1263,7 @@ class SignalGenerator:
             comment=f"Calendar: {event.title[:20]}",
             strategy_id=301,  # Calendar strategy ID
             parameter_set_id=parameter_set_id,
-            timestamp=datetime.now(),
+            timestamp=self.clock(),
             event_title=event.title
         )
         
@@ -797,6 +1289,609 @@ class SignalGenerator:
         }
         return symbol_map.get(country, 'EURUSD')
 
+# ============================================================================
+# SIGNAL OUTBOX (Replaces one-CSV-per-signal export)
+# ============================================================================
+
+@dataclass
+class SignalRecord:
+    """A trading signal with its outbox sequence number"""
+    sequence: int
+    signal: TradingSignal
+    
+    def to_row(self) -> Dict[str, Any]:
+        """Export columns, compatible with python-watchdog.py plus Sequence"""
+        signal = self.signal
+        return {
+            'Sequence': self.sequence,
+            'Symbol': signal.symbol,
+            'BuyDistance': signal.buy_distance,
+            'SellDistance': signal.sell_distance,
+            'StopLoss': signal.stop_loss,
+            'TakeProfit': signal.take_profit,
+            'LotSize': signal.lot_size,
+            'ExpireHours': signal.expire_hours,
+            'TrailingStop': signal.trailing_stop,
+            'Comment': signal.comment,
+            'StrategyID': signal.strategy_id,
+            'ParameterSetID': signal.parameter_set_id,
+            'Timestamp': signal.timestamp.isoformat(),
+            'EventTitle': signal.event_title
+        }
+    
+    def to_json(self) -> bytes:
+        return json.dumps(self.to_row(), separators=(',', ':')).encode('utf-8')
+
+class SignalSink(ABC):
+    """Destination for signal batches
+    
+    write_batch runs on a worker thread and must only return once the batch is as
+    durable as the sink can make it; the outbox acknowledges signals after that.
+    """
+    
+    def last_sequence(self) -> int:
+        """Highest sequence already stored, so numbering survives restarts"""
+        return 0
+    
+    @abstractmethod
+    def write_batch(self, records: List[SignalRecord]):
+        """Store records, in sequence order"""
+    
+    def close(self):
+        pass
+
+class CsvSignalSink(SignalSink):
+    """One CSV per signal for the existing file watcher, named by sequence so
+    signals in the same second no longer overwrite each other
+    
+    Each file is written under a .tmp name, fsync'd and renamed into place, so
+    the watcher never reads a partial CSV and an acknowledged signal survives a
+    crash.
+    """
+    
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+    
+    def write_batch(self, records: List[SignalRecord]):
+        for record in records:
+            row = record.to_row()
+            del row['Sequence']
+            path = self.directory / f"signal_{record.signal.timestamp.strftime('%Y%m%d_%H%M%S')}_{record.sequence:08d}.csv"
+            temp_path = path.with_name(path.name + '.tmp')
+            with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=list(row))
+                writer.writeheader()
+                writer.writerow(row)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        self._sync_directory()
+    
+    def _sync_directory(self):
+        """Persist the renames; directories cannot be opened for fsync on Windows"""
+        if os.name != 'posix':
+            return
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+class JournalSignalSink(SignalSink):
+    """Append-only NDJSON journal, fsync'd once per batch"""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'ab')
+    
+    def last_sequence(self) -> int:
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - 65536))
+            lines = f.read().splitlines()
+        for line in reversed(lines):
+            try:
+                return int(json.loads(line)['Sequence'])
+            except (ValueError, KeyError):
+                continue  # Torn or partial line
+        return 0
+    
+    def write_batch(self, records: List[SignalRecord]):
+        self._file.write(b''.join(record.to_json() + b'\n' for record in records))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    def close(self):
+        self._file.close()
+
+class RingBufferSignalSink(SignalSink):
+    """Fixed-size memory-mapped ring buffer for low-latency local readers
+    
+    Layout: a 32-byte header (magic, data capacity, next write offset, last
+    sequence) followed by the data area. Records are framed as
+    <u32 length><u64 sequence><json>; a length of 0xFFFFFFFF marks a wrap to the
+    start of the data area. The header is updated after the records, so a reader
+    that sees last sequence N can read every record up to N; readers that fall a
+    full lap behind detect it from the sequence numbers.
+    """
+    
+    MAGIC = b"SIGRING1"
+    HEADER = struct.Struct("<8sQQQ")
+    FRAME = struct.Struct("<IQ")
+    WRAP = 0xFFFFFFFF
+    
+    def __init__(self, path: Path, capacity: int):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = self.HEADER.size + capacity
+        with open(path, 'a+b') as f:
+            if os.path.getsize(path) != size:
+                f.truncate(size)
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), size)
+        magic, stored_capacity, self._head, self._last_sequence = self.HEADER.unpack_from(self._map, 0)
+        if magic != self.MAGIC or stored_capacity != capacity:
+            self._head, self._last_sequence = 0, 0
+            self.HEADER.pack_into(self._map, 0, self.MAGIC, capacity, 0, 0)
+        self.capacity = capacity
+    
+    def last_sequence(self) -> int:
+        return self._last_sequence
+    
+    def write_batch(self, records: List[SignalRecord]):
+        base = self.HEADER.size
+        for record in records:
+            payload = record.to_json()
+            length = self.FRAME.size + len(payload)
+            if length > self.capacity:
+                raise ValueError(f"Signal record of {length} bytes exceeds ring capacity {self.capacity}")
+            if self._head + length > self.capacity:
+                if self._head + 4 <= self.capacity:
+                    struct.pack_into("<I", self._map, base + self._head, self.WRAP)
+                self._head = 0
+            self.FRAME.pack_into(self._map, base + self._head, len(payload), record.sequence)
+            self._map[base + self._head + self.FRAME.size:base + self._head + length] = payload
+            self._head += length
+            self._last_sequence = record.sequence
+        self.HEADER.pack_into(self._map, 0, self.MAGIC, self.capacity, self._head, self._last_sequence)
+        self._map.flush()
+    
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+class SocketSignalSink(SignalSink):
+    """NDJSON over a local Unix or TCP socket, reconnecting on the next batch after a failure"""
+    
+    def __init__(self, address: str, timeout: float = 5.0):
+        self.address = address
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+    
+    def _connect(self) -> socket.socket:
+        host, _, port = self.address.rpartition(':')
+        if host and port.isdigit():
+            sock = socket.create_connection((host, int(port)), timeout=self.timeout)
+        else:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.address)
+        return sock
+    
+    def write_batch(self, records: List[SignalRecord]):
+        if self._sock is None:
+            self._sock = self._connect()
+        try:
+            self._sock.sendall(b''.join(record.to_json() + b'\n' for record in records))
+        except OSError:
+            self.close()
+            raise
+    
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+class SignalOutbox:
+    """Sequence-numbered, batched signal export
+    
+    submit() assigns the next sequence number and waits until the batch holding
+    the signal has been written. Signals submitted within flush_interval_ms of each
+    other (up to batch_size) share one write, so a news burst costs one fsync
+    instead of one file per signal.
+    
+    Delivery is tracked per sink: a sink that fails keeps its undelivered records
+    and gets them again, in order, ahead of the next batch, while the sinks that
+    succeeded are not written twice. A submission only fails when no sink took it.
+    """
+    
+    def __init__(self, sinks: List[SignalSink], batch_size: int = 64, flush_interval_ms: int = 5,
+                 max_backlog: int = 10000):
+        self.sinks = sinks
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_backlog = max_backlog
+        self.sequence = max((sink.last_sequence() for sink in sinks), default=0)
+        self._backlogs: List[List[SignalRecord]] = [[] for _ in sinks]
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.logger = logging.getLogger(__name__)
+    
+    @classmethod
+    def from_config(cls, config: SystemConfig) -> "SignalOutbox":
+        """Build the sinks named in config.signal_sinks"""
+        export_path = Path(config.signals_export_path)
+        factories = {
+            "csv": lambda: CsvSignalSink(export_path),
+            "journal": lambda: JournalSignalSink(export_path / config.signal_journal_file),
+            "ring": lambda: RingBufferSignalSink(export_path / config.signal_ring_file, config.signal_ring_bytes),
+            "socket": lambda: SocketSignalSink(config.signal_socket_address),
+        }
+        unknown = [name for name in config.signal_sinks if name not in factories]
+        if unknown:
+            raise ValueError(f"Unknown signal sinks: {', '.join(unknown)}")
+        return cls([factories[name]() for name in config.signal_sinks],
+                   config.signal_batch_size, config.signal_flush_interval_ms)
+    
+    def start(self):
+        """Start the flusher task on the running loop"""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+    
+    async def submit(self, signal: TradingSignal) -> int:
+        """Queue a signal and return its sequence number once it is durable"""
+        self.start()
+        self.sequence += 1
+        record = SignalRecord(self.sequence, signal)
+        ack = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, ack))
+        return await ack
+    
+    async def close(self):
+        """Flush what is queued, then close the sinks"""
+        if self._task is not None:
+            await self._queue.join()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for sink in self.sinks:
+            sink.close()
+    
+    async def _flush_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            records = [record for record, _ in batch]
+            try:
+                error = await asyncio.to_thread(self._write, records)
+            except Exception as e:
+                error = e
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            
+            if error is not None:
+                self.logger.error(f"Signal export of sequences {records[0].sequence}-{records[-1].sequence} failed: {error}")
+            for record, ack in batch:
+                if not ack.done():
+                    if error is None:
+                        ack.set_result(record.sequence)
+                    else:
+                        ack.set_exception(error)
+    
+    def _write(self, records: List[SignalRecord]) -> Optional[Exception]:
+        """Write records to every sink independently
+        
+        Returns None when at least one sink stored them (or there are no sinks),
+        otherwise the first sink's error.
+        """
+        errors = []
+        for sink, backlog in zip(self.sinks, self._backlogs):
+            backlog.extend(records)
+            try:
+                sink.write_batch(backlog)
+            except Exception as e:
+                errors.append(e)
+                if len(backlog) > self.max_backlog:
+                    dropped = len(backlog) - self.max_backlog
+                    self.logger.error(f"{type(sink).__name__} backlog full, dropping {dropped} oldest signals")
+                    del backlog[:dropped]
+                self.logger.warning(f"{type(sink).__name__} failed with {len(backlog)} signals pending: {e}")
+            else:
+                backlog.clear()
+        
+        if len(errors) < len(self.sinks) or not errors:
+            return None
+        # Nothing was exported: the caller sees the failure, so the batch must not be retried later
+        first = records[0].sequence
+        for backlog in self._backlogs:
+            backlog[:] = [record for record in backlog if record.sequence < first]
+        return errors[0]
+
+# ============================================================================
+# TRIGGER SCHEDULER (Replaces the Excel 15-second monitor timer)
+# ============================================================================
+
+class TriggerScheduler:
+    """Fire events at their trigger_time from a min-heap of pending triggers
+    
+    One task sleeps until the earliest trigger_time and is woken early whenever the
+    schedule changes. Reschedules and cancellations are lazy: the old heap entry is
+    left in place and skipped when it no longer matches the event's current entry.
+    The heap is keyed by POSIX timestamps and compared with the aware `clock`, so
+    trigger times from any timezone order and fire correctly.
+    """
+    
+    def __init__(self, on_trigger: Callable[[CalendarEvent], Awaitable[None]], max_sleep_seconds: float = 15,
+                 clock: Optional[Callable[[], datetime]] = None):
+        self.on_trigger = on_trigger
+        self.max_sleep_seconds = max_sleep_seconds
+        self.clock = clock or (lambda: datetime.now().astimezone())
+        self._heap: List[Tuple[float, int, Tuple]] = []  # (trigger timestamp, seq, key)
+        self._entries: Dict[Tuple, Tuple[int, CalendarEvent]] = {}  # key -> (seq, event)
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.logger = logging.getLogger(__name__)
+    
+    @staticmethod
+    def _key(event: CalendarEvent) -> Tuple:
+        return ("id", event.id) if event.id is not None else ("obj", id(event))
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def schedule(self, event: CalendarEvent):
+        """Add an event, or move it if it is already scheduled"""
+        key = self._key(event)
+        if event.trigger_time is None or event.status != EventStatus.PENDING:
+            self._entries.pop(key, None)
+        else:
+            seq = next(self._seq)
+            self._entries[key] = (seq, event)
+            heapq.heappush(self._heap, (event.trigger_time.timestamp(), seq, key))
+        self._wake()
+    
+    def cancel(self, event: CalendarEvent) -> bool:
+        """Drop a scheduled event; returns False if it was not scheduled"""
+        removed = self._entries.pop(self._key(event), None) is not None
+        if removed:
+            self._wake()
+        return removed
+    
+    def replace(self, events: List[CalendarEvent]):
+        """Reset the schedule to exactly the given events"""
+        self._heap.clear()
+        self._entries.clear()
+        for event in events:
+            self.schedule(event)
+        self._wake()
+    
+    def next_trigger_time(self) -> Optional[datetime]:
+        """Trigger time of the earliest live entry"""
+        self._discard_stale()
+        return self._entries[self._heap[0][2]][1].trigger_time if self._heap else None
+    
+    def start(self):
+        """Start the firing task on the running loop"""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self):
+        """Stop the firing task; the schedule itself is kept"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    def _discard_stale(self):
+        while self._heap:
+            _, seq, key = self._heap[0]
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == seq:
+                return
+            heapq.heappop(self._heap)
+    
+    def _pop_due(self, now: datetime) -> List[CalendarEvent]:
+        due = []
+        at = now.timestamp()
+        self._discard_stale()
+        while self._heap and self._heap[0][0] <= at:
+            _, _, key = heapq.heappop(self._heap)
+            _, event = self._entries.pop(key)
+            if event.status == EventStatus.PENDING:
+                due.append(event)
+            self._discard_stale()
+        return due
+    
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            # Events due together fire together, so their signal exports share a batch
+            due = self._pop_due(self.clock())
+            results = await asyncio.gather(*(self.on_trigger(event) for event in due), return_exceptions=True)
+            for event, result in zip(due, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"Trigger callback failed for {event.title}: {result}")
+            
+            # Sleep until the next trigger, a schedule change, or the sleep cap
+            delay = self.max_sleep_seconds
+            next_time = self.next_trigger_time()
+            if next_time is not None:
+                delay = min(delay, max(0.0, (next_time - self.clock()).total_seconds()))
+            timer = asyncio.get_running_loop().call_later(delay, self._wakeup.set)
+            try:
+                await self._wakeup.wait()
+            finally:
+                timer.cancel()
+
+# ============================================================================
+# CALENDAR FILE WATCHER (Event-driven import of new downloads)
+# ============================================================================
+
+class CalendarFileWatcher:
+    """Watch a downloads folder and hand settled calendar files to a callback
+    
+    Filesystem events come from a watchdog observer thread (or a polling scan when
+    watchdog is not installed) and are marshalled onto the event loop. A file is
+    only handed over once it has been quiet for debounce_seconds and its size and
+    mtime did not move in that time, so partially written downloads are skipped.
+    """
+    
+    def __init__(self, watch_path: str, patterns: List[str], on_file_ready: Callable[[Path], Awaitable[None]],
+                 debounce_seconds: float = 2.0):
+        self.watch_path = Path(watch_path).expanduser()
+        self.patterns = patterns
+        self.on_file_ready = on_file_ready
+        self.debounce_seconds = debounce_seconds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._observer = None
+        self._poll_task: Optional[asyncio.Task] = None
+        self._pending: Dict[Path, asyncio.TimerHandle] = {}
+        self._tasks: set = set()
+        self.logger = logging.getLogger(__name__)
+    
+    def matches(self, path: Path) -> bool:
+        """Whether a file name matches one of the calendar file patterns"""
+        return any(path.match(pattern) for pattern in self.patterns)
+    
+    @staticmethod
+    def _signature(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+    
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        found = {}
+        for path in self.watch_path.iterdir():
+            if path.is_file() and self.matches(path):
+                signature = self._signature(path)
+                if signature is not None:
+                    found[path] = signature
+        return found
+    
+    def start(self):
+        """Start watching on the running loop"""
+        self._loop = asyncio.get_running_loop()
+        self.watch_path.mkdir(parents=True, exist_ok=True)
+        
+        if Observer:
+            watcher = self
+            
+            class DownloadHandler(FileSystemEventHandler):
+                def on_created(self, event):
+                    watcher._notify(event.src_path, event.is_directory)
+                
+                def on_modified(self, event):
+                    watcher._notify(event.src_path, event.is_directory)
+                
+                def on_moved(self, event):
+                    watcher._notify(event.dest_path, event.is_directory)
+            
+            self._observer = Observer()
+            self._observer.schedule(DownloadHandler(), str(self.watch_path), recursive=False)
+            self._observer.start()
+        else:
+            # Baseline taken now, so files that land before the first poll are still new
+            self._poll_task = self._loop.create_task(self._poll(self._scan()))
+        
+        self.logger.info(f"Watching {self.watch_path} for calendar files")
+    
+    async def stop(self):
+        """Stop watching, drop files that have not settled yet and cancel running imports"""
+        if self._observer is not None:
+            observer, self._observer = self._observer, None
+            observer.stop()
+            await asyncio.to_thread(observer.join)
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+        for handle in self._pending.values():
+            handle.cancel()
+        self._pending.clear()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def _notify(self, src_path: str, is_directory: bool):
+        """Observer thread: stat the file here and pass it to the loop"""
+        path = Path(src_path)
+        if is_directory or not self.matches(path):
+            return
+        signature = self._signature(path)
+        if signature is not None:
+            self._loop.call_soon_threadsafe(self._touch, path, signature)
+    
+    async def _poll(self, seen: Dict[Path, Tuple[int, int]]):
+        """Fallback without watchdog: scan the folder every debounce period
+        
+        seen is the folder as it was at start(); files already present are not new downloads.
+        """
+        while True:
+            await asyncio.sleep(self.debounce_seconds)
+            current = await asyncio.to_thread(self._scan)
+            for path, signature in current.items():
+                if seen.get(path) != signature:
+                    self._touch(path, signature)
+            seen = current
+    
+    def _touch(self, path: Path, signature: Tuple[int, int]):
+        """Restart the quiet period of a file"""
+        handle = self._pending.pop(path, None)
+        if handle is not None:
+            handle.cancel()
+        self._pending[path] = self._loop.call_later(self.debounce_seconds, self._settle, path, signature)
+    
+    def _settle(self, path: Path, signature: Tuple[int, int]):
+        self._pending.pop(path, None)
+        task = self._loop.create_task(self._ingest(path, signature))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _ingest(self, path: Path, signature: Tuple[int, int]):
+        current = await asyncio.to_thread(self._signature, path)
+        if current is None:
+            return  # Renamed or deleted while settling
+        if current != signature:
+            self._touch(path, current)  # Still being written
+            return
+        
+        try:
+            self.logger.info(f"New calendar file ready: {path}")
+            await self.on_file_ready(path)
+        except Exception as e:
+            self.logger.error(f"Ingesting {path} failed: {e}")
+
 # ============================================================================
 # MAIN SYSTEM ORCHESTRATOR (Replaces Excel timer system)
 # ============================================================================
@@ -813,10 +1908,18 @@ class CalendarSystem:
             pass
         
         # Initialize components
-        self.db = DatabaseManager(self.config.database_path)
+        self.db = DatabaseManager(self.config.database_path, self.config.database_pool_size)
         self.import_engine = CalendarImportEngine(self.config, self.db)
         self.event_processor = EventProcessor(self.config)
+        self.clock = self.event_processor.clock  # One aware clock for processing, scheduling and the dashboard
         self.signal_generator = SignalGenerator(self.config, self.db)
+        self.trigger_scheduler = TriggerScheduler(self._trigger_event, self.config.monitor_interval_seconds, self.clock)
+        self.file_watcher = CalendarFileWatcher(
+            self.config.downloads_path, CalendarImportEngine.CALENDAR_FILE_PATTERNS,
+            self._on_calendar_file, self.config.watch_debounce_seconds
+        )
+        self._import_lock = asyncio.Lock()
+        self.outbox = SignalOutbox.from_config(self.config)
         
         # Initialize scheduler
         if AsyncIOScheduler:
@@ -828,6 +1931,7 @@ class CalendarSystem:
         # System state
         self.system_running = False
         self.active_events = []
+        self.trigger_schedule = TriggerSchedule([], self.clock())  # Shared with the dashboard
         
     def _load_config(self, config_path: str) -> SystemConfig:
         """Load system configuration"""
@@ -862,15 +1966,6 @@ class CalendarSystem:
                 replace_existing=True
             )
             
-            # Schedule event monitoring (every 15 seconds)
-            self.scheduler.add_job(
-                self._monitor_events,
-                trigger='interval',
-                seconds=self.config.monitor_interval_seconds,
-                id='event_monitor',
-                replace_existing=True
-            )
-            
             # Schedule health checks (every 5 minutes)
             self.scheduler.add_job(
                 self._health_check,
@@ -884,12 +1979,23 @@ class CalendarSystem:
             self.scheduler.start()
         else:
             self.logger.warning("Scheduler not available - running in manual mode")
+        
+        # Event triggers fire from the trigger scheduler, not a polling job
+        self.outbox.start()
+        self.trigger_scheduler.start()
             
         self.system_running = True
         
-        # Initial calendar import
+        # Start from what is already stored, then apply the initial import as a diff
+        self.active_events = await self.db.get_active_events()
+        self._refresh_schedule()
+        self.trigger_scheduler.replace(self.trigger_schedule.events)
         await self._import_calendar()
         
+        # Event-driven import of calendar downloads
+        if self.config.watch_downloads:
+            self.file_watcher.start()
+        
         self.logger.info("Economic Calendar System started successfully")
     
     async def stop_system(self):
@@ -897,58 +2003,134 @@ class CalendarSystem:
         self.logger.info("Stopping Economic Calendar System")
         if self.scheduler:
             self.scheduler.shutdown()
+        await self.trigger_scheduler.stop()
+        await self.file_watcher.stop()
+        await self.outbox.close()
+        self.db.close()
         self.system_running = False
     
     async def _scheduled_import(self):
         """Scheduled calendar import"""
         await self._import_calendar()
     
-    async def _import_calendar(self):
-        """Import calendar data"""
+    async def _on_calendar_file(self, file_path: Path):
+        """A new calendar download settled in downloads_path"""
+        await self._import_calendar(file_path=file_path)
+    
+    async def _import_calendar(self, force: bool = False, file_path: Optional[Path] = None):
+        """Import calendar data, one import at a time"""
+        async with self._import_lock:
+            await self._run_import(force, file_path)
+    
+    async def _run_import(self, force: bool, file_path: Optional[Path]):
+        """Import calendar data
+        
+        In "merge" import mode every matching file is parsed and merged, otherwise only
+        file_path or, without it, the newest file. Files whose content was already imported are skipped unless force
+        is set. Otherwise only inserted, changed and removed events are written, and the
+        active set and trigger schedule are updated in place.
+        """
         try:
             self.logger.info("Starting calendar import")
             
             # Find calendar files
-            files = await self.import_engine.find_calendar_files()
+            if file_path is not None and self.config.import_mode != "merge":
+                files = [file_path]
+            else:
+                files = await self.import_engine.find_calendar_files()
             if not files:
                 self.logger.warning("No calendar files found")
                 return
             
-            # Parse best file
-            best_file = files[0]  # First file (newest)
-            events = await self.import_engine.parse_calendar_csv(best_file)
+            # Newest file only, or every matching source in merge mode
+            sources = files if self.config.import_mode == "merge" else files[:1]
+            content_hashes = await asyncio.gather(*(self.import_engine.fingerprint_file(f) for f in sources))
+            if not force and all([await self.db.is_file_imported(h) for h in content_hashes]):
+                self.logger.info(f"Calendar files unchanged, skipping import: {', '.join(map(str, sources))}")
+                return
+            
+            parsed = await self.import_engine.parse_calendar_files(sources)
+            events = self.import_engine.merge_events(parsed) if len(sources) > 1 else parsed[0]
             
             if not events:
-                self.logger.warning("No events parsed from calendar file")
+                self.logger.warning("No events parsed from calendar files")
                 return
             
             # Process events
             processed_events = await self.event_processor.process_events(events)
             
-            # Save to database
-            await self.db.save_events(processed_events)
-            
-            # Update active events
-            self.active_events = await self.db.get_active_events()
+            # Apply only the differences
+            diff = self.import_engine.diff_events(self.active_events, processed_events)
+            await self._apply_event_diff(diff)
+            for content_hash, source, source_events in zip(content_hashes, sources, parsed):
+                await self.db.record_file_import(content_hash, source, len(source_events))
             
-            self.logger.info(f"Calendar import completed: {len(processed_events)} events processed")
+            self.logger.info(
+                f"Calendar import completed: {len(processed_events)} events processed, "
+                f"{len(diff.inserted)} inserted, {len(diff.changed)} changed, {len(diff.removed)} removed"
+            )
             
         except Exception as e:
             self.logger.error(f"Calendar import failed: {e}")
     
-    async def _monitor_events(self):
-        """Monitor events for triggering"""
-        if not self.active_events:
+    async def _apply_event_diff(self, diff: EventDiff):
+        """Write an import diff to the database and the in-memory active set"""
+        if not diff:
             return
         
-        current_time = datetime.now()
+        # Changed events keep their identity and status; only the content is copied
+        for current, incoming in diff.changed:
+            incoming.id = current.id
+            incoming.status = current.status
+        
+        await self.db.save_events(diff.inserted + [incoming for _, incoming in diff.changed])
+        if diff.removed:
+            await self.db.delete_events([event.id for event in diff.removed if event.id is not None])
+        
+        for current, incoming in diff.changed:
+            trigger_moved = current.trigger_time != incoming.trigger_time
+            for name in ('impact', 'forecast', 'previous', 'url', 'event_type', 'trigger_time',
+                         'parameter_set', 'enabled', 'quality_score', 'processing_notes'):
+                setattr(current, name, getattr(incoming, name))
+            if trigger_moved:
+                self.trigger_scheduler.schedule(current)
         
+        removed_ids = {id(event) for event in diff.removed}
+        for event in diff.removed:
+            self.trigger_scheduler.cancel(event)
+        self.active_events = [event for event in self.active_events if id(event) not in removed_ids]
+        
+        # save_events filled in the stored status, which may no longer be active
+        now = self.clock()
+        for event in diff.inserted:
+            release = self.event_processor._release_time(event)
+            if event.status in (EventStatus.PENDING, EventStatus.READY) and release > now:
+                self.active_events.append(event)
+                self.trigger_scheduler.schedule(event)
+        
+        self.active_events.sort(key=lambda x: x.trigger_time.timestamp() if x.trigger_time else float('inf'))
+        self._refresh_schedule()
+    
+    def _refresh_schedule(self):
+        """Rebuild the shared trigger schedule from the active set"""
+        self.trigger_schedule = TriggerSchedule(self.active_events, self.clock())
+    
+    async def reschedule_triggers(self):
+        """Recalculate trigger times of pending events after an offset change"""
+        changed = []
         for event in self.active_events:
             if event.status != EventStatus.PENDING:
                 continue
-            
-            if event.trigger_time and current_time >= event.trigger_time:
-                await self._trigger_event(event)
+            trigger_time = self.event_processor._calculate_trigger_time(event)
+            if trigger_time != event.trigger_time:
+                event.trigger_time = trigger_time
+                self.trigger_scheduler.schedule(event)
+                changed.append(event)
+        
+        if changed:
+            await self.db.save_events(changed)
+            self._refresh_schedule()
+        self.logger.info(f"Rescheduled {len(changed)} event triggers")
     
     async def _trigger_event(self, event: CalendarEvent):
         """Trigger signal for event"""
@@ -966,42 +2148,26 @@ class CalendarSystem:
             
             # Update event status
             event.status = EventStatus.TRIGGERED
-            await self.db.save_events([event])
+            await self._save_status(event)
             
             self.logger.info(f"Event triggered successfully: {event.title}")
             
         except Exception as e:
             self.logger.error(f"Failed to trigger event {event.title}: {e}")
             event.status = EventStatus.FAILED
+            await self._save_status(event)
+    
+    async def _save_status(self, event: CalendarEvent):
+        """Persist an event's status change"""
+        if event.id is not None:
+            await self.db.update_status([event.id], event.status)
+        else:
             await self.db.save_events([event])
     
     async def _export_signal(self, signal: TradingSignal):
-        """Export signal for MT4 integration"""
-        # Create signals directory
-        signals_path = Path(self.config.signals_export_path)
-        signals_path.mkdir(exist_ok=True)
-        
-        # Export as CSV (compatible with existing python-watchdog.py)
-        signal_file = signals_path / f"signal_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        
-        signal_data = pd.DataFrame([{
-            'Symbol': signal.symbol,
-            'BuyDistance': signal.buy_distance,
-            'SellDistance': signal.sell_distance,
-            'StopLoss': signal.stop_loss,
-            'TakeProfit': signal.take_profit,
-            'LotSize': signal.lot_size,
-            'ExpireHours': signal.expire_hours,
-            'TrailingStop': signal.trailing_stop,
-            'Comment': signal.comment,
-            'StrategyID': signal.strategy_id,
-            'ParameterSetID': signal.parameter_set_id,
-            'Timestamp': signal.timestamp.isoformat(),
-            'EventTitle': signal.event_title
-        }])
-        
-        signal_data.to_csv(signal_file, index=False)
-        self.logger.info(f"Signal exported to {signal_file}")
+        """Export signal for MT4 integration through the signal outbox"""
+        sequence = await self.outbox.submit(signal)
+        self.logger.info(f"Signal {sequence} exported: {signal.symbol} {signal.event_title}")
     
     async def _health_check(self):
         """Perform system health check"""
@@ -1033,7 +2199,7 @@ class WebDashboard:
     async def get_dashboard_data(self) -> Dict[str, Any]:
         """Get dashboard data for web interface"""
         return {
-            "active_events": [asdict(event) for event in self.system.active_events],
+            "active_events": [asdict(event) for event in self.system.trigger_schedule.upcoming(self.system.clock())],
             "system_status": {
                 "running": self.system.system_running,
                 "next_import": "Sunday 12:00 PM",
@@ -1074,203 +2240,207 @@ if FastAPI and app:
 
     @app.get("/", response_class=HTMLResponse)
     async def get_dashboard():
-    """Main dashboard page"""
-    return """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Economic Calendar System</title>
-        <style>
-            body { font-family: Arial, sans-serif; margin: 20px; }
-            .grid { display: grid; grid-template-columns: 1fr 1fr; gap: 20px; }
-            .panel { border: 1px solid #ccc; padding: 15px; border-radius: 5px; }
-            .event { margin: 5px 0; padding: 5px; background: #f5f5f5; border-radius: 3px; }
-            .high-impact { border-left: 4px solid #ff4444; }
-            .medium-impact { border-left: 4px solid #ffaa00; }
-            .status { font-weight: bold; color: green; }
-            button { padding: 8px 16px; margin: 5px; cursor: pointer; }
-            .countdown { font-weight: bold; color: #0066cc; }
-        </style>
-    </head>
-    <body>
-        <h1>Economic Calendar System Dashboard</h1>
-        
-        <div class="grid">
-            <div class="panel">
-                <h3>Next Events</h3>
-                <div id="events"></div>
-                <button onclick="toggleAllEvents()">Toggle All</button>
-                <button onclick="emergencyStop()">Emergency Stop</button>
-            </div>
-            
-            <div class="panel">
-                <h3>Calendar Configuration</h3>
-                <p>Anticipation Hours: <input type="text" id="anticipationHours" value="1,2,4"></p>
-                <p>High Impact Offset: <input type="number" id="highOffset" value="-3"> minutes</p>
-                <p>Medium Impact Offset: <input type="number" id="mediumOffset" value="-2"> minutes</p>
-                <button onclick="updateConfig()">Update Configuration</button>
-                <button onclick="manualImport()">Manual Import</button>
-            </div>
-            
-            <div class="panel">
-                <h3>Parameter Sets</h3>
-                <div id="parameterSets"></div>
-                <p>Selection: Sequential</p>
-                <p>Last Used: Set <span id="lastSet">1</span></p>
-                <button onclick="resetRotation()">Reset Rotation</button>
-            </div>
+        """Main dashboard page"""
+        return """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>Economic Calendar System</title>
+            <style>
+                body { font-family: Arial, sans-serif; margin: 20px; }
+                .grid { display: grid; grid-template-columns: 1fr 1fr; gap: 20px; }
+                .panel { border: 1px solid #ccc; padding: 15px; border-radius: 5px; }
+                .event { margin: 5px 0; padding: 5px; background: #f5f5f5; border-radius: 3px; }
+                .high-impact { border-left: 4px solid #ff4444; }
+                .medium-impact { border-left: 4px solid #ffaa00; }
+                .status { font-weight: bold; color: green; }
+                button { padding: 8px 16px; margin: 5px; cursor: pointer; }
+                .countdown { font-weight: bold; color: #0066cc; }
+            </style>
+        </head>
+        <body>
+            <h1>Economic Calendar System Dashboard</h1>
             
-            <div class="panel">
-                <h3>System Status</h3>
-                <p>Status: <span class="status" id="systemStatus">RUNNING</span></p>
-                <p>Timer: <span id="timerStatus">ACTIVE</span></p>
-                <p>Calendar: <span id="calendarStatus">LOADED</span></p>
-                <p>Next Import: <span id="nextImport">Sunday 12:00 PM</span></p>
-                <p>Health Score: <span id="healthScore">95/100</span></p>
+            <div class="grid">
+                <div class="panel">
+                    <h3>Next Events</h3>
+                    <div id="events"></div>
+                    <button onclick="toggleAllEvents()">Toggle All</button>
+                    <button onclick="emergencyStop()">Emergency Stop</button>
+                </div>
+                
+                <div class="panel">
+                    <h3>Calendar Configuration</h3>
+                    <p>Anticipation Hours: <input type="text" id="anticipationHours" value="1,2,4"></p>
+                    <p>High Impact Offset: <input type="number" id="highOffset" value="-3"> minutes</p>
+                    <p>Medium Impact Offset: <input type="number" id="mediumOffset" value="-2"> minutes</p>
+                    <button onclick="updateConfig()">Update Configuration</button>
+                    <button onclick="manualImport()">Manual Import</button>
+                </div>
+                
+                <div class="panel">
+                    <h3>Parameter Sets</h3>
+                    <div id="parameterSets"></div>
+                    <p>Selection: Sequential</p>
+                    <p>Last Used: Set <span id="lastSet">1</span></p>
+                    <button onclick="resetRotation()">Reset Rotation</button>
+                </div>
+                
+                <div class="panel">
+                    <h3>System Status</h3>
+                    <p>Status: <span class="status" id="systemStatus">RUNNING</span></p>
+                    <p>Timer: <span id="timerStatus">ACTIVE</span></p>
+                    <p>Calendar: <span id="calendarStatus">LOADED</span></p>
+                    <p>Next Import: <span id="nextImport">Sunday 12:00 PM</span></p>
+                    <p>Health Score: <span id="healthScore">95/100</span></p>
+                </div>
             </div>
-        </div>
-        
-        <script>
-            const ws = new WebSocket(`ws://localhost:8000/ws`);
             
-            ws.onmessage = function(event) {
-                const data = JSON.parse(event.data);
-                updateDashboard(data);
-            };
-            
-            function updateDashboard(data) {
-                // Update events
-                const eventsDiv = document.getElementById('events');
-                eventsDiv.innerHTML = '';
+            <script>
+                const ws = new WebSocket(`ws://localhost:8000/ws`);
+                
+                ws.onmessage = function(event) {
+                    const data = JSON.parse(event.data);
+                    updateDashboard(data);
+                };
                 
-                data.active_events.slice(0, 5).forEach(event => {
-                    const eventDiv = document.createElement('div');
-                    eventDiv.className = `event ${event.impact.toLowerCase()}-impact`;
+                function updateDashboard(data) {
+                    // Update events
+                    const eventsDiv = document.getElementById('events');
+                    eventsDiv.innerHTML = '';
                     
-                    const triggerTime = new Date(event.trigger_time);
-                    const now = new Date();
-                    const diff = Math.floor((triggerTime - now) / 60000); // minutes
+                    data.active_events.slice(0, 5).forEach(event => {
+                        const eventDiv = document.createElement('div');
+                        eventDiv.className = `event ${event.impact.toLowerCase()}-impact`;
+                        
+                        const triggerTime = new Date(event.trigger_time);
+                        const now = new Date();
+                        const diff = Math.floor((triggerTime - now) / 60000); // minutes
+                        
+                        eventDiv.innerHTML = `
+                            <strong>${event.title}</strong><br>
+                            Time: ${event.time} (in ${diff > 0 ? diff + ' min' : 'triggered'})<br>
+                            Impact: ${event.impact} | Status: ${event.status}
+                        `;
+                        eventsDiv.appendChild(eventDiv);
+                    });
                     
-                    eventDiv.innerHTML = `
-                        <strong>${event.title}</strong><br>
-                        Time: ${event.time} (in ${diff > 0 ? diff + ' min' : 'triggered'})<br>
-                        Impact: ${event.impact} | Status: ${event.status}
-                    `;
-                    eventsDiv.appendChild(eventDiv);
-                });
+                    // Update parameter sets
+                    const paramDiv = document.getElementById('parameterSets');
+                    paramDiv.innerHTML = '';
+                    
+                    Object.entries(data.parameter_sets).forEach(([id, params]) => {
+                        const setDiv = document.createElement('div');
+                        setDiv.innerHTML = `Set ${id}: ${params.lot_size} lots`;
+                        paramDiv.appendChild(setDiv);
+                    });
+                    
+                    document.getElementById('lastSet').textContent = data.last_parameter_set;
+                }
                 
-                // Update parameter sets
-                const paramDiv = document.getElementById('parameterSets');
-                paramDiv.innerHTML = '';
+                async function manualImport() {
+                    const response = await fetch('/api/import', { method: 'POST' });
+                    const result = await response.json();
+                    alert(result.message);
+                }
                 
-                Object.entries(data.parameter_sets).forEach(([id, params]) => {
-                    const setDiv = document.createElement('div');
-                    setDiv.innerHTML = `Set ${id}: ${params.lot_size} lots`;
-                    paramDiv.appendChild(setDiv);
-                });
+                async function updateConfig() {
+                    const config = {
+                        anticipation_hours: document.getElementById('anticipationHours').value.split(',').map(Number),
+                        high_offset: parseInt(document.getElementById('highOffset').value),
+                        medium_offset: parseInt(document.getElementById('mediumOffset').value)
+                    };
+                    
+                    const response = await fetch('/api/config', {
+                        method: 'PUT',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify(config)
+                    });
+                    
+                    const result = await response.json();
+                    alert(result.message);
+                }
                 
-                document.getElementById('lastSet').textContent = data.last_parameter_set;
-            }
-            
-            async function manualImport() {
-                const response = await fetch('/api/import', { method: 'POST' });
-                const result = await response.json();
-                alert(result.message);
-            }
-            
-            async function updateConfig() {
-                const config = {
-                    anticipation_hours: document.getElementById('anticipationHours').value.split(',').map(Number),
-                    high_offset: parseInt(document.getElementById('highOffset').value),
-                    medium_offset: parseInt(document.getElementById('mediumOffset').value)
-                };
+                async function emergencyStop() {
+                    const response = await fetch('/api/emergency-stop', { method: 'POST' });
+                    const result = await response.json();
+                    alert(result.message);
+                }
                 
-                const response = await fetch('/api/config', {
-                    method: 'PUT',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(config)
-                });
+                // Refresh dashboard every 15 seconds
+                setInterval(async () => {
+                    const response = await fetch('/api/dashboard-data');
+                    const data = await response.json();
+                    updateDashboard(data);
+                }, 15000);
                 
-                const result = await response.json();
-                alert(result.message);
-            }
-            
-            async function emergencyStop() {
-                const response = await fetch('/api/emergency-stop', { method: 'POST' });
-                const result = await response.json();
-                alert(result.message);
-            }
+                // Initial load
+                window.onload = async () => {
+                    const response = await fetch('/api/dashboard-data');
+                    const data = await response.json();
+                    updateDashboard(data);
+                };
+            </script>
+        </body>
+        </html>
+        """
+
+    @app.websocket("/ws")
+    async def websocket_endpoint(websocket: WebSocket):
+        """WebSocket endpoint for real-time updates"""
+        await websocket.accept()
+        dashboard.websocket_connections.append(websocket)
+        
+        try:
+            while True:
+                await websocket.receive_text()  # Keep connection alive
+        except:
+            dashboard.websocket_connections.remove(websocket)
+
+    @app.get("/api/dashboard-data")
+    async def get_dashboard_data():
+        """API endpoint for dashboard data"""
+        return await dashboard.get_dashboard_data()
+
+    @app.post("/api/import")
+    async def manual_import():
+        """Manual calendar import endpoint"""
+        try:
+            await calendar_system._import_calendar(force=True)
+            return {"message": "Calendar import completed successfully"}
+        except Exception as e:
+            return {"message": f"Import failed: {str(e)}"}
+
+    @app.put("/api/config")
+    async def update_config(config_update: dict):
+        """Update system configuration"""
+        try:
+            # Update configuration
+            if "anticipation_hours" in config_update:
+                calendar_system.config.anticipation_hours = config_update["anticipation_hours"]
             
-            // Refresh dashboard every 15 seconds
-            setInterval(async () => {
-                const response = await fetch('/api/dashboard-data');
-                const data = await response.json();
-                updateDashboard(data);
-            }, 15000);
+            if "high_offset" in config_update:
+                calendar_system.config.trigger_offsets["EMO-E"] = config_update["high_offset"]
+                
+            if "medium_offset" in config_update:
+                calendar_system.config.trigger_offsets["EMO-A"] = config_update["medium_offset"]
             
-            // Initial load
-            window.onload = async () => {
-                const response = await fetch('/api/dashboard-data');
-                const data = await response.json();
-                updateDashboard(data);
-            };
-        </script>
-    </body>
-    </html>
-    """
-
-@app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time updates"""
-    await websocket.accept()
-    dashboard.websocket_connections.append(websocket)
-    
-    try:
-        while True:
-            await websocket.receive_text()  # Keep connection alive
-    except:
-        dashboard.websocket_connections.remove(websocket)
-
-@app.get("/api/dashboard-data")
-async def get_dashboard_data():
-    """API endpoint for dashboard data"""
-    return await dashboard.get_dashboard_data()
-
-@app.post("/api/import")
-async def manual_import():
-    """Manual calendar import endpoint"""
-    try:
-        await calendar_system._import_calendar()
-        return {"message": "Calendar import completed successfully"}
-    except Exception as e:
-        return {"message": f"Import failed: {str(e)}"}
-
-@app.put("/api/config")
-async def update_config(config_update: dict):
-    """Update system configuration"""
-    try:
-        # Update configuration
-        if "anticipation_hours" in config_update:
-            calendar_system.config.anticipation_hours = config_update["anticipation_hours"]
-        
-        if "high_offset" in config_update:
-            calendar_system.config.trigger_offsets["EMO-E"] = config_update["high_offset"]
+            if "high_offset" in config_update or "medium_offset" in config_update:
+                await calendar_system.reschedule_triggers()
             
-        if "medium_offset" in config_update:
-            calendar_system.config.trigger_offsets["EMO-A"] = config_update["medium_offset"]
-        
-        return {"message": "Configuration updated successfully"}
-    except Exception as e:
-        return {"message": f"Configuration update failed: {str(e)}"}
+            return {"message": "Configuration updated successfully"}
+        except Exception as e:
+            return {"message": f"Configuration update failed: {str(e)}"}
 
-@app.post("/api/emergency-stop")
-async def emergency_stop():
-    """Emergency stop endpoint"""
-    try:
-        calendar_system.scheduler.pause()
-        return {"message": "System paused successfully"}
-    except Exception as e:
-        return {"message": f"Emergency stop failed: {str(e)}"}
+    @app.post("/api/emergency-stop")
+    async def emergency_stop():
+        """Emergency stop endpoint"""
+        try:
+            await calendar_system.trigger_scheduler.stop()
+            calendar_system.scheduler.pause()
+            return {"message": "System paused successfully"}
+        except Exception as e:
+            return {"message": f"Emergency stop failed: {str(e)}"}
 
 # ============================================================================
 # MT4 INTEGRATION LAYER (Replaces existing python-watchdog.py integration)
@@ -1294,8 +2464,13 @@ class MT4Integration:
                 self.integration = integration
             
             def on_created(self, event):
-                if event.is_file and event.src_path.endswith('.csv'):
+                if not event.is_directory and event.src_path.endswith('.csv'):
                     asyncio.create_task(self.integration.process_signal_file(event.src_path))
+            
+            def on_moved(self, event):
+                # CsvSignalSink renames each finished .tmp file into place
+                if not event.is_directory and event.dest_path.endswith('.csv'):
+                    asyncio.create_task(self.integration.process_signal_file(event.dest_path))
         
         observer = Observer()
         observer.schedule(SignalHandler(self), str(self.signals_path), recursive=False)
@@ -1342,6 +2517,100 @@ class MT4Integration:
         
         return mt4_data
 
+# ============================================================================
+# BACKTEST REPLAY (Historical calendars on a simulated clock)
+# ============================================================================
+
+@dataclass
+class ReplayResult:
+    """Signal stream and per-stage timings of a replay run"""
+    signals: List[TradingSignal] = field(default_factory=list)
+    stage_seconds: Dict[str, float] = field(default_factory=lambda: {"import": 0.0, "process": 0.0, "signal": 0.0})
+    files: int = 0
+    events: int = 0
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "files": self.files,
+            "events": self.events,
+            "signals": len(self.signals),
+            "stage_seconds": {stage: round(seconds, 6) for stage, seconds in self.stage_seconds.items()}
+        }
+
+class CalendarReplayEngine:
+    """Replay archived calendar CSVs through import, processing and signal generation
+    
+    Every stage reads the simulated clock instead of the wall clock, and time jumps
+    straight to the next import or trigger, so years of calendars run as fast as
+    the CPU allows. Each archive file is imported at midnight of its first event
+    day; pending triggers before that moment fire first, then the newer file
+    replaces whatever was still pending, as a live re-import would. An event
+    triggers at most once even if later files repeat it.
+    """
+    
+    def __init__(self, config: SystemConfig, archive_path: Optional[str] = None):
+        self.config = config
+        self.archive_path = Path(archive_path or config.archive_path).expanduser()
+        self.now = datetime.min.replace(tzinfo=timezone.utc)
+        self.import_engine = CalendarImportEngine(config, None)
+        self.event_processor = EventProcessor(config, clock=lambda: self.now)
+        self.signal_generator = SignalGenerator(config, None, clock=lambda: self.now)
+        self.logger = logging.getLogger(__name__)
+    
+    def archive_files(self) -> List[Path]:
+        """Archived calendar CSVs, in name order"""
+        return sorted(self.archive_path.rglob("*.csv"))
+    
+    async def run(self, files: Optional[List[Path]] = None,
+                  on_signal: Optional[Callable[[TradingSignal], None]] = None) -> ReplayResult:
+        """Replay the given files (default: the whole archive)"""
+        result = ReplayResult()
+        files = self.archive_files() if files is None else files
+        
+        started = time.perf_counter()
+        parsed = await self.import_engine.parse_calendar_files(files)
+        result.stage_seconds["import"] += time.perf_counter() - started
+        
+        midnight = lambda events: min(event.date for event in events).replace(hour=0, minute=0, second=0, microsecond=0)
+        imports = sorted(
+            (self.event_processor._aware(midnight(events)), index)
+            for index, events in enumerate(parsed) if events
+        )
+        result.files = len(imports)
+        
+        pending = TriggerSchedule([], self.now)
+        triggered = set()
+        for import_time, index in imports:
+            await self._fire(pending, import_time, triggered, result, on_signal)
+            
+            self.now = import_time
+            started = time.perf_counter()
+            processed = await self.event_processor.process_events(parsed[index])
+            result.stage_seconds["process"] += time.perf_counter() - started
+            result.events += len(processed)
+            pending = self.event_processor.schedule
+        
+        await self._fire(pending, None, triggered, result, on_signal)
+        return result
+    
+    async def _fire(self, schedule: TriggerSchedule, until: Optional[datetime], triggered: set,
+                    result: ReplayResult, on_signal: Optional[Callable[[TradingSignal], None]]):
+        """Generate signals for scheduled events triggering before `until` (None = all)"""
+        due = schedule.events if until is None else schedule.due(until - timedelta(microseconds=1))
+        started = time.perf_counter()
+        for event in due:
+            key = CalendarImportEngine.event_key(event)
+            if key in triggered or event.trigger_time < self.now:
+                continue
+            triggered.add(key)
+            self.now = event.trigger_time
+            signal = await self.signal_generator.generate_signal(event)
+            event.status = EventStatus.TRIGGERED
+            result.signals.append(signal)
+            if on_signal:
+                on_signal(signal)
+        result.stage_seconds["signal"] += time.perf_counter() - started
+
 # ============================================================================
 # CONFIGURATION AND STARTUP
 # ============================================================================
@@ -1391,9 +2660,6 @@ async def main():
         server = uvicorn.Server(config)
         await server.serve()
 
-if __name__ == "__main__":
-    asyncio.run(main())
-
 # ============================================================================
 # DEPLOYMENT AND DOCKER CONFIGURATION
 # ============================================================================
@@ -1537,6 +2803,16 @@ async def run_system_tests():
     processor = EventProcessor(config)
     processed = await processor.process_events([test_event])
     assert len(processed) >= 1  # Original + anticipation events
+    assert len(processor.schedule) == len(processed)
+    
+    # Processing against a fixed clock is replayable
+    replay_now = datetime(2025, 1, 6, 9, 0)
+    make_replay = lambda: [CalendarEvent(title="Replay NFP", country="USD", date=datetime(2025, 1, 6),
+                                         time="14:30", impact="High", quality_score=100)]
+    first = await processor.process_events(make_replay(), now=replay_now)
+    second = await processor.process_events(make_replay(), now=replay_now)
+    assert [e.trigger_time for e in first] == [e.trigger_time for e in second]
+    assert first[-1].trigger_time == processor._aware(datetime(2025, 1, 6, 14, 27))  # EMO-E: -3 minutes
     print("✓ Event processing tests passed")
     
     # Test signal generation
@@ -1547,13 +2823,6 @@ async def run_system_tests():
     
     print("All tests passed! ✓")
 
-if __name__ == "__main__":
-    import sys
-    if len(sys.argv) > 1 and sys.argv[1] == "test":
-        asyncio.run(run_system_tests())
-    else:
-        asyncio.run(main())
-
 def ensure_strategy_id_defaults(config) -> None:
     """Ensure `strategy_id` block exists on the config object with sensible defaults.
     If a YAML config writer exists in the app, it will persist on next save.
@@ -1565,3 +2834,14 @@ def ensure_strategy_id_defaults(config) -> None:
             config.strategy_id = StrategyIdConfig()
         except Exception:
             pass
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1 and sys.argv[1] == "test":
+        asyncio.run(run_system_tests())
+    elif len(sys.argv) > 1 and sys.argv[1] == "replay":
+        # python calendar_system.py replay [archive_path]
+        replay_result = asyncio.run(CalendarReplayEngine(SystemConfig(), *sys.argv[2:3]).run())
+        print(json.dumps(replay_result.summary(), indent=2))
+    else:
+        asyncio.run(main())
@@ -0,0 +1,5 @@
+"""Shared pytest setup: import calendar_system.py in place, without its optional web stack."""
+import pathlib, sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
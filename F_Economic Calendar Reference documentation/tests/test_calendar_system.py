@@ -0,0 +1,344 @@
+"""Unit tests for calendar_system: storage, import, scheduling, replay and the signal outbox."""
+import asyncio, json, socket, sqlite3, threading
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+import calendar_system as cs
+from calendar_system import (CalendarEvent, CalendarImportEngine, DatabaseManager, EventStatus, SignalOutbox,
+                             SQLiteConnectionPool, SystemConfig, TradingSignal, TriggerScheduler)
+
+
+def _event(title="Non-Farm Employment Change", country="USD", day=datetime(2030, 1, 4), time="13:30",
+           impact="High", **fields):
+    return CalendarEvent(title=title, country=country, date=day, time=time, impact=impact, **fields)
+
+
+def _signal(title="NFP", timestamp=datetime(2030, 1, 4, 13, 27)):
+    return TradingSignal("EURUSD", 10, 10, 20, 40, 0.01, 2, 0, "ECO", 1001, 1, timestamp, title)
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "calendar.db"), pool_size=2)
+    yield manager
+    manager.close()
+
+
+# ---------------- Connection pool and upsert ----------------
+def test_pool_reuses_persistent_wal_connections(tmp_path):
+    pool = SQLiteConnectionPool(str(tmp_path / "pool.db"), size=3)
+    with pool.connection() as first:
+        assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        with pool.connection() as second:
+            assert second is not first
+    with pool.connection() as again:
+        assert again in pool._all and len(pool._all) == 3
+    pool.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.execute("SELECT 1")
+    # An in-memory database only exists in its own connection
+    assert SQLiteConnectionPool(":memory:", size=4).size == 1
+
+
+def test_upsert_keeps_one_row_and_progressed_status(db):
+    async def run():
+        event = _event(forecast="180K")
+        await db.save_events([event])
+        assert event.id is not None and event.status == EventStatus.PENDING
+
+        await db.update_status([event.id], EventStatus.TRIGGERED)
+        again = _event(forecast="200K")
+        await db.save_events([again])
+        assert (again.id, again.status) == (event.id, EventStatus.TRIGGERED)  # Re-import never re-arms
+
+        with db.pool.connection() as conn:
+            rows = conn.execute("SELECT forecast, status FROM calendar_events").fetchall()
+        assert [tuple(row) for row in rows] == [("200K", "TRIGGERED")]
+    asyncio.run(run())
+
+
+def test_trigger_times_are_read_back_aware(db):
+    async def run():
+        aware = _event(trigger_time=datetime(2030, 1, 4, 13, 27, tzinfo=timezone.utc))
+        legacy = _event(title="ISM Services PMI", trigger_time=datetime(2030, 1, 4, 14, 57))
+        await db.save_events([aware, legacy])
+        stored = {event.title: event.trigger_time for event in await db.get_active_events()}
+        assert stored[aware.title] == aware.trigger_time
+        # Rows written before trigger times were aware hold naive system-local times
+        assert stored[legacy.title] == legacy.trigger_time.astimezone()
+    asyncio.run(run())
+
+
+# ---------------- CSV import ----------------
+CSV = """Event,Currency,Date,Time,Importance,forecast,previous,url
+Non-Farm Employment Change,US,2030-01-04,13:30,H,180K,150K,https://example.com/nfp
+CPI m/m,EU,2030-01-05,10:00,medium,0.2%,,
+Retail Sales,GB,01/06/2030,07:00,L,,,
+Missing Impact,CA,2030-01-06,12:00,,,,
+Bad Date,JP,not a date,00:30,High,,,
+Trade Balance,AUSTRALIA,2030-01-07,00:30,3,,,
+"""
+
+
+def test_columnar_parse_matches_row_parse(tmp_path):
+    path = tmp_path / "ff_calendar_thisweek.csv"
+    path.write_text(CSV, encoding="utf-8")
+    engine = CalendarImportEngine(SystemConfig(), None)
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    mapping = engine._map_csv_columns(df.columns.tolist())
+
+    columnar, rejections = engine._parse_csv_frame(df, mapping)
+    rows = [engine._parse_csv_row(row, mapping) for _, row in df.iterrows()]
+    assert columnar == [event for event in rows if event is not None]
+    assert [index for index, _ in rejections] == [index for index, event in enumerate(rows) if event is None]
+    assert [reason for _, reason in rejections] == ["missing impact", "unparseable date 'not a date'"]
+
+    by_title = {event.title: event for event in columnar}
+    assert by_title["Non-Farm Employment Change"].country == "USD"
+    assert by_title["Retail Sales"].date == datetime(2030, 1, 6)  # Mixed date formats
+    assert by_title["Trade Balance"].impact == "High"
+    assert by_title["Non-Farm Employment Change"].quality_score == 100
+    assert asyncio.run(engine.parse_calendar_csv(path)) == columnar
+
+
+def test_event_diff_and_content_hash(tmp_path):
+    engine = CalendarImportEngine(SystemConfig(), None)
+    kept, moved, dropped, done, other_day = (
+        _event(title="Kept"), _event(title="Moved", forecast="1"), _event(title="Dropped"),
+        _event(title="Done", status=EventStatus.TRIGGERED), _event(title="Next week", day=datetime(2030, 1, 11)),
+    )
+    incoming = [_event(title="Kept"), _event(title="Moved", forecast="2"), _event(title="New")]
+    diff = engine.diff_events([kept, moved, dropped, done, other_day], incoming)
+    assert [event.title for event in diff.inserted] == ["New"]
+    assert [(stored.forecast, new.forecast) for stored, new in diff.changed] == [("1", "2")]
+    # Only pending events on the days the file covers are removed
+    assert diff.removed == [dropped]
+    assert diff and not engine.diff_events([kept], [_event(title="Kept")])
+
+    first, second = tmp_path / "a.csv", tmp_path / "b.csv"
+    first.write_text(CSV), second.write_text(CSV)
+    hashes = [asyncio.run(engine.fingerprint_file(path)) for path in (first, second)]
+    assert hashes[0] == hashes[1]
+    second.write_text(CSV + "Extra,US,2030-01-08,15:00,High,,,\n")
+    assert asyncio.run(engine.fingerprint_file(second)) != hashes[0]
+
+
+def test_fuzzy_merge_keeps_best_record_per_release():
+    engine = CalendarImportEngine(SystemConfig(), None)
+    ff = [_event(title="CPI m/m", country="EUR", time="10:00", quality_score=80),
+          _event(title="Retail Sales", country="EUR", time="10:00", quality_score=80)]
+    other = [_event(title="CPI (MoM)", country="EUR", time="10:00", quality_score=95),
+             _event(title="Retail Sales", country="EUR", time="10:00", quality_score=80, forecast="tie"),
+             _event(title="CPI m/m", country="EUR", time="11:00", quality_score=50),
+             _event(title="CPI m/m", country="USD", time="10:00", quality_score=50)]
+    merged = engine.merge_events([ff, other])
+    assert [(event.title, event.country, event.time, event.quality_score) for event in merged] == [
+        ("CPI (MoM)", "EUR", "10:00", 95),  # Higher quality wins
+        ("Retail Sales", "EUR", "10:00", 80),
+        ("CPI m/m", "EUR", "11:00", 50),  # Different release time
+        ("CPI m/m", "USD", "10:00", 50),  # Different country
+    ]
+    assert merged[1].forecast is None  # Earlier source wins ties
+
+
+# ---------------- File watcher ----------------
+def test_watcher_hands_over_a_file_once_it_settles(tmp_path):
+    async def run():
+        ready = []
+        async def on_ready(path):
+            ready.append(path)
+        watcher = cs.CalendarFileWatcher(str(tmp_path), CalendarImportEngine.CALENDAR_FILE_PATTERNS, on_ready, 0.05)
+        watcher._loop = asyncio.get_running_loop()
+        path = tmp_path / "ff_calendar_thisweek.csv"
+        for chunk in ("a", "b", "c"):  # Writes inside the quiet period restart it
+            with open(path, "a") as f:
+                f.write(chunk)
+            watcher._touch(path, watcher._signature(path))
+            await asyncio.sleep(0.02)
+        assert ready == [] and len(watcher._pending) == 1
+        await asyncio.sleep(0.15)
+        assert ready == [path] and not watcher._pending
+
+        # A file that changed after its last event is re-armed instead of ingested
+        stale = watcher._signature(path)
+        path.write_text("changed size")
+        watcher._settle(path, stale)
+        await asyncio.sleep(0.01)
+        assert ready == [path] and path in watcher._pending
+        await asyncio.sleep(0.15)
+        assert ready == [path, path]
+
+        assert not watcher.matches(tmp_path / "notes.txt")
+        await watcher.stop()
+    asyncio.run(run())
+
+
+# ---------------- Trigger scheduling ----------------
+def test_trigger_scheduler_heap_orders_moves_and_cancels():
+    base = datetime(2030, 1, 4, 12, 0, tzinfo=timezone.utc)
+    events = [_event(title=f"E{i}", trigger_time=base + timedelta(minutes=i), id=i) for i in range(5)]
+
+    async def noop(event):
+        pass
+    scheduler = TriggerScheduler(noop)
+    scheduler.replace(list(reversed(events)))
+    assert scheduler.next_trigger_time() == base
+
+    events[0].trigger_time = base + timedelta(minutes=10)
+    scheduler.schedule(events[0])  # Lazy move; the stale entry is skipped
+    scheduler.cancel(events[1])
+    events[2].status = EventStatus.TRIGGERED
+    assert len(scheduler) == 4 and scheduler.next_trigger_time() == base + timedelta(minutes=2)
+
+    # Trigger times in other zones are compared by instant
+    due = scheduler._pop_due((base + timedelta(minutes=4)).astimezone(cs.ZoneInfo("America/New_York")))
+    assert [event.title for event in due] == ["E3", "E4"]
+    assert scheduler.next_trigger_time() == base + timedelta(minutes=10)
+    assert not scheduler.cancel(events[1])
+
+
+def test_trigger_scheduler_fires_on_its_clock():
+    async def run():
+        now = [datetime(2030, 1, 4, 12, 0, tzinfo=timezone.utc)]
+        fired = []
+        async def on_trigger(event):
+            fired.append(event.title)
+        scheduler = TriggerScheduler(on_trigger, max_sleep_seconds=0.01, clock=lambda: now[0])
+        scheduler.replace([_event(title="NFP", trigger_time=now[0] + timedelta(minutes=3))])
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        assert fired == []
+        now[0] += timedelta(minutes=3)
+        await asyncio.sleep(0.05)
+        assert fired == ["NFP"] and len(scheduler) == 0
+        await scheduler.stop()
+    asyncio.run(run())
+
+
+def test_processing_uses_one_aware_clock():
+    config = SystemConfig(calendar_timezone="America/New_York")
+    now = datetime(2030, 1, 4, 6, 0, tzinfo=cs.ZoneInfo("America/New_York"))
+    processor = cs.EventProcessor(config, clock=lambda: now)
+    processed = asyncio.run(processor.process_events([_event(time="08:30", quality_score=100)]))
+    assert [event.trigger_time.isoformat() for event in processed] == [
+        "2030-01-04T06:29:00-05:00", "2030-01-04T07:29:00-05:00", "2030-01-04T08:27:00-05:00"]  # 4H is past
+    assert [event.title for event in processor.schedule.due(datetime(2030, 1, 4, 12, 29, tzinfo=timezone.utc))] == [
+        processed[0].title, processed[1].title]
+
+
+# ---------------- Replay ----------------
+def test_replay_fires_each_event_once_on_the_simulated_clock(tmp_path):
+    week = "Event,Currency,Date,Time,Importance\n{rows}"
+    first = week.format(rows="Non-Farm Employment Change,USD,2030-01-04,13:30,High\nRetail Sales,GBP,2030-01-06,07:00,Medium\n")
+    (tmp_path / "2030_01_a.csv").write_text(first)
+    (tmp_path / "2030_01_a_copy.csv").write_text(first)  # Same week downloaded twice
+    (tmp_path / "2030_01_b.csv").write_text(week.format(
+        rows="CPI m/m,EUR,2030-01-05,10:00,Medium\nRetail Sales,GBP,2030-01-06,09:00,Medium\n"))
+    config = SystemConfig(calendar_timezone="UTC", anticipation_enabled=False)
+    engine = cs.CalendarReplayEngine(config, str(tmp_path))
+    seen = []
+    result = asyncio.run(engine.run(on_signal=seen.append))
+
+    assert result.files == 3 and result.events == 6
+    # NFP fires once; the newer file replaces what was still pending when it was imported
+    assert [(signal.event_title, signal.timestamp) for signal in result.signals] == [
+        ("Non-Farm Employment Change", datetime(2030, 1, 4, 13, 27, tzinfo=timezone.utc)),
+        ("CPI m/m", datetime(2030, 1, 5, 9, 58, tzinfo=timezone.utc)),
+        ("Retail Sales", datetime(2030, 1, 6, 8, 58, tzinfo=timezone.utc)),
+    ]
+    assert seen == result.signals
+
+
+# ---------------- Signal outbox ----------------
+class FlakySink(cs.SignalSink):
+    def __init__(self):
+        self.fail, self.batches = True, []
+
+    def write_batch(self, records):
+        if self.fail:
+            raise OSError("sink down")
+        self.batches.append([record.sequence for record in records])
+
+
+def test_outbox_batches_and_writes_every_sink(tmp_path):
+    async def run():
+        sinks = [cs.CsvSignalSink(tmp_path / "csv"), cs.JournalSignalSink(tmp_path / "signals.journal"),
+                 cs.RingBufferSignalSink(tmp_path / "signals.ring", 4096)]
+        outbox = SignalOutbox(sinks, batch_size=8, flush_interval_ms=20)
+        sequences = await asyncio.gather(*(outbox.submit(_signal(f"S{i}")) for i in range(5)))
+        await outbox.close()
+        return sequences
+    assert asyncio.run(run()) == [1, 2, 3, 4, 5]
+
+    names = sorted(path.name for path in (tmp_path / "csv").iterdir())
+    assert names == [f"signal_20300104_132700_{sequence:08d}.csv" for sequence in range(1, 6)]  # No .tmp left
+    row = pd.read_csv(tmp_path / "csv" / names[0]).iloc[0]
+    assert (row["Symbol"], row["EventTitle"]) == ("EURUSD", "S0")
+    journal = [json.loads(line) for line in (tmp_path / "signals.journal").read_text().splitlines()]
+    assert [record["Sequence"] for record in journal] == [1, 2, 3, 4, 5]
+
+    # Sequence numbering survives a restart
+    reopened = [cs.JournalSignalSink(tmp_path / "signals.journal"), cs.RingBufferSignalSink(tmp_path / "signals.ring", 4096)]
+    assert SignalOutbox(reopened).sequence == 5
+    for sink in reopened:
+        sink.close()
+
+
+def test_ring_buffer_wraps_and_frames_records(tmp_path):
+    sink = cs.RingBufferSignalSink(tmp_path / "signals.ring", 1024)
+    records = [cs.SignalRecord(sequence, _signal(f"S{sequence}")) for sequence in range(1, 8)]
+    for record in records:
+        sink.write_batch([record])
+    magic, capacity, head, last = sink.HEADER.unpack_from(sink._map, 0)
+    assert (magic, capacity, last) == (sink.MAGIC, 1024, 7)
+    # The newest record ends at head, after a wrap to the start of the data area
+    length, sequence = sink.FRAME.unpack_from(sink._map, sink.HEADER.size + head - sink.FRAME.size - len(records[-1].to_json()))
+    assert (length, sequence) == (len(records[-1].to_json()), 7)
+    assert head < sum(sink.FRAME.size + len(record.to_json()) for record in records)
+    with pytest.raises(ValueError):
+        sink.write_batch([cs.SignalRecord(8, _signal("x" * 2048))])
+    sink.close()
+
+
+def test_outbox_redelivers_to_a_failed_sink(tmp_path):
+    async def run():
+        flaky = FlakySink()
+        journal = cs.JournalSignalSink(tmp_path / "signals.journal")
+        outbox = SignalOutbox([journal, flaky], flush_interval_ms=0)
+        assert await outbox.submit(_signal("A")) == 1  # One sink took it
+        flaky.fail = False
+        assert await outbox.submit(_signal("B")) == 2
+        assert flaky.batches == [[1, 2]]  # Backlog first, in order, and only once
+
+        flaky.fail = True
+        alone = SignalOutbox([flaky], flush_interval_ms=0)
+        with pytest.raises(OSError):
+            await alone.submit(_signal("C"))
+        flaky.fail = False
+        await alone.submit(_signal("D"))
+        assert flaky.batches[-1] == [2]  # The failed submission is not retried behind the caller's back
+        await outbox.close()
+    asyncio.run(run())
+
+
+def test_socket_sink_streams_ndjson():
+    server = socket.create_server(("127.0.0.1", 0))
+    received = []
+
+    def serve():
+        conn, _ = server.accept()
+        with conn, conn.makefile("rb") as stream:
+            received.extend(json.loads(line) for line in stream)
+    thread = threading.Thread(target=serve)
+    thread.start()
+    sink = cs.SocketSignalSink(f"127.0.0.1:{server.getsockname()[1]}")
+    sink.write_batch([cs.SignalRecord(1, _signal("A")), cs.SignalRecord(2, _signal("B"))])
+    sink.close()
+    thread.join(5)
+    server.close()
+    assert [(record["Sequence"], record["EventTitle"]) for record in received] == [(1, "A"), (2, "B")]
+
+    with pytest.raises(ValueError, match="Unknown signal sinks"):
+        SignalOutbox.from_config(SystemConfig(signal_sinks=["csv", "fax"]))
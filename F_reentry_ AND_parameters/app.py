@@ -1,15 +1,18 @@
 from __future__ import annotations
-import os, time, pathlib, re
-from typing import Optional, Dict, Any
+import os, time, pathlib, threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, NamedTuple
 from fastapi import FastAPI, HTTPException, Body, Query
 from pydantic import BaseModel, Field
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import local library
-from reentry_core import load_blueprint, IDCodec, RuleEngine, DB, UI
+from reentry_core import load_blueprint, IDCodec, RuleEngine, ComboValidator, DB, UI
 
 DEFAULT_BLUEPRINT_PATH = os.environ.get("REENTRY_BLUEPRINT", "/mnt/data/reentry_blueprint.yaml")
 DEFAULT_SCHEMA_PATH    = os.environ.get("REENTRY_SCHEMA", "/mnt/data/reentry_blueprint.schema.json")
+BATCH_MAX              = int(os.environ.get("REENTRY_BATCH_MAX", "50000"))
+BLUEPRINT_CACHE_SIZE   = int(os.environ.get("REENTRY_BLUEPRINT_CACHE_SIZE", "8"))
 
 app = FastAPI(title="Reentry API", version="0.1.0")
 app.add_middleware(
@@ -21,22 +24,44 @@ app.add_middleware(
 )
 
 # ---------------- Cache ----------------
-_bp_cache: Dict[str, tuple[float, Any]] = {}
-
-def _load_bp(path: Optional[str], schema_path: Optional[str]):
+class _Loaded(NamedTuple):
+    mtime: float
+    bp: Any
+    codec: IDCodec
+    engine: RuleEngine
+    validator: ComboValidator
+
+# Entries are immutable and replaced whole under the lock, so a request that
+# fetched one keeps a consistent blueprint/codec/engine across a hot reload.
+_bp_cache: "OrderedDict[str, _Loaded]" = OrderedDict()
+_bp_lock = threading.Lock()
+
+def _load(path: Optional[str], schema_path: Optional[str]) -> _Loaded:
     bp_path = path or DEFAULT_BLUEPRINT_PATH
     sc_path = schema_path or DEFAULT_SCHEMA_PATH
     p = pathlib.Path(bp_path)
     if not p.exists():
         raise HTTPException(400, f"Blueprint not found: {bp_path}")
     mtime = p.stat().st_mtime
-    cached = _bp_cache.get(bp_path)
-    if cached and cached[0] == mtime:
-        bp = cached[1]
-    else:
-        bp = load_blueprint(bp_path, schema_path=sc_path)
-        _bp_cache[bp_path] = (mtime, bp)
-    return bp
+    with _bp_lock:
+        cached = _bp_cache.get(bp_path)
+        if cached and cached.mtime == mtime:
+            _bp_cache.move_to_end(bp_path)
+            return cached
+    # Build outside the lock so a slow reload does not stall other blueprints.
+    bp = load_blueprint(bp_path, schema_path=sc_path)
+    engine = RuleEngine(bp)
+    engine.compile()
+    loaded = _Loaded(mtime, bp, IDCodec.from_blueprint(bp), engine, ComboValidator.from_blueprint(bp))
+    with _bp_lock:
+        _bp_cache[bp_path] = loaded
+        _bp_cache.move_to_end(bp_path)
+        while len(_bp_cache) > BLUEPRINT_CACHE_SIZE:
+            _bp_cache.popitem(last=False)
+    return loaded
+
+def _load_bp(path: Optional[str], schema_path: Optional[str]):
+    return _load(path, schema_path).bp
 
 # ---------------- Models ----------------
 class Combo(BaseModel):
@@ -68,6 +93,24 @@ class CellResponse(BaseModel):
     combination_id_compact: str
     evaluated_cell: Dict[str, Any]
 
+# max_length is checked while the list is validated, so an oversized batch fails
+# (422) before every combination has been turned into a model.
+class DecideBatchRequest(BaseModel):
+    combos: List[Combo] = Field(..., max_length=BATCH_MAX)
+    blueprint_path: Optional[str] = None
+    schema_path: Optional[str] = None
+
+class DecideBatchResponse(BaseModel):
+    results: List[DecideResponse]
+
+class CellBatchRequest(BaseModel):
+    combos: List[Combo] = Field(..., max_length=BATCH_MAX)
+    blueprint_path: Optional[str] = None
+    schema_path: Optional[str] = None
+
+class CellBatchResponse(BaseModel):
+    results: List[CellResponse]
+
 class MigrateSqliteRequest(BaseModel):
     db_path: str
     blueprint_path: Optional[str] = None
@@ -77,26 +120,30 @@ class UIConfigResponse(BaseModel):
     ui_config: Dict[str, Any]
 
 # ---------------- Helpers ----------------
-def _validate_combo_against_enums(bp, combo: Dict[str, Any]) -> None:
-    enums = bp.get("enumerations", {})
-    # Symbol pattern
-    sym_pat = enums.get("symbol", {}).get("pattern")
-    if sym_pat and not re.match(sym_pat, combo["symbol"]):
-        raise HTTPException(400, f"symbol does not match pattern {sym_pat}")
-    # Enumerated fields
-    for fld in ("signal_type","time_category","context"):
-        allowed = (enums.get(fld, {}) or {}).get("allowed")
-        if allowed and combo[fld] not in allowed:
-            raise HTTPException(400, f"{fld} '{combo[fld]}' not in allowed set: {allowed}")
-    # Outcome range already validated by Pydantic; generation range from blueprint if provided
-    gen_range = (enums.get("generation", {}) or {}).get("range")
-    if gen_range is not None:
-        mn = gen_range.get("min", 0); mx = gen_range.get("max", 9999)
-        if not (mn <= combo["generation"] <= mx):
-            raise HTTPException(400, f"generation {combo['generation']} outside allowed range [{mn},{mx}]")
-
-def _codec_and_engine(bp):
-    return IDCodec.from_blueprint(bp), RuleEngine(bp)
+def _validate_combo_against_enums(validator: ComboValidator, combo: Dict[str, Any]) -> None:
+    err = validator.error(combo)
+    if err:
+        raise HTTPException(400, err)
+
+def _validate_batch_against_enums(validator: ComboValidator, combos: List[Dict[str, Any]]) -> None:
+    errors = validator.errors(combos)
+    if errors:
+        raise HTTPException(400, errors)
+
+def _decide_one(codec, engine, combo: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "combination_id_readable": codec.build(combo, compact=False),
+        "combination_id_compact": codec.build(combo, compact=True),
+        "decision": engine.evaluate_decision(combo),
+        "evaluated_cell": engine.evaluate_cell(combo)
+    }
+
+def _cell_one(codec, engine, combo: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "combination_id_readable": codec.build(combo, compact=False),
+        "combination_id_compact": codec.build(combo, compact=True),
+        "evaluated_cell": engine.evaluate_cell(combo)
+    }
 
 # ---------------- Routes ----------------
 @app.get("/health")
@@ -110,35 +157,31 @@ def ui_config(blueprint_path: Optional[str] = Query(None), schema_path: Optional
 
 @app.post("/decide", response_model=DecideResponse)
 def decide(req: DecideRequest):
-    bp = _load_bp(req.blueprint_path, req.schema_path)
+    ld = _load(req.blueprint_path, req.schema_path)
     combo = req.combo.model_dump()
-    _validate_combo_against_enums(bp, combo)
-    codec, engine = _codec_and_engine(bp)
-    cid_readable = codec.build(combo, compact=False)
-    cid_compact  = codec.build(combo, compact=True)
-    decision = engine.evaluate_decision(combo)
-    cell = engine.evaluate_cell(combo)
-    return {
-        "combination_id_readable": cid_readable,
-        "combination_id_compact": cid_compact,
-        "decision": decision,
-        "evaluated_cell": cell
-    }
+    _validate_combo_against_enums(ld.validator, combo)
+    return _decide_one(ld.codec, ld.engine, combo)
+
+@app.post("/decide/batch", response_model=DecideBatchResponse)
+def decide_batch(req: DecideBatchRequest):
+    ld = _load(req.blueprint_path, req.schema_path)
+    combos = [c.model_dump() for c in req.combos]
+    _validate_batch_against_enums(ld.validator, combos)
+    return {"results": [_decide_one(ld.codec, ld.engine, combo) for combo in combos]}
 
 @app.post("/cell", response_model=CellResponse)
 def cell(req: CellRequest):
-    bp = _load_bp(req.blueprint_path, req.schema_path)
+    ld = _load(req.blueprint_path, req.schema_path)
     combo = req.combo.model_dump()
-    _validate_combo_against_enums(bp, combo)
-    codec, engine = _codec_and_engine(bp)
-    cid_readable = codec.build(combo, compact=False)
-    cid_compact  = codec.build(combo, compact=True)
-    cell = engine.evaluate_cell(combo)
-    return {
-        "combination_id_readable": cid_readable,
-        "combination_id_compact": cid_compact,
-        "evaluated_cell": cell
-    }
+    _validate_combo_against_enums(ld.validator, combo)
+    return _cell_one(ld.codec, ld.engine, combo)
+
+@app.post("/cell/batch", response_model=CellBatchResponse)
+def cell_batch(req: CellBatchRequest):
+    ld = _load(req.blueprint_path, req.schema_path)
+    combos = [c.model_dump() for c in req.combos]
+    _validate_batch_against_enums(ld.validator, combos)
+    return {"results": [_cell_one(ld.codec, ld.engine, combo) for combo in combos]}
 
 @app.post("/migrate/sqlite")
 def migrate_sqlite(req: MigrateSqliteRequest):
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for reentry_core over synthetic blueprints.
+
+Measures RuleEngine.evaluate_decision/evaluate_cell (compiled table and interpreted),
+RuleEngine.compile, IDCodec.build/parse, load_blueprint and the reentry_service /decide
+round trip across blueprints of increasing rule count and combination space.
+
+    python bench_reentry_core.py --out bench.json
+    python bench_reentry_core.py --out bench.json --compare baseline.json --threshold 0.15
+
+With --compare the exit status is 1 when any benchmark's throughput drops by more than
+the threshold relative to the baseline file.
+"""
+import argparse, json, pathlib, platform, random, statistics, sys, tempfile, time
+from datetime import datetime, timezone
+
+HERE = pathlib.Path(__file__).resolve().parent
+try:
+    from reentry_core import load_blueprint, IDCodec, RuleEngine
+except ImportError:
+    # Not installed: use the source tree next to this script (the bare folder imports as a namespace package).
+    sys.modules.pop("reentry_core", None)
+    sys.path.insert(0, str(HERE / "reentry_core"))
+    from reentry_core import load_blueprint, IDCodec, RuleEngine
+
+# name -> (rules per section, signal types, contexts, max generation)
+SCENARIOS = {
+    "small":  (4, 9, 9, 3),
+    "medium": (32, 12, 12, 5),
+    "large":  (128, 16, 16, 7),
+}
+TIME_CATEGORIES = ["FLASH", "INSTANT", "QUICK", "SHORT", "MEDIUM", "LONG", "EXTENDED"]
+OUTCOMES = [1, 2, 3, 4, 5, 6]
+FIELDS = ["symbol", "signal_type", "time_category", "outcome", "context", "generation"]
+
+
+def _condition(rng, enums, gen_max):
+    """One random DSL condition over the enumerated coordinates."""
+    field = rng.choice(["signal_type", "time_category", "outcome", "context", "generation"])
+    if field == "generation":
+        op = rng.choice(["ge", "le", "eq"])
+        return {"field": field, "op": op, "value": rng.randint(0, gen_max)}
+    allowed = enums[field]["allowed"]
+    if rng.random() < 0.5:
+        return {"field": field, "op": "eq", "value": rng.choice(allowed)}
+    return {"field": field, "op": rng.choice(["in", "nin"]), "value": rng.sample(allowed, max(1, len(allowed) // 3))}
+
+
+def _when(rng, enums, gen_max):
+    return {"all_of": [_condition(rng, enums, gen_max) for _ in range(rng.randint(1, 3))]}
+
+
+def synthetic_blueprint(rules, signal_types, contexts, gen_max, seed=0):
+    """Build a self-contained blueprint with the given rule count per section and enum sizes."""
+    rng = random.Random(seed)
+    enums = {
+        "symbol": {"pattern": "^[A-Z0-9._]{1,15}$"},
+        "signal_type": {"allowed": [f"SIG_{i}" for i in range(signal_types)]},
+        "time_category": {
+            "allowed": TIME_CATEGORIES,
+            "volatility_factor": {t: round(1.3 - 0.075 * i, 3) for i, t in enumerate(TIME_CATEGORIES)},
+        },
+        "outcome": {"allowed": OUTCOMES},
+        "context": {"allowed": [f"CTX_{i}" for i in range(contexts)]},
+        "generation": {"range": {"min": 0, "max": gen_max}},
+    }
+    invariants, cells, combos = [], [], []
+    for i in range(rules):
+        invariants.append({
+            "id": f"INV-{i:03d}", "priority": 1000 - i, "when": _when(rng, enums, gen_max),
+            "then": {"decision": "END_TRADING", "parameter_overrides": {"size_multiplier": 0.0}},
+        })
+        cells.append({
+            "id": f"CELL-{i:03d}", "priority": 1000 - i, "when": _when(rng, enums, gen_max),
+            "set_cell": {
+                "action": rng.choice(["SAME_TRADE", "REVERSE", "NO_REENTRY"]),
+                "size_multiplier": "$calc:0.5 * enumerations.time_category.volatility_factor[time_category] + 0.1 * outcome",
+                "delay_minutes": rng.randint(0, 30), "max_attempts": rng.randint(0, 3),
+            },
+        })
+        combos.append({
+            "id": f"COMB-{i:03d}", "priority": 1000 - i, "when": _when(rng, enums, gen_max),
+            "then": {"decision": "REENTRY", "parameter_set": {
+                "size_multiplier": round(rng.uniform(0.5, 1.5), 2), "confidence_adjustment": 1.0,
+                "delay_minutes": rng.randint(0, 30), "max_attempts": 1,
+            }},
+        })
+    return {
+        "schema_version": "1.0.0",
+        "name": f"synthetic_{rules}r",
+        "conventions": {
+            "canonical_coordinate_order": FIELDS,
+            "id_format": {
+                "readable": {"template": "{symbol}:{signal_type}:{time_category}:O{outcome}:{context}:G{generation}",
+                             "regex": "^(?P<symbol>[A-Z0-9._]{1,15}):(?P<signal_type>[A-Z0-9_]+):(?P<time_category>[A-Z_]+):O(?P<outcome>[1-6]):(?P<context>[A-Z0-9_]+):G(?P<generation>[0-9]+)$"},
+                "compact": {"template": "SYM={symbol};T={signal_type};TM={time_category};O={outcome};C={context};G={generation}",
+                            "regex": "^SYM=(?P<symbol>[A-Z0-9._]{1,15});T=(?P<signal_type>[A-Z0-9_]+);TM=(?P<time_category>[A-Z_]+);O=(?P<outcome>[1-6]);C=(?P<context>[A-Z0-9_]+);G=(?P<generation>[0-9]+)$"},
+            },
+        },
+        "enumerations": enums,
+        "defaults": {"max_generation": gen_max},
+        "persistence": {},
+        "rules": {"invariants": invariants, "default_cell_rules": cells, "default_combination_rules": combos},
+        "ui_requirements": {},
+    }
+
+
+def sample_combos(bp, n, seed=0):
+    rng = random.Random(seed)
+    enums = bp["enumerations"]
+    gen = enums["generation"]["range"]
+    symbols = ["EURUSD", "GBPUSD", "USDJPY", "XAUUSD"]
+    return [{
+        "symbol": rng.choice(symbols),
+        "signal_type": rng.choice(enums["signal_type"]["allowed"]),
+        "time_category": rng.choice(enums["time_category"]["allowed"]),
+        "outcome": rng.choice(enums["outcome"]["allowed"]),
+        "context": rng.choice(enums["context"]["allowed"]),
+        "generation": rng.randint(gen["min"], gen["max"]),
+    } for _ in range(n)]
+
+
+def timeit(fn, n, repeat):
+    """Run fn() `repeat` times; fn performs n operations. Returns a result record."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    best = min(times)
+    return {"n": n, "best_s": best, "median_s": statistics.median(times), "ops_per_sec": n / best if best else float("inf")}
+
+
+def bench_api(bp_path, combos, repeat):
+    """Round-trip /decide through reentry_service in-process; None if FastAPI is unavailable."""
+    try:
+        from fastapi.testclient import TestClient
+    except ImportError:
+        return None
+    try:
+        import reentry_service.main as svc
+    except ImportError:
+        sys.modules.pop("reentry_service", None)
+        sys.path.insert(0, str(HERE / "reentry_service"))
+        import reentry_service.main as svc
+    svc.BLUEPRINT_PATH, svc.SCHEMA_PATH = str(bp_path), None
+    with TestClient(svc.app) as client:
+        def run():
+            for c in combos:
+                r = client.post("/decide", json=c)
+                if r.status_code != 200: raise RuntimeError(f"/decide failed: {r.status_code} {r.text}")
+        return timeit(run, len(combos), repeat)
+
+
+def run_scenario(name, spec, sample, repeat, api):
+    bp = synthetic_blueprint(*spec)
+    combos = sample_combos(bp, sample)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        bp_path = pathlib.Path(tmp) / "blueprint.json"
+        bp_path.write_text(json.dumps(bp), encoding="utf-8")
+        results["load_blueprint"] = timeit(lambda: load_blueprint(str(bp_path)), 1, repeat)
+
+        compiled = RuleEngine(bp)
+        results["engine_compile"] = timeit(compiled.compile, 1, max(1, repeat // 2))
+        interp = RuleEngine(bp)
+        for label, engine in (("table", compiled), ("interp", interp)):
+            results[f"evaluate_decision[{label}]"] = timeit(lambda: [engine.evaluate_decision(c) for c in combos], len(combos), repeat)
+            results[f"evaluate_cell[{label}]"] = timeit(lambda: [engine.evaluate_cell(c) for c in combos], len(combos), repeat)
+
+        codec = IDCodec.from_blueprint(bp)
+        ids = [codec.build(c) for c in combos]
+        results["idcodec_build"] = timeit(lambda: [codec.build(c) for c in combos], len(combos), repeat)
+        results["idcodec_parse"] = timeit(lambda: [codec.parse(i) for i in ids], len(ids), repeat)
+
+        if api:
+            res = bench_api(bp_path, combos[:min(len(combos), 500)], repeat)
+            if res is not None: results["api_decide"] = res
+    table = compiled.table
+    info = {"rules": spec[0] * 3, "combinations": len(table) if table is not None else None}
+    return [{"scenario": name, "benchmark": b, **info, **r} for b, r in results.items()]
+
+
+def compare(current, baseline, threshold):
+    """Print a comparison table and return the list of regressions beyond threshold."""
+    base = {(r["scenario"], r["benchmark"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"{'scenario':<8} {'benchmark':<26} {'baseline/s':>12} {'current/s':>12} {'change':>8}")
+    for r in current["results"]:
+        b = base.get((r["scenario"], r["benchmark"]))
+        if b is None: continue
+        change = r["ops_per_sec"] / b["ops_per_sec"] - 1.0
+        flag = "  REGRESSION" if change < -threshold else ""
+        print(f"{r['scenario']:<8} {r['benchmark']:<26} {b['ops_per_sec']:>12.1f} {r['ops_per_sec']:>12.1f} {change:>+7.1%}{flag}")
+        if flag: regressions.append({**r, "baseline_ops_per_sec": b["ops_per_sec"], "change": change})
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark reentry_core over synthetic blueprints.")
+    ap.add_argument("--out", help="Write results JSON here (default: stdout)")
+    ap.add_argument("--compare", help="Baseline results JSON; exit 1 on throughput regressions")
+    ap.add_argument("--threshold", type=float, default=0.10, help="Allowed throughput drop as a fraction (default 0.10)")
+    ap.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset of: " + ", ".join(SCENARIOS))
+    ap.add_argument("--sample", type=int, default=2000, help="Combinations evaluated per round (default 2000)")
+    ap.add_argument("--repeat", type=int, default=5, help="Rounds per benchmark; the best round is reported (default 5)")
+    ap.add_argument("--no-api", action="store_true", help="Skip the FastAPI /decide round trip")
+    args = ap.parse_args()
+
+    names = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in names if s not in SCENARIOS]
+    if unknown: ap.error(f"unknown scenarios: {unknown}")
+
+    results = []
+    for name in names:
+        print(f"Running scenario {name} ...", file=sys.stderr)
+        results.extend(run_scenario(name, SCENARIOS[name], args.sample, args.repeat, not args.no_api))
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sample": args.sample,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        pathlib.Path(args.out).write_text(text, encoding="utf-8")
+        print(f"Wrote {len(results)} results to {args.out}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(pathlib.Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
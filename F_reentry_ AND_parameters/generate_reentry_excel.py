@@ -7,10 +7,14 @@ Creates multiple sheets with matrix combinations and parameter sets
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 import itertools
 
 # Excel file path
 excel_file = "HUEY_P_Reentry_System_Matrix.xlsx"
+MATRIX_SHEET = 'Matrix_34560_Combinations'
+# Rows generated per chunk when streaming the matrix sheet
+MATRIX_CHUNK_SIZE = 5000
 
 # Define all dimensions for the Multi-Dimensional Matrix
 SIGNAL_TYPES = [
@@ -42,45 +46,65 @@ MARKET_CONTEXTS = [
     "RISK_ON", "RISK_OFF", "CENTRAL_BANK_ACTIVE", "HOLIDAY_PERIOD"
 ]
 
+def _matrix_columns(start, stop, updated):
+    """Matrix columns for combinations [start, stop) in itertools.product order"""
+    # Unravel flat positions into coordinates (last dimension varies fastest, like itertools.product)
+    dims = [SIGNAL_TYPES, TIME_CATEGORIES, OUTCOME_BUCKETS, MARKET_CONTEXTS]
+    grid = np.unravel_index(np.arange(start, stop), [len(d) for d in dims])
+    n = stop - start
+    
+    # Generate sample performance metrics (would be populated from actual data)
+    success_rate = np.round(np.random.uniform(0.35, 0.85, n), 3)
+    total_executions = np.random.randint(0, 100, n)
+    
+    return {
+        'Combination_ID': [f"C_{i+1:05d}" for i in range(start, stop)],
+        'Signal_Type': np.asarray(SIGNAL_TYPES)[grid[0]],
+        'Time_Category': np.asarray(TIME_CATEGORIES)[grid[1]],
+        'Outcome_Bucket': np.asarray(OUTCOME_BUCKETS)[grid[2]],
+        'Market_Context': np.asarray(MARKET_CONTEXTS)[grid[3]],
+        'Base_Multiplier': np.round(np.random.uniform(0.8, 1.5, n), 3),
+        'Confidence_Score': np.round(np.random.uniform(0.3, 0.9, n), 3),
+        'Historical_Success_Rate': success_rate,
+        'Total_Executions': total_executions,
+        # Calculate profitable executions based on success rate
+        'Profitable_Executions': (total_executions * success_rate).astype(int),
+        'Average_PnL': np.round(np.random.uniform(-50, 150, n), 2),
+        'Max_Drawdown': np.round(np.random.uniform(10, 200, n), 2),
+        'Sharpe_Ratio': np.round(np.random.uniform(-0.5, 2.5, n), 3),
+        'Last_Updated': np.full(n, updated, dtype=object)
+    }
+
+def _matrix_size():
+    return len(SIGNAL_TYPES) * len(TIME_CATEGORIES) * len(OUTCOME_BUCKETS) * len(MARKET_CONTEXTS)
+
 def generate_matrix_sheet():
     """Generate the complete 34,560 combination matrix"""
     print("Generating Multi-Dimensional Matrix...")
+    updated = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return pd.DataFrame(_matrix_columns(0, _matrix_size(), updated))
+
+def iter_matrix_rows(chunk_size=MATRIX_CHUNK_SIZE):
+    """Yield the matrix header and rows chunk by chunk without materializing a DataFrame"""
+    print("Streaming Multi-Dimensional Matrix...")
+    updated = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    n = _matrix_size()
+    header = None
+    for start in range(0, n, chunk_size):
+        cols = _matrix_columns(start, min(start + chunk_size, n), updated)
+        if header is None:
+            header = list(cols)
+            yield header
+        # tolist() converts NumPy scalars to plain Python values for openpyxl
+        yield from zip(*(np.asarray(c).tolist() for c in cols.values()))
+
+def generate_blueprint_matrix_sheet(blueprint_path, symbol=""):
+    """Evaluate every blueprint combination with the reentry rule engine"""
+    print(f"Evaluating blueprint matrix from {blueprint_path}...")
+    from reentry_core import load_blueprint, RuleEngine
     
-    # Create all combinations
-    combinations = list(itertools.product(
-        SIGNAL_TYPES, TIME_CATEGORIES, OUTCOME_BUCKETS, MARKET_CONTEXTS
-    ))
-    
-    # Create DataFrame with default values
-    matrix_data = []
-    for i, (signal, time_cat, outcome, context) in enumerate(combinations):
-        # Generate sample performance metrics (would be populated from actual data)
-        base_multiplier = np.random.uniform(0.8, 1.5)
-        confidence = np.random.uniform(0.3, 0.9)
-        success_rate = np.random.uniform(0.35, 0.85)
-        
-        matrix_data.append({
-            'Combination_ID': f"C_{i+1:05d}",
-            'Signal_Type': signal,
-            'Time_Category': time_cat,
-            'Outcome_Bucket': outcome,
-            'Market_Context': context,
-            'Base_Multiplier': round(base_multiplier, 3),
-            'Confidence_Score': round(confidence, 3),
-            'Historical_Success_Rate': round(success_rate, 3),
-            'Total_Executions': np.random.randint(0, 100),
-            'Profitable_Executions': 0,  # Will be calculated
-            'Average_PnL': round(np.random.uniform(-50, 150), 2),
-            'Max_Drawdown': round(np.random.uniform(10, 200), 2),
-            'Sharpe_Ratio': round(np.random.uniform(-0.5, 2.5), 3),
-            'Last_Updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        })
-    
-    # Calculate profitable executions based on success rate
-    for row in matrix_data:
-        row['Profitable_Executions'] = int(row['Total_Executions'] * row['Historical_Success_Rate'])
-    
-    return pd.DataFrame(matrix_data)
+    engine = RuleEngine(load_blueprint(blueprint_path))
+    return pd.DataFrame(engine.evaluate_matrix(symbol))
 
 def generate_persona_parameters():
     """Generate persona-based parameter sets"""
@@ -418,52 +442,105 @@ def generate_configuration_reference():
     
     return pd.DataFrame(config_data)
 
-def main():
-    """Generate complete Excel workbook"""
+def _sheet_jobs(blueprint_path, stream_matrix):
+    """(sheet name, generator, args) in workbook order, excluding the summary"""
+    jobs = [] if stream_matrix else [(MATRIX_SHEET, generate_matrix_sheet, ())]
+    jobs += [
+        ('Persona_Parameters', generate_persona_parameters, ()),
+        ('Action_Configuration', generate_action_configuration, ()),
+        ('Risk_Parameters', generate_risk_parameters, ()),
+        ('Configuration_Reference', generate_configuration_reference, ()),
+    ]
+    # Optional: rule-engine evaluation of the canonical blueprint
+    if blueprint_path:
+        jobs.append(('Blueprint_Matrix', generate_blueprint_matrix_sheet, (blueprint_path,)))
+    return jobs
+
+def _run_seeded(seed, fn, *args):
+    """Run a sheet generator with np.random seeded from its own SeedSequence
+    
+    Forked pool workers inherit the parent's np.random state, so unseeded sheets
+    would draw identical "random" columns; each job gets an independent stream.
+    """
+    np.random.seed(seed.generate_state(4))
+    return fn(*args)
+
+def _append_dataframe(ws, df):
+    """Append a DataFrame to a write-only openpyxl worksheet"""
+    ws.append(list(df.columns))
+    for row in df.itertuples(index=False, name=None):
+        ws.append([v.item() if isinstance(v, np.generic) else v for v in row])
+
+def _write_streaming(wb, rows):
+    """Write the matrix rows into a write-only sheet; returns the number of data rows"""
+    ws = wb.create_sheet(MATRIX_SHEET)
+    count = -1  # header row
+    for row in rows:
+        ws.append(row)
+        count += 1
+    return count
+
+def main(blueprint_path=None, workers=None, stream_matrix=False, seed=None):
+    """Generate complete Excel workbook
+    
+    Sheets are generated in parallel across a process pool (workers=1 runs them inline).
+    Each sheet (and the streamed matrix) is seeded from its own child of SeedSequence(seed),
+    so the output is independent of the worker count and reproducible when seed is given.
+    With stream_matrix the workbook is written in openpyxl write-only mode and the matrix
+    sheet is streamed in chunks while the other sheets are generated.
+    """
     print(f"Creating HUEY_P Reentry System Excel workbook: {excel_file}")
     print("This may take a few moments due to the size of the matrix...")
     
-    with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
-        # Sheet 1: Multi-Dimensional Matrix (34,560 combinations)
-        matrix_df = generate_matrix_sheet()
-        matrix_df.to_excel(writer, sheet_name='Matrix_34560_Combinations', index=False)
-        print(f"[OK] Matrix sheet created: {len(matrix_df)} combinations")
-        
-        # Sheet 2: Persona Parameter Sets
-        persona_df = generate_persona_parameters()
-        persona_df.to_excel(writer, sheet_name='Persona_Parameters', index=False)
-        print(f"[OK] Persona parameters sheet created: {len(persona_df)} personas")
-        
-        # Sheet 3: Action Configuration
-        action_df = generate_action_configuration()
-        action_df.to_excel(writer, sheet_name='Action_Configuration', index=False)
-        print(f"[OK] Action configuration sheet created: {len(action_df)} buckets")
-        
-        # Sheet 4: Risk Management Parameters
-        risk_df = generate_risk_parameters()
-        risk_df.to_excel(writer, sheet_name='Risk_Parameters', index=False)
-        print(f"[OK] Risk parameters sheet created: {len(risk_df)} parameters")
-        
-        # Sheet 5: Configuration Reference
-        config_df = generate_configuration_reference()
-        config_df.to_excel(writer, sheet_name='Configuration_Reference', index=False)
-        print(f"[OK] Configuration reference sheet created: {len(config_df)} items")
-        
-        # Sheet 6: Summary
-        summary_data = [
-            ['Total Matrix Combinations', len(matrix_df)],
-            ['Signal Types', len(SIGNAL_TYPES)],
-            ['Time Categories', len(TIME_CATEGORIES)],
-            ['Outcome Buckets', len(OUTCOME_BUCKETS)],
-            ['Market Contexts', len(MARKET_CONTEXTS)],
-            ['Persona Profiles', len(persona_df)],
-            ['Action Buckets', len(action_df)],
-            ['Risk Parameters', len(risk_df)],
-            ['Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
-        ]
-        summary_df = pd.DataFrame(summary_data, columns=['Metric', 'Value'])
-        summary_df.to_excel(writer, sheet_name='Summary', index=False)
-        print("[OK] Summary sheet created")
+    jobs = _sheet_jobs(blueprint_path, stream_matrix)
+    # One child per job plus one for the streamed matrix, in workbook order
+    seeds = np.random.SeedSequence(seed).spawn(len(jobs) + 1)
+    jobs = [(name, fn, args, s) for (name, fn, args), s in zip(jobs, seeds)]
+    wb = None
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+    try:
+        if pool is not None:
+            futures = [(name, pool.submit(_run_seeded, s, fn, *args)) for name, fn, args, s in jobs]
+        if stream_matrix:
+            from openpyxl import Workbook
+            wb = Workbook(write_only=True)
+            np.random.seed(seeds[-1].generate_state(4))
+            matrix_count = _write_streaming(wb, iter_matrix_rows())
+            print(f"[OK] Matrix sheet streamed: {matrix_count} combinations")
+        if pool is not None:
+            sheets = {name: f.result() for name, f in futures}
+        else:
+            sheets = {name: _run_seeded(s, fn, *args) for name, fn, args, s in jobs}
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if not stream_matrix:
+        matrix_count = len(sheets[MATRIX_SHEET])
+    
+    # Summary sheet
+    summary_data = [
+        ['Total Matrix Combinations', matrix_count],
+        ['Signal Types', len(SIGNAL_TYPES)],
+        ['Time Categories', len(TIME_CATEGORIES)],
+        ['Outcome Buckets', len(OUTCOME_BUCKETS)],
+        ['Market Contexts', len(MARKET_CONTEXTS)],
+        ['Persona Profiles', len(sheets['Persona_Parameters'])],
+        ['Action Buckets', len(sheets['Action_Configuration'])],
+        ['Risk Parameters', len(sheets['Risk_Parameters'])],
+        ['Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
+    ]
+    sheets['Summary'] = pd.DataFrame(summary_data, columns=['Metric', 'Value'])
+    
+    if stream_matrix:
+        for name, df in sheets.items():
+            _append_dataframe(wb.create_sheet(name), df)
+            print(f"[OK] {name} sheet created: {len(df)} rows")
+        wb.save(excel_file)
+    else:
+        with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
+            for name, df in sheets.items():
+                df.to_excel(writer, sheet_name=name, index=False)
+                print(f"[OK] {name} sheet created: {len(df)} rows")
     
     print(f"\nSUCCESS: Excel workbook generated: {excel_file}")
     print("\nSheet Contents:")
@@ -472,7 +549,17 @@ def main():
     print("- Action_Configuration: Six-bucket reentry actions")
     print("- Risk_Parameters: Risk management settings")
     print("- Configuration_Reference: Documentation and usage guide")
+    if blueprint_path:
+        print("- Blueprint_Matrix: Rule-engine evaluation of the blueprint")
     print("- Summary: Workbook overview")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    ap = argparse.ArgumentParser(description="Generate the HUEY_P Reentry System Excel workbook.")
+    # Optional argument: path to reentry_blueprint.yaml to add an evaluated Blueprint_Matrix sheet
+    ap.add_argument("blueprint", nargs="?", help="Blueprint path; adds an evaluated Blueprint_Matrix sheet")
+    ap.add_argument("--workers", type=int, default=None, help="Sheet generation processes (default: CPU count; 1 = no pool)")
+    ap.add_argument("--stream-matrix", action="store_true", help="Stream the matrix sheet in openpyxl write-only mode")
+    ap.add_argument("--seed", type=int, default=None, help="Seed for the generated sample statistics (default: fresh entropy)")
+    args = ap.parse_args()
+    main(args.blueprint, workers=args.workers, stream_matrix=args.stream_matrix, seed=args.seed)
@@ -1,6 +1,8 @@
 from .loader import load_blueprint, ReentryBlueprint
 from .id_codec import IDCodec
 from .rules import RuleEngine
+from .table import DecisionTable
+from .validator import ComboValidator
 from .db import DB
 from .ui import UI
-__all__ = ["load_blueprint","ReentryBlueprint","IDCodec","RuleEngine","DB","UI"]
+__all__ = ["load_blueprint","ReentryBlueprint","IDCodec","RuleEngine","DecisionTable","ComboValidator","DB","UI"]
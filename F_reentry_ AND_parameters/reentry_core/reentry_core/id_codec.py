@@ -1,24 +1,122 @@
 from __future__ import annotations
+import numbers
 import re
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None
+from .table import blueprint_axes
+
+# Symbols are pattern-validated, not enumerated, so they are packed as a base-39 number
+# (0 = end, 1..38 = alphabet) above the enumerated bit fields. With the default blueprint
+# that leaves room for 8-character symbols below 2**63 (a signed SQLite INTEGER).
+_SYMBOL_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ._"
+_SYMBOL_CODES = {ch: i + 1 for i, ch in enumerate(_SYMBOL_ALPHABET)}
+_SYMBOL_BASE = len(_SYMBOL_ALPHABET) + 1
+_INT64_MAX = 2**63 - 1
+
+def _symbol_code(symbol: str) -> int:
+    code = 0
+    for ch in symbol:
+        c = _SYMBOL_CODES.get(ch)
+        if c is None: raise ValueError(f"Symbol {symbol!r} has a character outside {_SYMBOL_ALPHABET!r}")
+        code = code * _SYMBOL_BASE + c
+    return code
+
+def _symbol_from_code(code: int) -> str:
+    chars = []
+    while code:
+        code, c = divmod(code, _SYMBOL_BASE)
+        if c == 0: raise ValueError("Invalid packed symbol")
+        chars.append(_SYMBOL_ALPHABET[c - 1])
+    return "".join(reversed(chars))
+
+class _PackedLayout:
+    def __init__(self, fields: List[Tuple[str, List[Any]]]):
+        # fields are listed most significant first; the last field occupies the lowest bits.
+        self.fields = []
+        shift = 0
+        for name, values in reversed(fields):
+            bits = max(1, (len(values) - 1).bit_length())
+            self.fields.append((name, values, {v: i for i, v in enumerate(values)}, shift, (1 << bits) - 1))
+            shift += bits
+        self.fields.reverse()
+        self.symbol_shift = shift
 
 class IDCodec:
-    def __init__(self, read_t: str, read_r: str, comp_t: str, comp_r: str):
+    def __init__(self, read_t: str, read_r: str, comp_t: str, comp_r: str, packed_fields: Optional[List[Tuple[str, List[Any]]]] = None):
         self.readable_template = read_t
         self.compact_template  = comp_t
         self._readable_re = re.compile(read_r)
         self._compact_re  = re.compile(comp_r)
+        self._packed = _PackedLayout(packed_fields) if packed_fields else None
     @classmethod
     def from_blueprint(cls, bp: Dict[str, Any]) -> "IDCodec":
         f = bp["conventions"]["id_format"]
-        return cls(f["readable"]["template"], f["readable"]["regex"], f["compact"]["template"], f["compact"]["regex"])
+        axes = blueprint_axes(bp)
+        packed = None
+        if axes is not None:
+            order = bp["conventions"].get("canonical_coordinate_order", [])
+            packed = [(fld, axes[fld]) for fld in order if fld in axes]
+        return cls(f["readable"]["template"], f["readable"]["regex"], f["compact"]["template"], f["compact"]["regex"], packed)
     def build(self, combo: Dict[str, Any], compact: bool=False) -> str:
         t = self.compact_template if compact else self.readable_template
         return t.format(**combo)
-    def parse(self, combination_id: str) -> Dict[str, Any]:
+    def parse(self, combination_id: Union[str, int]) -> Dict[str, Any]:
+        # numbers.Integral also admits the NumPy integers produced by encode_many.
+        if isinstance(combination_id, numbers.Integral): return self.decode(int(combination_id))
         m = self._readable_re.match(combination_id) or self._compact_re.match(combination_id)
         if not m: raise ValueError(f"Invalid combination_id: {combination_id}")
         d = m.groupdict()
         if "outcome" in d: d["outcome"] = int(d["outcome"])
         if "generation" in d: d["generation"] = int(d["generation"])
         return d
+    def _layout(self) -> _PackedLayout:
+        if self._packed is None: raise ValueError("Blueprint enumerations do not define a finite space; packed IDs unavailable")
+        return self._packed
+    def encode(self, combo: Dict[str, Any]) -> int:
+        lay = self._layout()
+        key = _symbol_code(combo["symbol"]) << lay.symbol_shift
+        for name, _, ords, shift, _ in lay.fields:
+            o = ords.get(combo[name])
+            if o is None: raise ValueError(f"{name} {combo[name]!r} is not an allowed value")
+            key |= o << shift
+        return key
+    def decode(self, key: int) -> Dict[str, Any]:
+        lay = self._layout()
+        if key < 0: raise ValueError(f"Invalid packed combination_id: {key}")
+        d: Dict[str, Any] = {"symbol": _symbol_from_code(key >> lay.symbol_shift)}
+        for name, values, _, shift, mask in lay.fields:
+            o = (key >> shift) & mask
+            if o >= len(values): raise ValueError(f"Invalid packed combination_id: {key}")
+            d[name] = values[o]
+        return d
+    def encode_many(self, combos: Union[Dict[str, Sequence[Any]], Sequence[Dict[str, Any]]]) -> "np.ndarray":
+        # Accepts column arrays (e.g. RuleEngine.evaluate_matrix output) or a list of combo dicts.
+        if np is None: raise RuntimeError("NumPy is required for encode_many. pip install numpy")
+        lay = self._layout()
+        cols = combos if isinstance(combos, dict) else {k: [c[k] for c in combos] for k in ["symbol"] + [f[0] for f in lay.fields]}
+        syms, inverse = np.unique(np.asarray(cols["symbol"], dtype=object).astype(str), return_inverse=True)
+        codes = [_symbol_code(s) for s in syms]
+        dtype = np.int64 if (max(codes, default=0) + 1) << lay.symbol_shift <= _INT64_MAX else object
+        keys = np.asarray(codes, dtype=dtype)[inverse] << lay.symbol_shift
+        for name, values, ords, shift, _ in lay.fields:
+            vals, inv = np.unique(np.asarray(cols[name], dtype=object), return_inverse=True)
+            o = [ords.get(v.item() if hasattr(v, "item") else v) for v in vals]
+            if None in o: raise ValueError(f"{name} {vals[o.index(None)]!r} is not an allowed value")
+            keys |= np.asarray(o, dtype=dtype)[inv] << shift
+        return keys
+    def decode_many(self, keys: Sequence[int]) -> Dict[str, "np.ndarray"]:
+        if np is None: raise RuntimeError("NumPy is required for decode_many. pip install numpy")
+        lay = self._layout()
+        arr = np.asarray(keys)
+        if arr.dtype.kind not in "iuO": raise ValueError("Packed combination_ids must be integers")
+        if len(arr) and arr.min() < 0: raise ValueError("Packed combination_ids must be non-negative")
+        codes, inverse = np.unique(arr >> lay.symbol_shift, return_inverse=True)
+        out: Dict[str, "np.ndarray"] = {"symbol": np.asarray([_symbol_from_code(int(c)) for c in codes], dtype=object)[inverse]}
+        for name, values, _, shift, mask in lay.fields:
+            o = ((arr >> shift) & mask).astype(np.int64)
+            if len(o) and int(o.max()) >= len(values): raise ValueError(f"Invalid packed combination_id for {name}")
+            out[name] = np.asarray(values)[o]
+        return out
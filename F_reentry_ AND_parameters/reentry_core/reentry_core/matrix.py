@@ -0,0 +1,142 @@
+from __future__ import annotations
+import itertools
+from typing import Any, Dict, List, Tuple, TYPE_CHECKING
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None
+from .table import AXES, blueprint_axes
+if TYPE_CHECKING:
+    from .rules import RuleEngine
+
+_CELL_DEFAULTS = {"size_multiplier": 1.0, "confidence_adjustment": 1.0, "delay_minutes": 0, "max_attempts": 0}
+_NO_CELL = {"action": "NO_REENTRY", "size_multiplier": 0.0, "confidence_adjustment": 0.0, "delay_minutes": 0, "max_attempts": 0}
+_NO_DECISION = {"size_multiplier": 0.0, "confidence_adjustment": 0.0, "delay_minutes": 0, "max_attempts": 0}
+
+def _column(values: List[Any]) -> "np.ndarray":
+    if values and all(isinstance(v, int) and not isinstance(v, bool) for v in values): return np.asarray(values, dtype=np.int64)
+    if values and all(isinstance(v, str) for v in values): return np.asarray(values, dtype=str)
+    return np.asarray(values, dtype=object)
+
+def _coordinate_columns(axes: Dict[str, List[Any]], symbol: str) -> Tuple[int, Dict[str, "np.ndarray"]]:
+    sizes = [len(axes[f]) for f in AXES]
+    n = int(np.prod(sizes))
+    # C-order indices vary the last axis fastest, the same layout DecisionTable uses.
+    grid = np.indices(sizes).reshape(len(AXES), n)
+    cols = {"symbol": np.full(n, symbol, dtype=object)}
+    for i, f in enumerate(AXES): cols[f] = _column(axes[f])[grid[i]]
+    return n, cols
+
+class _Masker:
+    def __init__(self, engine: "RuleEngine", cols: Dict[str, "np.ndarray"], n: int):
+        self.engine, self.cols, self.n = engine, cols, n
+    def cond(self, cnd: Dict[str, Any]) -> "np.ndarray":
+        col = self.cols[cnd["field"]]
+        val = cnd.get("value")
+        if isinstance(val, str) and val.startswith("$calc:"):
+            # Row-dependent operand: fall back to the scalar evaluator for this one condition.
+            return np.fromiter((self.engine._ok(cnd, self.row(i)) for i in range(self.n)), dtype=bool, count=self.n)
+        val = self.engine._resolve_value(val, {})
+        op = cnd["op"]
+        if op == "eq": return self._full(col == val)
+        if op == "ne": return self._full(col != val)
+        if op == "in": return np.isin(col, list(val))
+        if op == "nin": return ~np.isin(col, list(val))
+        if op == "ge": return col >= val
+        if op == "gt": return col > val
+        if op == "le": return col <= val
+        if op == "lt": return col < val
+        if op == "between": return (col >= val[0]) & (col <= val[1])
+        raise ValueError(f"Unsupported operator: {op}")
+    def _full(self, res: Any) -> "np.ndarray":
+        # Comparing a typed column against an incompatible scalar yields a single bool.
+        return res if np.ndim(res) else np.full(self.n, bool(res))
+    def block(self, blk: Dict[str, Any]) -> "np.ndarray":
+        if not blk: return np.ones(self.n, dtype=bool)
+        if "all_of" in blk:
+            m = np.ones(self.n, dtype=bool)
+            for c in blk["all_of"]: m &= self.cond(c)
+            return m
+        if "any_of" in blk:
+            m = np.zeros(self.n, dtype=bool)
+            for c in blk["any_of"]: m |= self.cond(c)
+            return m
+        if "not" in blk: return ~self.block(blk["not"])
+        return np.ones(self.n, dtype=bool)
+    def row(self, i: int) -> Dict[str, Any]:
+        return {k: (v[i].item() if hasattr(v[i], "item") else v[i]) for k, v in self.cols.items()}
+
+class _Output:
+    def __init__(self, n: int):
+        self.n = n
+        self.values: Dict[str, "np.ndarray"] = {}
+    def _col(self, name: str) -> "np.ndarray":
+        if name not in self.values: self.values[name] = np.full(self.n, None, dtype=object)
+        return self.values[name]
+    def put(self, name: str, mask: "np.ndarray", val: Any, engine: "RuleEngine", cols: Dict[str, "np.ndarray"], symbol: str) -> None:
+        out = self._col(name)
+        calc = engine._calc(val)
+        if calc is None:
+            out[mask] = engine._resolve_value(val, {})
+            return
+        # Evaluate once per distinct value of the fields the expression reads.
+        fields = sorted(calc.fields)
+        choices = [np.unique(cols[f][mask]) for f in fields]
+        for combo_vals in itertools.product(*choices):
+            sub = mask.copy()
+            ctx: Dict[str, Any] = {"symbol": symbol}
+            for f, v in zip(fields, combo_vals):
+                sub &= cols[f] == v
+                ctx[f] = v.item() if hasattr(v, "item") else v
+            out[sub] = calc(ctx)
+    def columns(self) -> Dict[str, "np.ndarray"]:
+        res = {}
+        for name, col in self.values.items():
+            present = [v for v in col if v is not None]
+            if present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+                res[name] = np.array([np.nan if v is None else v for v in col], dtype=np.float64)
+            else:
+                res[name] = col
+        return res
+
+def _assign(rules: List[Dict[str, Any]], masker: _Masker) -> Tuple["np.ndarray", List["np.ndarray"]]:
+    # Highest priority first; each row keeps the first rule whose condition holds.
+    free = np.ones(masker.n, dtype=bool)
+    picks = []
+    for r in rules:
+        m = masker.block(r.get("when", {})) & free
+        free &= ~m
+        picks.append(m)
+    return free, picks
+
+def evaluate_matrix(engine: "RuleEngine", symbol: str = "") -> Dict[str, "np.ndarray"]:
+    if np is None: raise RuntimeError("NumPy is required for evaluate_matrix. pip install numpy")
+    axes = blueprint_axes(engine.bp)
+    if axes is None: raise ValueError("Blueprint enumerations do not define a finite combination space")
+    n, cols = _coordinate_columns(axes, symbol)
+    masker = _Masker(engine, cols, n)
+    out = _Output(n)
+    decision, source, decision_rule = out._col("decision"), out._col("decision_source"), out._col("decision_rule")
+    # Invariants override default combination rules.
+    inv_free, inv_picks = _assign(engine._invariants, masker)
+    comb_free, comb_picks = _assign(engine._comb_rules, masker)
+    comb_free &= inv_free
+    for r, m in zip(engine._comb_rules, comb_picks):
+        m &= inv_free
+        then = r.get("then", {})
+        decision[m] = then.get("decision"); source[m] = "default_rules"; decision_rule[m] = r.get("id")
+        for k, v in then.get("parameter_set", {}).items(): out.put(f"param_{k}", m, v, engine, cols, symbol)
+    decision[comb_free] = "END_TRADING"; source[comb_free] = "default_rules"
+    for k, v in _NO_DECISION.items(): out.put(f"param_{k}", comb_free, v, engine, cols, symbol)
+    for r, m in zip(engine._invariants, inv_picks):
+        then = r.get("then", {})
+        decision[m] = then.get("decision"); source[m] = "invariant"; decision_rule[m] = r.get("id")
+        for k, v in then.get("parameter_overrides", {}).items(): out.put(f"param_{k}", m, v, engine, cols, symbol)
+    cell_rule = out._col("cell_rule")
+    cell_free, cell_picks = _assign(engine._cell_rules, masker)
+    for r, m in zip(engine._cell_rules, cell_picks):
+        set_cell = {**_CELL_DEFAULTS, **r.get("set_cell", {})}
+        cell_rule[m] = r.get("id")
+        for k, v in set_cell.items(): out.put("action" if k == "action" else f"cell_{k}", m, v, engine, cols, symbol)
+    for k, v in _NO_CELL.items(): out.put("action" if k == "action" else f"cell_{k}", cell_free, v, engine, cols, symbol)
+    return {**cols, **out.columns()}
@@ -1,7 +1,8 @@
 from __future__ import annotations
-from typing import Any, Dict
-import re
-from .util import safe_calc
+from typing import Any, Dict, FrozenSet, List, Optional
+from .util import CompiledCalc, compile_calc
+from .table import DecisionTable
+from .matrix import evaluate_matrix
 
 OPS = {
     "eq": lambda a,b: a == b,
@@ -15,14 +16,49 @@ OPS = {
     "between": lambda a,b: b[0] <= a <= b[1],
 }
 
+def _by_priority(rules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(rules, key=lambda r: r.get("priority", 0), reverse=True)
+
+def _copy(res: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: (dict(v) if isinstance(v, dict) else v) for k, v in res.items()}
+
+class _InvalidCalc:
+    # Stands in for a $calc that failed to compile; raises when its rule is evaluated.
+    fields: FrozenSet[str] = frozenset()
+    def __init__(self, error: ValueError):
+        self.error = error
+    def __call__(self, ctx: Dict[str, Any]) -> Any:
+        raise self.error
+
 class RuleEngine:
-    _ENUM_SUBSCRIPT_RE = re.compile(r"enumerations\.([A-Za-z_]+)\.([A-Za-z_]+)\[([A-Za-z_]+)\]")
     def __init__(self, blueprint: Dict[str, Any]):
         self.bp = blueprint
         self.enums = blueprint.get("enumerations", {})
         self.rules = blueprint.get("rules", {})
         self.defaults = blueprint.get("defaults", {})
         self._ctx = {"enumerations": self.enums, "defaults": self.defaults}
+        self._invariants = _by_priority(self.rules.get("invariants", []))
+        self._cell_rules = _by_priority(self.rules.get("default_cell_rules", []))
+        self._comb_rules = _by_priority(self.rules.get("default_combination_rules", []))
+        self.table: Optional[DecisionTable] = None
+        # $calc expressions are compiled once per blueprint; enumerations/defaults are folded in as constants.
+        self._calcs: Dict[str, CompiledCalc] = {}
+        # A bad expression only fails the rule that uses it, when that rule is evaluated.
+        for r in self._invariants:
+            for v in r.get("then", {}).get("parameter_overrides", {}).values(): self._precompile(r, v)
+        for r in self._comb_rules:
+            for v in r.get("then", {}).get("parameter_set", {}).values(): self._precompile(r, v)
+        for r in self._cell_rules:
+            for v in r.get("set_cell", {}).values(): self._precompile(r, v)
+    def compile(self) -> Optional[DecisionTable]:
+        # Precompute every enumerable combination; None when the blueprint has no finite space.
+        self.table = DecisionTable.from_engine(self)
+        return self.table
+    def evaluate_matrix(self, symbol: str = "") -> Dict[str, Any]:
+        # Columnar (dict of NumPy arrays) evaluation of every combination, one boolean mask per condition.
+        return evaluate_matrix(self, symbol)
+    def _lookup(self, combo: Dict[str, Any]) -> Optional[int]:
+        return self.table.index(combo) if self.table is not None else None
     def _resolve_value(self, val: Any, combo: Dict[str, Any]) -> Any:
         if isinstance(val, str) and val.startswith("$ref."):
             cur = self.bp
@@ -30,33 +66,35 @@ class RuleEngine:
                 cur = cur[part]
             return cur
         if isinstance(val, str) and val.startswith("$calc:"):
-            expr = val[len("$calc:"):]
-            def repl(m: re.Match) -> str:
-                sect, sub, fieldname = m.group(1), m.group(2), m.group(3)
-                key = combo[fieldname]; value = self.enums[sect][sub][key]
-                return str(value)
-            expr = self._ENUM_SUBSCRIPT_RE.sub(repl, expr)
-            return safe_calc(expr, {**self._ctx, **combo})
+            return self._calc(val)(combo)
         return val
+    def _calc(self, val: Any) -> CompiledCalc | None:
+        if not (isinstance(val, str) and val.startswith("$calc:")): return None
+        calc = self._calcs.get(val)
+        if calc is None:
+            calc = self._calcs[val] = compile_calc(val[len("$calc:"):], self._ctx)
+        return calc
+    def _precompile(self, rule: Dict[str, Any], val: Any) -> None:
+        try: self._calc(val)
+        except ValueError as e:
+            self._calcs[val] = _InvalidCalc(ValueError(f"Rule {rule.get('id', '<unnamed>')}: {e}"))
     def _ok(self, cnd: Dict[str, Any], combo: Dict[str, Any]) -> bool:
-        return OPS[cnd["op"]](combo[cnd["field"]], cnd.get("value"))
+        return OPS[cnd["op"]](combo[cnd["field"]], self._resolve_value(cnd.get("value"), combo))
     def _blk(self, blk: Dict[str, Any], combo: Dict[str, Any]) -> bool:
         if not blk: return True
         if "all_of" in blk: return all(self._ok(c, combo) for c in blk["all_of"])
         if "any_of" in blk: return any(self._ok(c, combo) for c in blk["any_of"])
         if "not" in blk: return not self._blk(blk["not"], combo)
         return True
-    def evaluate_invariants(self, combo: Dict[str, Any]) -> Dict[str, Any] | None:
-        invs = sorted(self.rules.get("invariants", []), key=lambda r: r.get("priority", 0), reverse=True)
-        for inv in invs:
+    def _interp_invariants(self, combo: Dict[str, Any]) -> Dict[str, Any] | None:
+        for inv in self._invariants:
             if self._blk(inv.get("when", {}), combo):
                 then = inv.get("then", {})
                 po = {k: self._resolve_value(v, combo) for k, v in then.get("parameter_overrides", {}).items()}
                 return {"decision": then.get("decision"), "parameter_set": po}
         return None
-    def evaluate_cell(self, combo: Dict[str, Any]) -> Dict[str, Any]:
-        rules = sorted(self.rules.get("default_cell_rules", []), key=lambda r: r.get("priority", 0), reverse=True)
-        for r in rules:
+    def _interp_cell(self, combo: Dict[str, Any]) -> Dict[str, Any]:
+        for r in self._cell_rules:
             if self._blk(r.get("when", {}), combo):
                 set_cell = {k: self._resolve_value(v, combo) for k, v in r.get("set_cell", {}).items()}
                 set_cell.setdefault("size_multiplier", 1.0)
@@ -65,14 +103,26 @@ class RuleEngine:
                 set_cell.setdefault("max_attempts", 0)
                 return set_cell
         return {"action": "NO_REENTRY", "size_multiplier": 0.0, "confidence_adjustment": 0.0, "delay_minutes": 0, "max_attempts": 0}
-    def evaluate_combination_defaults(self, combo: Dict[str, Any]) -> Dict[str, Any]:
-        rules = sorted(self.rules.get("default_combination_rules", []), key=lambda r: r.get("priority", 0), reverse=True)
-        for r in rules:
+    def _interp_combination_defaults(self, combo: Dict[str, Any]) -> Dict[str, Any]:
+        for r in self._comb_rules:
             if self._blk(r.get("when", {}), combo):
                 then = r.get("then", {})
                 param = {k: self._resolve_value(v, combo) for k, v in then.get("parameter_set", {}).items()}
                 return {"decision": then.get("decision"), "parameter_set": param}
         return {"decision": "END_TRADING", "parameter_set": {"size_multiplier": 0.0, "confidence_adjustment": 0.0, "delay_minutes": 0, "max_attempts": 0}}
+    def evaluate_invariants(self, combo: Dict[str, Any]) -> Dict[str, Any] | None:
+        idx = self._lookup(combo)
+        if idx is None: return self._interp_invariants(combo)
+        inv = self.table.invariants[idx]
+        return _copy(inv) if inv else None
+    def evaluate_cell(self, combo: Dict[str, Any]) -> Dict[str, Any]:
+        idx = self._lookup(combo)
+        if idx is None: return self._interp_cell(combo)
+        return _copy(self.table.cells[idx])
+    def evaluate_combination_defaults(self, combo: Dict[str, Any]) -> Dict[str, Any]:
+        idx = self._lookup(combo)
+        if idx is None: return self._interp_combination_defaults(combo)
+        return _copy(self.table.combination_defaults[idx])
     def evaluate_decision(self, combo: Dict[str, Any]) -> Dict[str, Any]:
         inv = self.evaluate_invariants(combo)
         if inv: return inv
@@ -0,0 +1,78 @@
+from __future__ import annotations
+import itertools, re
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .rules import RuleEngine
+
+# Enumerable coordinates, outermost first. Symbol is pattern-validated rather than enumerated,
+# so it is not an axis; blueprints whose rules depend on symbol cannot be compiled.
+AXES: Tuple[str, ...] = ("signal_type", "time_category", "outcome", "context", "generation")
+_SYMBOL_RE = re.compile(r"\bsymbol\b")
+
+def blueprint_axes(bp: Dict[str, Any]) -> Optional[Dict[str, List[Any]]]:
+    enums = bp.get("enumerations", {})
+    axes: Dict[str, List[Any]] = {}
+    for fld in AXES[:-1]:
+        allowed = (enums.get(fld, {}) or {}).get("allowed")
+        if not allowed: return None
+        axes[fld] = list(allowed)
+    gen_range = (enums.get("generation", {}) or {}).get("range")
+    if not gen_range or gen_range.get("max") is None: return None
+    axes["generation"] = list(range(gen_range.get("min", 0), gen_range["max"] + 1))
+    return axes
+
+def _blk_uses_symbol(blk: Dict[str, Any]) -> bool:
+    if not blk: return False
+    if "not" in blk: return _blk_uses_symbol(blk["not"])
+    conds = blk.get("all_of", []) + blk.get("any_of", [])
+    return any(c.get("field") == "symbol" for c in conds)
+
+def _values_use_symbol(values: Dict[str, Any]) -> bool:
+    return any(isinstance(v, str) and v.startswith("$calc:") and _SYMBOL_RE.search(v) for v in values.values())
+
+def _rules_use_symbol(engine: "RuleEngine") -> bool:
+    for r in engine._invariants:
+        if _blk_uses_symbol(r.get("when", {})) or _values_use_symbol(r.get("then", {}).get("parameter_overrides", {})): return True
+    for r in engine._comb_rules:
+        if _blk_uses_symbol(r.get("when", {})) or _values_use_symbol(r.get("then", {}).get("parameter_set", {})): return True
+    for r in engine._cell_rules:
+        if _blk_uses_symbol(r.get("when", {})) or _values_use_symbol(r.get("set_cell", {})): return True
+    return False
+
+class DecisionTable:
+    def __init__(self, axes: Dict[str, List[Any]], invariants: List[Optional[Dict[str, Any]]],
+                 combination_defaults: List[Dict[str, Any]], cells: List[Dict[str, Any]]):
+        self.axes = axes
+        self._ordinals = [{v: i for i, v in enumerate(axes[fld])} for fld in AXES]
+        self._sizes = [len(axes[fld]) for fld in AXES]
+        self.invariants = invariants
+        self.combination_defaults = combination_defaults
+        self.cells = cells
+    def __len__(self) -> int:
+        return len(self.cells)
+    @classmethod
+    def from_engine(cls, engine: "RuleEngine") -> Optional["DecisionTable"]:
+        axes = blueprint_axes(engine.bp)
+        if axes is None or _rules_use_symbol(engine): return None
+        invariants: List[Optional[Dict[str, Any]]] = []
+        defaults: List[Dict[str, Any]] = []
+        cells: List[Dict[str, Any]] = []
+        # itertools.product varies the last axis fastest, matching index() below.
+        for values in itertools.product(*(axes[fld] for fld in AXES)):
+            combo = dict(zip(AXES, values), symbol="")
+            try:
+                invariants.append(engine._interp_invariants(combo))
+                defaults.append(engine._interp_combination_defaults(combo))
+                cells.append(engine._interp_cell(combo))
+            except (ValueError, ArithmeticError, TypeError, LookupError):
+                # A rule that cannot be evaluated everywhere (invalid $calc, division by zero,
+                # dangling $ref): stay interpreted so only combos reaching it fail.
+                return None
+        return cls(axes, invariants, defaults, cells)
+    def index(self, combo: Dict[str, Any]) -> Optional[int]:
+        idx = 0
+        for fld, ords, size in zip(AXES, self._ordinals, self._sizes):
+            o = ords.get(combo.get(fld))
+            if o is None: return None
+            idx = idx * size + o
+        return idx
@@ -0,0 +1,112 @@
+from __future__ import annotations
+import ast, operator
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+_BIN = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod, ast.Pow: operator.pow,
+}
+_UNARY = {ast.USub: operator.neg, ast.UAdd: operator.pos, ast.Not: operator.not_}
+_CMP = {
+    ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt, ast.LtE: operator.le,
+    ast.Gt: operator.gt, ast.GtE: operator.ge, ast.In: lambda a, b: a in b, ast.NotIn: lambda a, b: a not in b,
+}
+_FUNCS = {"min": min, "max": max, "abs": abs, "round": round, "int": int, "float": float}
+_MEMO_MAX = 4096
+_NOCONST = object()
+
+Fn = Callable[[Dict[str, Any]], Any]
+
+def _member(obj: Any, key: Any) -> Any:
+    if isinstance(obj, dict): return obj[key]
+    raise ValueError(f"Unsupported member access on {type(obj).__name__}")
+
+def _name(name: str) -> Fn:
+    def get(ctx: Dict[str, Any]) -> Any:
+        try: return ctx[name]
+        except KeyError: raise ValueError(f"Unknown name in $calc: {name}") from None
+    return get
+
+def _compile(node: ast.AST, consts: Dict[str, Any], fields: set) -> Tuple[Fn, Any]:
+    # Returns (evaluator, folded value or _NOCONST). Subtrees that only touch blueprint
+    # constants are folded here, so enum subscripts become a single dict lookup at run time.
+    if isinstance(node, ast.Expression): return _compile(node.body, consts, fields)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str, bool)):
+        v = node.value; return (lambda ctx: v), v
+    if isinstance(node, ast.Name):
+        if node.id in consts:
+            v = consts[node.id]; return (lambda ctx: v), v
+        if node.id in _FUNCS:
+            v = _FUNCS[node.id]; return (lambda ctx: v), v
+        fields.add(node.id)
+        return _name(node.id), _NOCONST
+    if isinstance(node, ast.Attribute):
+        f, c = _compile(node.value, consts, fields); attr = node.attr
+        if c is not _NOCONST:
+            v = _member(c, attr); return (lambda ctx: v), v
+        return (lambda ctx: _member(f(ctx), attr)), _NOCONST
+    if isinstance(node, ast.Subscript):
+        f, c = _compile(node.value, consts, fields); k, kc = _compile(node.slice, consts, fields)
+        if c is not _NOCONST and kc is not _NOCONST:
+            v = _member(c, kc); return (lambda ctx: v), v
+        if c is not _NOCONST:
+            if not isinstance(c, dict): raise ValueError(f"Unsupported member access on {type(c).__name__}")
+            return (lambda ctx: c[k(ctx)]), _NOCONST
+        return (lambda ctx: _member(f(ctx), k(ctx))), _NOCONST
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN:
+        op = _BIN[type(node.op)]; l, _ = _compile(node.left, consts, fields); r, _ = _compile(node.right, consts, fields)
+        return (lambda ctx: op(l(ctx), r(ctx))), _NOCONST
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+        op = _UNARY[type(node.op)]; a, _ = _compile(node.operand, consts, fields)
+        return (lambda ctx: op(a(ctx))), _NOCONST
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile(v, consts, fields)[0] for v in node.values]
+        if isinstance(node.op, ast.And): return (lambda ctx: all(p(ctx) for p in parts)), _NOCONST
+        return (lambda ctx: any(p(ctx) for p in parts)), _NOCONST
+    if isinstance(node, ast.Compare) and all(type(o) in _CMP for o in node.ops):
+        first, _ = _compile(node.left, consts, fields)
+        rest = [(_CMP[type(op)], _compile(comp, consts, fields)[0]) for op, comp in zip(node.ops, node.comparators)]
+        def compare(ctx: Dict[str, Any]) -> bool:
+            left = first(ctx)
+            for op, comp in rest:
+                right = comp(ctx)
+                if not op(left, right): return False
+                left = right
+            return True
+        return compare, _NOCONST
+    if isinstance(node, ast.IfExp):
+        t, _ = _compile(node.test, consts, fields); b, _ = _compile(node.body, consts, fields); o, _ = _compile(node.orelse, consts, fields)
+        return (lambda ctx: b(ctx) if t(ctx) else o(ctx)), _NOCONST
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _FUNCS and not node.keywords:
+        fn = _FUNCS[node.func.id]; args = [_compile(a, consts, fields)[0] for a in node.args]
+        return (lambda ctx: fn(*(a(ctx) for a in args))), _NOCONST
+    raise ValueError(f"Unsupported expression in $calc: {ast.dump(node)}")
+
+class CompiledCalc:
+    def __init__(self, expr: str, consts: Optional[Dict[str, Any]] = None):
+        try: tree = ast.parse(expr.strip(), mode="eval")
+        except SyntaxError as e: raise ValueError(f"Invalid $calc expression: {expr}") from e
+        fields: set = set()
+        self.expr = expr
+        self._fn, _ = _compile(tree, dict(consts or {}), fields)
+        self.fields: FrozenSet[str] = frozenset(fields)
+        self._order = tuple(sorted(fields))
+        self._memo: Dict[Tuple[Any, ...], Any] = {}
+    def __call__(self, ctx: Dict[str, Any]) -> Any:
+        try:
+            key = tuple(ctx[f] for f in self._order)
+            hash(key)
+        except (KeyError, TypeError):
+            return self._fn(ctx)
+        try: return self._memo[key]
+        except KeyError: pass
+        val = self._fn(ctx)
+        if len(self._memo) >= _MEMO_MAX: self._memo.clear()
+        self._memo[key] = val
+        return val
+
+def compile_calc(expr: str, consts: Optional[Dict[str, Any]] = None) -> CompiledCalc:
+    return CompiledCalc(expr, consts)
+
+def safe_calc(expr: str, ctx: Dict[str, Any]) -> Any:
+    return CompiledCalc(expr)._fn(ctx)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+import re
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Sequence
+
+_ENUM_FIELDS = ("signal_type", "time_category", "outcome", "context")
+
+class ComboValidator:
+    def __init__(self, bp: Dict[str, Any]):
+        enums = bp.get("enumerations", {})
+        pat = (enums.get("symbol", {}) or {}).get("pattern")
+        self.symbol_pattern: Optional[str] = pat
+        self._symbol_re = re.compile(pat) if pat else None
+        allowed: Dict[str, FrozenSet[Any]] = {}
+        for fld in _ENUM_FIELDS:
+            vals = (enums.get(fld, {}) or {}).get("allowed")
+            if vals: allowed[fld] = frozenset(vals)
+        self.allowed: Mapping[str, FrozenSet[Any]] = MappingProxyType(allowed)
+        gen_range = (enums.get("generation", {}) or {}).get("range")
+        self.generation_range = (gen_range.get("min", 0), gen_range.get("max", 9999)) if gen_range is not None else None
+    @classmethod
+    def from_blueprint(cls, bp: Dict[str, Any]) -> "ComboValidator":
+        return cls(bp)
+    def error(self, combo: Dict[str, Any]) -> Optional[str]:
+        for fld, vals in self.allowed.items():
+            try: ok = combo[fld] in vals
+            except TypeError: ok = False
+            if not ok: return f"Invalid {fld}: {combo[fld]}"
+        if self.generation_range is not None:
+            mn, mx = self.generation_range
+            if not (mn <= combo["generation"] <= mx):
+                return f"generation out of range [{mn},{mx}]: {combo['generation']}"
+        if self._symbol_re is not None and not self._symbol_re.match(combo["symbol"]):
+            return f"symbol does not match pattern {self.symbol_pattern}: {combo['symbol']}"
+        return None
+    def validate(self, combo: Dict[str, Any]) -> None:
+        err = self.error(combo)
+        if err: raise ValueError(err)
+    def errors(self, combos: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        out = []
+        for i, combo in enumerate(combos):
+            err = self.error(combo)
+            if err: out.append({"index": i, "error": err})
+        return out
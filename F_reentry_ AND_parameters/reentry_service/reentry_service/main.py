@@ -1,20 +1,25 @@
 from __future__ import annotations
-import os
-from typing import Any, Dict
+import os, json
+from typing import Any, AsyncIterator, Dict, List
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 
-from reentry_core import load_blueprint, IDCodec, RuleEngine, DB, UI
+from reentry_core import load_blueprint, IDCodec, RuleEngine, ComboValidator, DB, UI
 
 BLUEPRINT_PATH = os.getenv("BLUEPRINT_PATH", "reentry_blueprint.yaml")
 SCHEMA_PATH    = os.getenv("SCHEMA_PATH", "reentry_blueprint.schema.json")
+BATCH_MAX      = int(os.getenv("REENTRY_BATCH_MAX", "50000"))
+STREAM_MAX_LINE = int(os.getenv("STREAM_MAX_LINE", "65536"))
 
 app = FastAPI(title="reentry_service", version="0.1.0")
 
 _bp = None
 _codec = None
 _engine = None
+_validator = None
 
 class Combo(BaseModel):
     symbol: str
@@ -38,49 +43,41 @@ class CellResponse(BaseModel):
     delay_minutes: int
     max_attempts: int
 
+# Same batch envelope and REENTRY_BATCH_MAX limit as app.py.
+class DecideBatchRequest(BaseModel):
+    combos: List[Combo] = Field(..., max_length=BATCH_MAX)
+
+class DecideBatchResponse(BaseModel):
+    results: List[DecideResponse]
+
+class CellBatchRequest(BaseModel):
+    combos: List[Combo] = Field(..., max_length=BATCH_MAX)
+
+class CellBatchResponse(BaseModel):
+    results: List[CellResponse]
+
 class SqliteRequest(BaseModel):
     db_path: str
 
 def _load():
-    global _bp, _codec, _engine
+    global _bp, _codec, _engine, _validator
     _bp = load_blueprint(BLUEPRINT_PATH, schema_path=SCHEMA_PATH)
     _codec = IDCodec.from_blueprint(_bp)
     _engine = RuleEngine(_bp)
+    _engine.compile()
+    _validator = ComboValidator.from_blueprint(_bp)
 
 def _validate_combo(combo: Dict[str, Any]) -> None:
-    enums = _bp["enumerations"]
-    sigs = set(enums["signal_type"]["allowed"])
-    tcat = set(enums["time_category"]["allowed"])
-    ctxs = set(enums["context"]["allowed"])
-    if combo["signal_type"] not in sigs:
-        raise HTTPException(status_code=400, detail=f"Invalid signal_type: {combo['signal_type']}")
-    if combo["time_category"] not in tcat:
-        raise HTTPException(status_code=400, detail=f"Invalid time_category: {combo['time_category']}")
-    if combo["context"] not in ctxs:
-        raise HTTPException(status_code=400, detail=f"Invalid context: {combo['context']}")
-    if combo["outcome"] not in set(_bp["enumerations"]["outcome"]["allowed"]):
-        raise HTTPException(status_code=400, detail=f"Invalid outcome: {combo['outcome']}")
-    gen_min = _bp["enumerations"]["generation"]["range"]["min"]
-    gen_max = _bp["enumerations"]["generation"]["range"]["max"]
-    if combo["generation"] < gen_min or combo["generation"] > gen_max:
-        raise HTTPException(status_code=400, detail=f"generation out of range [{gen_min},{gen_max}]: {combo['generation']}")
-    import re
-    pat = _bp["enumerations"]["symbol"]["pattern"]
-    if not re.match(pat, combo["symbol"]):
-        raise HTTPException(status_code=400, detail=f"symbol does not match pattern {pat}: {combo['symbol']}")
+    err = _validator.error(combo)
+    if err:
+        raise HTTPException(status_code=400, detail=err)
 
-@app.on_event("startup")
-def on_startup():
-    _load()
-
-@app.get("/ui/config")
-def ui_config():
-    return UI.config(_bp)
+def _validate_batch(combos: List[Dict[str, Any]]) -> None:
+    errors = _validator.errors(combos)
+    if errors:
+        raise HTTPException(status_code=400, detail=errors)
 
-@app.post("/decide", response_model=DecideResponse)
-def decide(c: Combo):
-    combo = c.model_dump()
-    _validate_combo(combo)
+def _decide(combo: Dict[str, Any]) -> Dict[str, Any]:
     comb_id = _codec.build(combo)
     inv = _engine.evaluate_invariants(combo)
     res = inv if inv else _engine.evaluate_combination_defaults(combo)
@@ -91,10 +88,7 @@ def decide(c: Combo):
         "parameter_set": res.get("parameter_set", {})
     }
 
-@app.post("/cell", response_model=CellResponse)
-def cell(c: Combo):
-    combo = c.model_dump()
-    _validate_combo(combo)
+def _cell(combo: Dict[str, Any]) -> Dict[str, Any]:
     comb_id = _codec.build(combo)
     res = _engine.evaluate_cell(combo)
     return {
@@ -106,6 +100,98 @@ def cell(c: Combo):
         "max_attempts": int(res.get("max_attempts", 0)),
     }
 
+class _NDJSONResponse(StreamingResponse):
+    # The stock StreamingResponse may listen for disconnects on `receive`, which would
+    # swallow request body chunks we are still reading. A client disconnect surfaces
+    # through request.stream() instead.
+    media_type = "application/x-ndjson"
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+
+def _stream_line(index: int, line: bytes) -> Dict[str, Any]:
+    try:
+        combo = Combo.model_validate_json(line).model_dump()
+    except ValidationError as e:
+        msg = "; ".join(f"{'.'.join(str(p) for p in err['loc']) or 'body'}: {err['msg']}" for err in e.errors())
+        return {"index": index, "error": msg}
+    err = _validator.error(combo)
+    if err:
+        return {"index": index, "error": err}
+    return _decide(combo)
+
+def _stream_chunk(work: List[Any]) -> bytes:
+    # Items are (index, line) to evaluate or a ready error record. Runs in the threadpool.
+    out = [_stream_line(*item) if isinstance(item, tuple) else item for item in work]
+    return "".join(json.dumps(o) + "\n" for o in out).encode("utf-8")
+
+async def _stream_decisions(request: Request) -> AsyncIterator[bytes]:
+    # Only the current partial line is buffered; output is flushed once per input chunk.
+    # Validation and rule evaluation are synchronous, so each chunk is evaluated in the
+    # threadpool rather than on the event loop.
+    buf = b""
+    index = 0
+    skipping = False
+    async for chunk in request.stream():
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        work: List[Any] = []
+        for line in lines:
+            if skipping:
+                skipping = False
+                continue
+            if len(line) > STREAM_MAX_LINE:
+                work.append({"index": index, "error": f"line exceeds {STREAM_MAX_LINE} bytes"})
+                index += 1
+            elif line.strip():
+                work.append((index, line))
+                index += 1
+        if len(buf) > STREAM_MAX_LINE and not skipping:
+            work.append({"index": index, "error": f"line exceeds {STREAM_MAX_LINE} bytes"})
+            index += 1
+            skipping = True
+        if skipping:
+            buf = b""
+        if work:
+            yield await run_in_threadpool(_stream_chunk, work)
+    if buf.strip() and not skipping:
+        yield await run_in_threadpool(_stream_chunk, [(index, buf)])
+
+@app.on_event("startup")
+def on_startup():
+    _load()
+
+@app.get("/ui/config")
+def ui_config():
+    return UI.config(_bp)
+
+@app.post("/decide", response_model=DecideResponse)
+def decide(c: Combo):
+    combo = c.model_dump()
+    _validate_combo(combo)
+    return _decide(combo)
+
+@app.post("/decide/batch", response_model=DecideBatchResponse)
+def decide_batch(req: DecideBatchRequest):
+    combos = [c.model_dump() for c in req.combos]
+    _validate_batch(combos)
+    return {"results": [_decide(combo) for combo in combos]}
+
+@app.post("/decide/stream")
+async def decide_stream(request: Request):
+    return _NDJSONResponse(_stream_decisions(request))
+
+@app.post("/cell", response_model=CellResponse)
+def cell(c: Combo):
+    combo = c.model_dump()
+    _validate_combo(combo)
+    return _cell(combo)
+
+@app.post("/cell/batch", response_model=CellBatchResponse)
+def cell_batch(req: CellBatchRequest):
+    combos = [c.model_dump() for c in req.combos]
+    _validate_batch(combos)
+    return {"results": [_cell(combo) for combo in combos]}
+
 @app.post("/migrate/sqlite")
 def migrate_sqlite(req: SqliteRequest):
     path = os.path.expanduser(req.db_path)
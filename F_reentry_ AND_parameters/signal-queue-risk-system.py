@@ -4,19 +4,25 @@ Signal Queue Management, Risk Monitoring, and Three-Tier Communication System
 """
 
 import asyncio
+import bisect
+import heapq
+import itertools
 import json
 import pickle
 import socket
 import struct
 import threading
+import time
 import multiprocessing
+from collections import deque
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 import pandas as pd
 import numpy as np
-from queue import PriorityQueue, Queue
+from queue import Queue
 import smtplib
 from email.mime.text import MIMEText
 from twilio.rest import Client  # For SMS alerts
@@ -56,24 +62,582 @@ class TradingSignal:
             return self.priority.value < other.priority.value
         return self.timestamp < other.timestamp
 
-class SignalQueue:
-    """Dynamic signal queue with automatic updates"""
+class PriceTriggerBook:
+    """Resting price triggers of one symbol
+    
+    BUY triggers fire when price falls to or below their level, SELL triggers when
+    it rises to or above it. Each side keeps ascending keys (the BUY level, the
+    negated SELL level) with signal ids in parallel, so the triggers a tick crosses
+    are always the tail of each side: one bisect finds them, one slice removes them.
+    """
+    
+    def __init__(self):
+        self._keys: Dict[str, List[float]] = {'BUY': [], 'SELL': []}
+        self._ids: Dict[str, List[str]] = {'BUY': [], 'SELL': []}
+    
+    def __len__(self):
+        return len(self._ids['BUY']) + len(self._ids['SELL'])
+    
+    @staticmethod
+    def _key(direction: str, level: float) -> float:
+        return level if direction == 'BUY' else -level
+    
+    def add(self, signal_id: str, direction: str, level: float):
+        """Add a trigger; equal levels keep insertion order"""
+        key = self._key(direction, level)
+        keys, ids = self._keys[direction], self._ids[direction]
+        index = bisect.bisect_right(keys, key)
+        keys.insert(index, key)
+        ids.insert(index, signal_id)
+    
+    def remove(self, signal_id: str, direction: str, level: float) -> bool:
+        """Remove a trigger, returns False if it is not in the book"""
+        key = self._key(direction, level)
+        keys, ids = self._keys[direction], self._ids[direction]
+        for index in range(bisect.bisect_left(keys, key), bisect.bisect_right(keys, key)):
+            if ids[index] == signal_id:
+                del keys[index]
+                del ids[index]
+                return True
+        return False
+    
+    def pop_crossed(self, price: float) -> List[str]:
+        """Remove and return the ids of every trigger crossed at this price"""
+        crossed = []
+        for direction, bound in (('BUY', price), ('SELL', -price)):
+            keys, ids = self._keys[direction], self._ids[direction]
+            index = bisect.bisect_left(keys, bound)
+            if index < len(keys):
+                crossed.extend(ids[index:])
+                del keys[index:]
+                del ids[index:]
+        return crossed
+
+class SignalIndex:
+    """Pending signals indexed by id, priority and execution time
+    
+    One structure replaces the PriorityQueue + dict pair so the views cannot
+    drift apart. Priority pops use a heap ordered like TradingSignal.__lt__;
+    removed signals leave stale heap entries that are skipped when they surface,
+    and the heap is rebuilt once stale entries outnumber live ones.
+    Timed signals are also kept in an (execution_time, seq) array maintained
+    with bisect, which serves range queries, cancellation and expiry.
+    """
     
     def __init__(self):
-        self.queue = PriorityQueue()
-        self.pending_signals: Dict[str, TradingSignal] = {}
-        self.executed_signals: List[TradingSignal] = []
+        self._entries: Dict[str, Tuple[int, TradingSignal]] = {}  # id -> (seq, signal)
+        self._heap: List[Tuple[int, datetime, int, str]] = []  # (priority, timestamp, seq, id)
+        self._times: List[Tuple[datetime, int]] = []  # (execution_time, seq), sorted
+        self._time_ids: List[str] = []  # ids parallel to _times
+        self._seq = itertools.count()
+        self._signals: Dict[str, TradingSignal] = {}
+        self.by_id = MappingProxyType(self._signals)
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, signal_id: str):
+        return signal_id in self._entries
+    
+    def add(self, signal: TradingSignal):
+        """Add a signal, replacing a pending one with the same id"""
+        self.remove(signal.signal_id)
+        seq = next(self._seq)
+        self._entries[signal.signal_id] = (seq, signal)
+        self._signals[signal.signal_id] = signal
+        heapq.heappush(self._heap, (signal.priority.value, signal.timestamp, seq, signal.signal_id))
+        if signal.execution_time is not None:
+            index = bisect.bisect_right(self._times, (signal.execution_time, seq))
+            self._times.insert(index, (signal.execution_time, seq))
+            self._time_ids.insert(index, signal.signal_id)
+    
+    def remove(self, signal_id: str) -> Optional[TradingSignal]:
+        """Remove a pending signal by id (cancel), returns it if it was pending"""
+        entry = self._entries.pop(signal_id, None)
+        if entry is None:
+            return None
+        seq, signal = entry
+        del self._signals[signal_id]
+        if signal.execution_time is not None:
+            index = bisect.bisect_left(self._times, (signal.execution_time, seq))
+            del self._times[index]
+            del self._time_ids[index]
+        if len(self._heap) > 2 * len(self._entries):
+            self._compact()
+        return signal
+    
+    def _compact(self):
+        """Rebuild the heap from the live entries, dropping stale ones"""
+        self._heap = [(signal.priority.value, signal.timestamp, seq, signal_id)
+                      for signal_id, (seq, signal) in self._entries.items()]
+        heapq.heapify(self._heap)
+    
+    def pop(self) -> Optional[TradingSignal]:
+        """Remove and return the highest-priority signal, None when empty"""
+        while self._heap:
+            _, _, seq, signal_id = heapq.heappop(self._heap)
+            entry = self._entries.get(signal_id)
+            if entry is not None and entry[0] == seq:
+                return self.remove(signal_id)
+        return None
+    
+    def between(self, start: Optional[datetime], end: Optional[datetime]) -> List[TradingSignal]:
+        """Timed signals with start <= execution_time <= end, in time order"""
+        lo = 0 if start is None else bisect.bisect_left(self._times, (start,))
+        hi = len(self._times) if end is None else bisect.bisect_right(self._times, (end, float('inf')))
+        return [self._signals[signal_id] for signal_id in self._time_ids[lo:hi]]
+    
+    def expire(self, cutoff: datetime) -> List[TradingSignal]:
+        """Remove and return timed signals whose execution_time is before cutoff"""
+        index = bisect.bisect_left(self._times, (cutoff,))
+        expired_ids = self._time_ids[:index]
+        return [self.remove(signal_id) for signal_id in expired_ids]
+
+def signal_to_dict(signal: TradingSignal) -> Dict:
+    """JSON-safe dict of a signal"""
+    data = asdict(signal)
+    for key, value in data.items():
+        if isinstance(value, datetime):
+            data[key] = value.isoformat()
+        elif isinstance(value, SignalPriority):
+            data[key] = value.name
+    return data
+
+def signal_from_dict(data: Dict) -> TradingSignal:
+    """Inverse of signal_to_dict"""
+    data = dict(data)
+    data['priority'] = SignalPriority[data['priority']]
+    for key in ('timestamp', 'execution_time'):
+        if data.get(key):
+            data[key] = datetime.fromisoformat(data[key])
+    return TradingSignal(**data)
+
+class SignalJournal:
+    """Write-ahead journal of SignalQueue operations with compacted snapshots
+    
+    Every add/cancel/trigger/execute is appended to <directory>/signals.journal as a
+    JSON line with a sequence number. Lines are buffered and written with one
+    fsync per batch: when the consumer finishes a drain, when fsync_batch records
+    are waiting, or when fsync_interval has passed. After snapshot_every records
+    the pending set is written to signals.snapshot (atomic replace) and the journal
+    is truncated, so recovery reads one snapshot plus a short journal tail however
+    long the queue has been running.
+    """
+    
+    def __init__(self, directory: str, fsync_batch: int = 256, fsync_interval: float = 0.05,
+                 snapshot_every: int = 10000):
+        self.directory = directory
+        self.journal_path = os.path.join(directory, 'signals.journal')
+        self.snapshot_path = os.path.join(directory, 'signals.snapshot')
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.sequence = 0
+        self.since_snapshot = 0
+        self._buffer: List[str] = []
+        self._last_sync = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        self._file = None
+    
+    def load(self) -> List[TradingSignal]:
+        """Rebuild the pending signals from the snapshot and the journal tail
+        
+        A torn last line from a crash is cut off so new records append cleanly; a
+        bad record anywhere before it means the journal is corrupt and raises.
+        """
+        pending: Dict[str, TradingSignal] = {}
+        snapshot_sequence = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            snapshot_sequence = snapshot['sequence']
+            for data in snapshot['signals']:
+                signal = signal_from_dict(data)
+                pending[signal.signal_id] = signal
+        self.sequence = snapshot_sequence
+        
+        valid_bytes = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'rb') as f:
+                lines = f.readlines()
+            for number, line in enumerate(lines, 1):
+                try:
+                    record = json.loads(line) if line.endswith(b'\n') else None
+                except ValueError:
+                    record = None
+                if record is None:
+                    if number == len(lines):
+                        break  # Torn final write
+                    raise ValueError(f"Corrupt record on line {number} of {self.journal_path}")
+                valid_bytes += len(line)
+                if record['seq'] <= snapshot_sequence:
+                    continue
+                self.sequence = record['seq']
+                self.since_snapshot += 1
+                if record['op'] == 'add':
+                    signal = signal_from_dict(record['signal'])
+                    pending[signal.signal_id] = signal
+                else:
+                    pending.pop(record['id'], None)
+        
+        self._file = open(self.journal_path, 'ab')
+        self._file.truncate(valid_bytes)
+        return list(pending.values())
+    
+    @staticmethod
+    def encode(signal: TradingSignal) -> str:
+        """Serialize a signal for an 'add' record; raises TypeError for non-JSON metadata"""
+        return json.dumps(signal_to_dict(signal), separators=(',', ':'))
+    
+    def record(self, op: str, signal: TradingSignal, encoded: Optional[str] = None):
+        """Buffer one operation; adds carry the whole signal (see encode), the rest only its id"""
+        if op == 'add':
+            body = encoded if encoded is not None else self.encode(signal)
+            line = f'{{"seq":{self.sequence + 1},"op":"add","signal":{body}}}'
+        else:
+            line = json.dumps({'seq': self.sequence + 1, 'op': op, 'id': signal.signal_id}, separators=(',', ':'))
+        self.sequence += 1
+        self.since_snapshot += 1
+        self._buffer.append(line)
+        if len(self._buffer) >= self.fsync_batch or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+    
+    def sync(self):
+        """Write and fsync buffered records"""
+        if self._buffer:
+            if self._file is None:
+                self._file = open(self.journal_path, 'ab')
+            self._file.write(('\n'.join(self._buffer) + '\n').encode('utf-8'))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._buffer.clear()
+        self._last_sync = time.monotonic()
+    
+    def needs_snapshot(self) -> bool:
+        return self.since_snapshot >= self.snapshot_every
+    
+    def snapshot(self, signals: List[TradingSignal]):
+        """Persist the pending set and truncate the journal"""
+        self.sync()
+        temp_path = self.snapshot_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'sequence': self.sequence, 'signals': [signal_to_dict(s) for s in signals]}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        self._fsync_directory()
+        
+        # Journal records up to self.sequence are now covered by the snapshot
+        self._file.truncate(0)
+        self.since_snapshot = 0
+    
+    def _fsync_directory(self):
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return  # Directories cannot be opened on Windows
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    def close(self):
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class ProducerRing:
+    """Bounded single-producer, single-consumer FIFO between a producer and the queue
+    
+    Neither side takes a lock: deque.append and deque.popleft are atomic under
+    the GIL, only the producer writes the counters, and the consumer's take()
+    only ever frees room, so the producer's capacity check stays exact.
+    That relies on one producer thread per ring: the first thread to offer()
+    owns the ring and any other thread is refused with RuntimeError.
+    A full ring rejects instead of blocking.
+    """
+    
+    def __init__(self, name: str, capacity: int):
+        self.name = name
+        self.capacity = capacity
+        self._buffer: deque = deque()
+        self._owner: Optional[int] = None  # Producer thread ident, claimed on first offer
+        self._claim_lock = threading.Lock()  # Only taken to claim the ring
+        self.accepted = 0
+        self.rejected = 0
+        self.high_water = 0
+    
+    def __len__(self):
+        return len(self._buffer)
+    
+    def offer(self, item) -> bool:
+        """Producer side: enqueue unless the ring is full"""
+        thread = threading.get_ident()
+        if self._owner != thread:
+            with self._claim_lock:
+                if self._owner is None:
+                    self._owner = thread
+            if self._owner != thread:
+                raise RuntimeError(f"Producer ring {self.name!r} is owned by another thread; "
+                                   f"give each producer thread its own producer name")
+        if len(self._buffer) >= self.capacity:
+            self.rejected += 1
+            return False
+        self._buffer.append(item)
+        self.accepted += 1
+        depth = len(self._buffer)
+        if depth > self.high_water:
+            self.high_water = depth
+        return True
+    
+    def take(self, limit: int) -> List:
+        """Consumer side: dequeue up to limit items"""
+        items = []
+        while len(items) < limit:
+            try:
+                items.append(self._buffer.popleft())
+            except IndexError:
+                break
+        return items
+    
+    def metrics(self) -> Dict[str, int]:
+        return {
+            'depth': len(self._buffer),
+            'capacity': self.capacity,
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'high_water': self.high_water
+        }
+
+class ExecutedArchive:
+    """Capped history of executed signals that spills older records to disk
+    
+    The newest `capacity` signals stay in memory. Once `spill_batch` more have
+    accumulated, the oldest are appended to `spill_path` as JSON lines in one
+    write (or dropped when no path is set), so memory stays bounded.
+    """
+    
+    def __init__(self, capacity: int = 10000, spill_path: Optional[str] = None, spill_batch: Optional[int] = None):
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.spill_batch = max(1, spill_batch if spill_batch is not None else capacity // 10)
+        self._recent: deque = deque()
+        self.spilled = 0
+    
+    def __len__(self):
+        return self.spilled + len(self._recent)
+    
+    def __iter__(self):
+        return iter(self._recent)
+    
+    def append(self, signal: TradingSignal):
+        self._recent.append(signal)
+        if len(self._recent) >= self.capacity + self.spill_batch:
+            self._spill(len(self._recent) - self.capacity)
+    
+    def recent(self, count: int) -> List[TradingSignal]:
+        """The newest `count` executed signals, oldest first"""
+        return list(self._recent)[-count:] if count > 0 else []
+    
+    def _spill(self, count: int):
+        oldest = [self._recent.popleft() for _ in range(count)]
+        if self.spill_path:
+            with open(self.spill_path, 'a', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(signal_to_dict(signal)) + '\n' for signal in oldest))
+        self.spilled += count
+
+class SignalQueue:
+    """Dynamic signal queue with automatic updates
+    
+    Producers (calendar, indicator AutoTrader, manual) call submit()/submit_cancel()
+    from their own threads; each named producer gets its own bounded, lock-free
+    ProducerRing, fed by one thread. Operations are applied in order within a ring
+    but not across rings, so a cancel must be sent through the ring its add went
+    through. All other methods are the consumer side: they merge the rings into
+    the index on drain() before every read and hold a consumer lock, which is
+    uncontended with a single consumer thread but keeps the index, price books
+    and journal consistent if another thread calls them directly.
+    """
+    
+    def __init__(self, ring_capacity: int = 1024, executed_capacity: int = 10000,
+                 executed_spill_path: Optional[str] = None, journal: Optional[SignalJournal] = None):
+        self.queue = SignalIndex()
+        self.executed_signals = ExecutedArchive(executed_capacity, executed_spill_path)
+        self.price_signals: Dict[str, TradingSignal] = {}  # Pending price-type signals
+        self.price_books: Dict[str, PriceTriggerBook] = {}  # symbol -> resting price triggers
+        self.ring_capacity = ring_capacity
+        self.producers: Dict[str, ProducerRing] = {}
+        self._producers_lock = threading.Lock()  # Only taken to register a new producer
+        self._consumer_lock = threading.RLock()
         self.update_thread = None
         self.running = False
         
+        # Crash recovery: rebuild the pending set before journaling new operations
+        self.journal = None
+        if journal is not None:
+            for signal in journal.load():
+                self._add(signal)
+            self.journal = journal
+    
+    def _log(self, op: str, signal: TradingSignal, encoded: Optional[str] = None):
+        if self.journal is not None:
+            self.journal.record(op, signal, encoded)
+    
+    def _commit(self):
+        """Group commit at the end of a consumer step; compact when due"""
+        if self.journal is not None:
+            self.journal.sync()
+            if self.journal.needs_snapshot():
+                self.journal.snapshot(list(self.queue.by_id.values()))
+    
+    def flush(self):
+        """Make every journaled operation durable"""
+        with self._consumer_lock:
+            self._commit()
+    
+    def close(self):
+        """Flush and close the journal"""
+        with self._consumer_lock:
+            if self.journal is not None:
+                self._commit()
+                self.journal.close()
+    
+    def producer(self, name: str) -> ProducerRing:
+        """Ring of a producer, created on first use"""
+        ring = self.producers.get(name)
+        if ring is None:
+            with self._producers_lock:
+                ring = self.producers.setdefault(name, ProducerRing(name, self.ring_capacity))
+        return ring
+    
+    def submit(self, signal: TradingSignal, producer: Optional[str] = None) -> bool:
+        """Producer side: queue a signal; False means the producer's ring is full"""
+        return self.producer(producer or signal.source or 'default').offer(('add', signal))
+    
+    def submit_cancel(self, signal_id: str, producer: str) -> bool:
+        """Producer side: queue a cancellation
+        
+        producer must name the ring the add was submitted to (submit()'s producer
+        argument, else the signal's source), so the cancel cannot overtake it.
+        """
+        return self.producer(producer).offer(('cancel', signal_id))
+    
+    def drain(self, batch: int = 256, budget: Optional[int] = None) -> int:
+        """Consumer side: merge queued producer operations, round-robin across producers
+        
+        Applies at most `budget` operations (default: one full ring per producer),
+        so producers that keep up cannot hold the consumer here indefinitely.
+        """
+        with self._consumer_lock:
+            rings = list(self.producers.values())
+            if budget is None:
+                budget = self.ring_capacity * len(rings)
+            applied = 0
+            progressed = True
+            while progressed and applied < budget:
+                progressed = False
+                for ring in rings:
+                    for op, payload in ring.take(min(batch, budget - applied)):
+                        try:
+                            if op == 'add':
+                                self._add(payload)
+                            else:
+                                self._cancel(payload)
+                        except (TypeError, ValueError) as e:
+                            logging.error(f"Dropped {op} from producer {ring.name}: {str(e)}")
+                        applied += 1
+                        progressed = True
+            if applied:
+                self._commit()
+            return applied
+    
+    def ingestion_metrics(self) -> Dict[str, Any]:
+        """Backpressure metrics per producer plus queue and archive sizes"""
+        return {
+            'producers': {name: ring.metrics() for name, ring in list(self.producers.items())},
+            'pending': len(self.queue),
+            'executed_in_memory': len(self.executed_signals) - self.executed_signals.spilled,
+            'executed_spilled': self.executed_signals.spilled
+        }
+    
+    @property
+    def pending_signals(self):
+        """Read-only id -> signal view of the pending signals"""
+        return self.queue.by_id
+        
     def add_signal(self, signal: TradingSignal):
         """Add signal to queue"""
-        self.queue.put(signal)
-        self.pending_signals[signal.signal_id] = signal
+        with self._consumer_lock:
+            self._add(signal)
+            self._commit()
+    
+    def _add(self, signal: TradingSignal):
+        # Serialize before touching the index, so a signal the journal cannot
+        # record is rejected instead of kept in memory only
+        encoded = self.journal.encode(signal) if self.journal is not None else None
+        self._cancel(signal.signal_id)
+        self.queue.add(signal)
+        self._log('add', signal, encoded)
+        if signal.signal_type == 'price':
+            self.price_signals[signal.signal_id] = signal
+            if signal.price_threshold and signal.direction in ('BUY', 'SELL'):
+                self.price_books.setdefault(signal.symbol, PriceTriggerBook()).add(
+                    signal.signal_id, signal.direction, signal.price_threshold)
+    
+    def _forget(self, signal: TradingSignal):
+        """Drop a signal that left the index from the price structures"""
+        if self.price_signals.pop(signal.signal_id, None) is not None and signal.price_threshold:
+            book = self.price_books.get(signal.symbol)
+            if book and signal.direction in ('BUY', 'SELL'):
+                book.remove(signal.signal_id, signal.direction, signal.price_threshold)
+    
+    def cancel_signal(self, signal_id: str) -> Optional[TradingSignal]:
+        """Cancel a pending signal by id"""
+        with self._consumer_lock:
+            signal = self._cancel(signal_id)
+            if signal is not None:
+                self._commit()
+            return signal
+    
+    def _cancel(self, signal_id: str) -> Optional[TradingSignal]:
+        signal = self.queue.remove(signal_id)
+        if signal is not None:
+            self._forget(signal)
+            self._log('cancel', signal)
+        return signal
+    
+    def pop_next(self) -> Optional[TradingSignal]:
+        """Take the highest-priority pending signal for execution"""
+        with self._consumer_lock:
+            self.drain()
+            signal = self.queue.pop()
+            if signal is not None:
+                self._forget(signal)
+                self._log('execute', signal)
+                self.executed_signals.append(signal)
+                self._commit()
+            return signal
+    
+    # PriorityQueue-compatible names; they go through the queue so price books and journal stay in step
+    put = add_signal
+    get = pop_next
+    
+    def expire_signals(self, grace: timedelta = timedelta(0)) -> List[TradingSignal]:
+        """Drop timed signals whose execution time passed more than `grace` ago"""
+        with self._consumer_lock:
+            self.drain()
+            expired = self.queue.expire(datetime.now() - grace)
+            for signal in expired:
+                self._forget(signal)
+                self._log('cancel', signal)
+            if expired:
+                self._commit()
+            return expired
         
     def add_price_triggered_signal(self, symbol: str, price_level: float, 
-                                  direction: str, lot_size: float):
-        """Add price-driven signal that triggers at specific level"""
+                                  direction: str, lot_size: float) -> bool:
+        """Submit price-driven signal that triggers at specific level; False if its ring is full"""
         signal = TradingSignal(
             signal_id=f"PRICE_{symbol}_{datetime.now().timestamp()}",
             symbol=symbol,
@@ -85,10 +649,10 @@ class SignalQueue:
             price_threshold=price_level,
             source='price_trigger'
         )
-        self.add_signal(signal)
+        return self.submit(signal)
         
-    def add_economic_event_signal(self, event: Dict):
-        """Add signal from economic calendar"""
+    def add_economic_event_signal(self, event: Dict) -> bool:
+        """Submit signal from economic calendar; False if its ring is full"""
         signal = TradingSignal(
             signal_id=f"ECON_{event['Currency']}_{event['Time']}",
             symbol=f"{event['Currency']}USD",  # Simplified
@@ -101,40 +665,47 @@ class SignalQueue:
             source='economic_calendar',
             metadata={'event': event['Event'], 'impact': event['Impact']}
         )
-        self.add_signal(signal)
+        return self.submit(signal)
         
     def get_upcoming_signals(self, minutes: int = 60) -> List[TradingSignal]:
         """Get signals scheduled in next N minutes"""
-        cutoff = datetime.now() + timedelta(minutes=minutes)
-        upcoming = []
-        
-        for signal in self.pending_signals.values():
-            if signal.execution_time and signal.execution_time <= cutoff:
-                upcoming.append(signal)
-            elif signal.signal_type == 'price':
-                upcoming.append(signal)  # Always show price-triggered
-                
-        return sorted(upcoming, key=lambda x: x.priority.value)
+        with self._consumer_lock:
+            self.drain()
+            cutoff = datetime.now() + timedelta(minutes=minutes)
+            upcoming = self.queue.between(None, cutoff)
+            
+            # Always show price-triggered
+            upcoming.extend(signal for signal in self.price_signals.values()
+                            if signal.execution_time is None or signal.execution_time > cutoff)
+                    
+            return sorted(upcoming, key=lambda x: x.priority.value)
     
     def check_price_triggers(self, current_prices: Dict[str, float]):
-        """Check if any price-triggered signals should execute"""
-        triggered = []
+        """Check if any price-triggered signals should execute
         
-        for signal_id, signal in list(self.pending_signals.items()):
-            if signal.signal_type != 'price' or not signal.price_threshold:
-                continue
-                
-            current = current_prices.get(signal.symbol)
-            if not current:
-                continue
-                
-            if (signal.direction == 'BUY' and current <= signal.price_threshold) or \
-               (signal.direction == 'SELL' and current >= signal.price_threshold):
-                triggered.append(signal)
-                del self.pending_signals[signal_id]
-                self.executed_signals.append(signal)
-                
-        return triggered
+        Only the books of the ticked symbols are touched, each in O(log n + k).
+        """
+        with self._consumer_lock:
+            self.drain()
+            triggered = []
+            
+            for symbol, current in current_prices.items():
+                book = self.price_books.get(symbol)
+                if not current or not book:
+                    continue
+                    
+                for signal_id in book.pop_crossed(current):
+                    signal = self.queue.remove(signal_id)
+                    if signal is None:
+                        continue
+                    self.price_signals.pop(signal_id, None)
+                    self._log('trigger', signal)
+                    triggered.append(signal)
+                    self.executed_signals.append(signal)
+            
+            if triggered:
+                self._commit()
+            return triggered
 
 # ============== COMPREHENSIVE TESTING SYSTEM ==============
 
@@ -590,77 +1161,260 @@ class AlertManager:
 
 # ============== THREE-TIER COMMUNICATION ==============
 
+class BridgeConnection:
+    """Persistent, pipelined connection to the MT4 bridge
+    
+    Many signals can be in flight on one socket; a reader task resolves the
+    waiting futures as acknowledgements arrive.
+    
+    Framing, by protocol_version:
+        1 (default, the original bridge format; acks are matched in send order)
+            binary: !I header (payload length) + pickled signal dict; ack is b'ACK'
+            json:   one JSON object per line; ack is a line containing 'SUCCESS'
+        2 (acks are matched by correlation id and may arrive in any order)
+            binary: !QI header (correlation id, payload length) + pickled signal dict;
+                    ack is !Q3s (correlation id, b'ACK' or b'NAK')
+            json:   one JSON object per line with a 'correlation_id' key;
+                    ack is a JSON line {"correlation_id": ..., "status": "SUCCESS"|...}
+    """
+    
+    LEGACY_HEADER = struct.Struct('!I')
+    LEGACY_ACK_SIZE = 3
+    BINARY_HEADER = struct.Struct('!QI')
+    BINARY_ACK = struct.Struct('!Q3s')
+    PROTOCOL_VERSIONS = (1, 2)
+    
+    def __init__(self, host: str, port: int, protocol: str = 'binary', max_retries: int = 3,
+                 retry_delay: float = 0.1, max_retry_delay: float = 2.0, ack_timeout: float = 5.0,
+                 protocol_version: int = 1):
+        if protocol not in ('binary', 'json'):
+            raise ValueError(f"Unknown bridge protocol: {protocol}")
+        if protocol_version not in self.PROTOCOL_VERSIONS:
+            raise ValueError(f"Unknown bridge protocol version: {protocol_version}")
+        self.host = host
+        self.port = port
+        self.protocol = protocol
+        self.protocol_version = protocol_version
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.ack_timeout = ack_timeout
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}  # In write order
+        self._active = 0
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+    
+    @property
+    def in_flight(self) -> int:
+        return self._active
+    
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+    
+    async def send(self, signal: TradingSignal) -> bool:
+        """Send one signal and wait for its acknowledgement
+        
+        A signal is written at most once: if the connection drops while the ack
+        is outstanding the send reports False rather than risk a duplicate order.
+        """
+        self._active += 1
+        try:
+            return await self._send(signal)
+        finally:
+            self._active -= 1
+    
+    async def _send(self, signal: TradingSignal) -> bool:
+        correlation_id = next(self._ids)
+        try:
+            payload = self._encode(correlation_id, signal)
+        except Exception as e:
+            logging.error(f"Cannot encode signal {signal.signal_id}: {str(e)}")
+            return False
+        
+        future = asyncio.get_running_loop().create_future()
+        async with self._write_lock:
+            try:
+                await self._ensure_connected()
+            except OSError as e:
+                logging.error(f"MT4 bridge unreachable at {self.host}:{self.port}: {str(e)}")
+                return False
+            writer, pending = self._writer, self._pending
+            if writer is None or writer.is_closing():
+                logging.error(f"MT4 bridge connection lost before {signal.signal_id} was sent")
+                return False
+            pending[correlation_id] = future
+            try:
+                writer.write(payload)
+                await writer.drain()
+            except (ConnectionError, OSError) as e:
+                pending.pop(correlation_id, None)
+                logging.error(f"{self.protocol} send failed: {str(e)}")
+                return False
+        
+        try:
+            return await asyncio.wait_for(future, self.ack_timeout)
+        except asyncio.TimeoutError:
+            logging.error(f"No acknowledgement for {signal.signal_id} within {self.ack_timeout}s")
+            if self.protocol_version == 1:
+                # Acks carry no id: a late one would be matched to the next send
+                self._drop(writer, pending)
+            return False
+        finally:
+            pending.pop(correlation_id, None)
+    
+    def _encode(self, correlation_id: int, signal: TradingSignal) -> bytes:
+        if self.protocol == 'binary':
+            data = pickle.dumps(asdict(signal))
+            if self.protocol_version == 1:
+                return self.LEGACY_HEADER.pack(len(data)) + data
+            return self.BINARY_HEADER.pack(correlation_id, len(data)) + data
+        message = signal_to_dict(signal)
+        if self.protocol_version > 1:
+            message['correlation_id'] = correlation_id
+        return (json.dumps(message) + '\n').encode('utf-8')
+    
+    async def _read_ack(self, reader: asyncio.StreamReader) -> Optional[Tuple[Optional[int], bool]]:
+        """Next (correlation id, ok) from the bridge, None for a line to skip
+        
+        Version 1 acks carry no correlation id.
+        """
+        if self.protocol == 'binary':
+            if self.protocol_version == 1:
+                return None, await reader.readexactly(self.LEGACY_ACK_SIZE) == b'ACK'
+            correlation_id, status = self.BINARY_ACK.unpack(
+                await reader.readexactly(self.BINARY_ACK.size))
+            return correlation_id, status == b'ACK'
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("bridge closed the connection")
+        if not line.strip():
+            return None
+        if self.protocol_version == 1:
+            return None, b'SUCCESS' in line
+        try:
+            response = json.loads(line)
+        except ValueError:
+            response = None
+        if not isinstance(response, dict) or not isinstance(response.get('correlation_id'), int):
+            logging.warning(f"Skipping malformed MT4 bridge ack: {line[:200]!r}")
+            return None
+        return response['correlation_id'], response.get('status') == 'SUCCESS'
+    
+    async def _ensure_connected(self):
+        """Connect, retrying with capped exponential backoff"""
+        if self.connected:
+            return
+        delay = self.retry_delay
+        for attempt in range(self.max_retries + 1):
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+                break
+            except OSError as e:
+                if attempt == self.max_retries:
+                    raise
+                logging.warning(f"MT4 bridge connect attempt {attempt + 1} failed: {str(e)}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+        # Each connection gets its own pending map, so losing an old connection
+        # can only fail the sends that were written to it
+        self._writer = writer
+        self._pending = {}
+        self._reader_task = asyncio.create_task(self._read_acks(reader, writer, self._pending))
+    
+    async def _read_acks(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                         pending: Dict[int, asyncio.Future]):
+        try:
+            while True:
+                ack = await self._read_ack(reader)
+                if ack is None:
+                    continue
+                correlation_id, ok = ack
+                if correlation_id is None:
+                    # In-order acks answer the oldest outstanding send
+                    correlation_id = next(iter(pending), None)
+                future = pending.pop(correlation_id, None)
+                if future is not None and not future.done():
+                    future.set_result(ok)
+        except asyncio.CancelledError:
+            raise
+        except (asyncio.IncompleteReadError, ConnectionError, OSError, struct.error) as e:
+            logging.warning(f"MT4 bridge connection lost: {str(e)}")
+        finally:
+            self._drop(writer, pending)
+    
+    def _drop(self, writer: asyncio.StreamWriter, pending: Dict[int, asyncio.Future]):
+        """Forget a dead connection and fail the sends written to it"""
+        if self._writer is writer:
+            self._writer = None
+            self._reader_task = None
+        writer.close()
+        for future in pending.values():
+            if not future.done():
+                future.set_result(False)
+    
+    async def close(self):
+        writer, reader_task = self._writer, self._reader_task
+        if reader_task is not None:
+            reader_task.cancel()  # Its cleanup drops the connection
+            try:
+                await reader_task
+            except asyncio.CancelledError:
+                pass
+        if writer is not None:
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
 class ThreeTierCommunication:
     """Enhanced communication using Python native protocols instead of CSV"""
     
-    def __init__(self, mt4_host: str = 'localhost', mt4_port: int = 5555):
+    def __init__(self, mt4_host: str = 'localhost', mt4_port: int = 5555, pool_size: int = 2,
+                 max_retries: int = 3, ack_timeout: float = 5.0, protocol_version: int = 1):
+        if protocol_version not in BridgeConnection.PROTOCOL_VERSIONS:
+            raise ValueError(f"Unknown bridge protocol version: {protocol_version}")
         self.mt4_host = mt4_host
         self.mt4_port = mt4_port
+        self.pool_size = pool_size
+        self.protocol_version = protocol_version
+        self.max_retries = max_retries
+        self.ack_timeout = ack_timeout
         self.message_queue = Queue()
         self.response_queue = Queue()
+        self._pools: Dict[str, List[BridgeConnection]] = {}
+    
+    def _connection(self, protocol: str) -> BridgeConnection:
+        """Least-loaded pooled connection for a protocol"""
+        pool = self._pools.get(protocol)
+        if pool is None:
+            pool = [BridgeConnection(self.mt4_host, self.mt4_port, protocol,
+                                     max_retries=self.max_retries, ack_timeout=self.ack_timeout,
+                                     protocol_version=self.protocol_version)
+                    for _ in range(self.pool_size)]
+            self._pools[protocol] = pool
+        return min(pool, key=lambda connection: connection.in_flight)
         
     async def send_signal_binary(self, signal: TradingSignal) -> bool:
         """Send signal using binary protocol"""
-        try:
-            # Serialize signal
-            data = pickle.dumps(asdict(signal))
-            
-            # Create header with message length
-            header = struct.pack('!I', len(data))
-            
-            # Send to MT4 bridge
-            reader, writer = await asyncio.open_connection(
-                self.mt4_host, self.mt4_port
-            )
-            
-            writer.write(header + data)
-            await writer.drain()
-            
-            # Wait for acknowledgment
-            response = await reader.read(1024)
-            
-            writer.close()
-            await writer.wait_closed()
-            
-            return response == b'ACK'
-            
-        except Exception as e:
-            logging.error(f"Binary send failed: {str(e)}")
-            return False
+        return await self._connection('binary').send(signal)
     
     async def send_signal_json(self, signal: TradingSignal) -> bool:
         """Send signal using JSON protocol"""
-        try:
-            # Convert to JSON
-            signal_dict = asdict(signal)
-            # Convert datetime objects to strings
-            for key, value in signal_dict.items():
-                if isinstance(value, datetime):
-                    signal_dict[key] = value.isoformat()
-                elif isinstance(value, SignalPriority):
-                    signal_dict[key] = value.name
-            
-            json_data = json.dumps(signal_dict)
-            
-            # Send via socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.connect((self.mt4_host, self.mt4_port))
-            
-            # Send with newline delimiter
-            sock.send((json_data + '\n').encode('utf-8'))
-            
-            # Wait for response
-            response = sock.recv(1024).decode('utf-8')
-            sock.close()
-            
-            return 'SUCCESS' in response
-            
-        except Exception as e:
-            logging.error(f"JSON send failed: {str(e)}")
-            return False
+        return await self._connection('json').send(signal)
+    
+    async def close(self):
+        """Close every pooled bridge connection"""
+        for pool in self._pools.values():
+            await asyncio.gather(*(connection.close() for connection in pool))
+        self._pools.clear()
     
     def create_mt4_bridge_server(self):
-        """Create server that MT4 can connect to"""
+        """Create server that MT4 can connect to, speaking this protocol_version"""
+        legacy = self.protocol_version == 1
+        header_format = BridgeConnection.LEGACY_HEADER if legacy else BridgeConnection.BINARY_HEADER
         
         async def handle_mt4_connection(reader, writer):
             """Handle incoming MT4 connections"""
@@ -669,22 +1423,26 @@ class ThreeTierCommunication:
             
             try:
                 while True:
-                    # Read message length
-                    header = await reader.read(4)
-                    if not header:
+                    # Read message length (and correlation id from version 2)
+                    try:
+                        header = await reader.readexactly(header_format.size)
+                    except asyncio.IncompleteReadError:
                         break
                     
-                    msg_len = struct.unpack('!I', header)[0]
+                    if legacy:
+                        correlation_id, (msg_len,) = None, header_format.unpack(header)
+                    else:
+                        correlation_id, msg_len = header_format.unpack(header)
                     
                     # Read message
-                    data = await reader.read(msg_len)
+                    data = await reader.readexactly(msg_len)
                     
                     # Process message
                     message = pickle.loads(data)
                     self.message_queue.put(message)
                     
-                    # Send acknowledgment
-                    writer.write(b'ACK')
+                    # Acknowledge, echoing the sender's correlation id from version 2
+                    writer.write(b'ACK' if legacy else BridgeConnection.BINARY_ACK.pack(correlation_id, b'ACK'))
                     await writer.drain()
                     
             except Exception as e:
@@ -857,6 +1615,7 @@ async def main():
         print(f"\n📡 Sending test signal via enhanced protocol...")
         success = await comm.send_signal_json(test_signal)
         print(f"  Signal sent: {'✓' if success else '✗'}")
+        await comm.close()
     
     print("\n✅ All systems initialized and running")
     print("   - Risk monitor: Active")
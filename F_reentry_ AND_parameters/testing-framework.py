@@ -7,6 +7,7 @@ import unittest
 import pytest
 import subprocess
 import json
+import pickle
 import sqlite3
 import pandas as pd
 import numpy as np
@@ -136,7 +137,7 @@ class TestReentrySystem(unittest.TestCase):
         queue.add_signal(signal_urgent)
         
         # Verify urgent comes first
-        first = queue.queue.get()
+        first = queue.get()
         self.assertEqual(first.priority, SignalPriority.URGENT)
     
     def test_indicator_calculation(self):
@@ -200,6 +201,354 @@ class TestReentrySystem(unittest.TestCase):
         self.assertEqual(trade[1], 'EURUSD')
         self.assertEqual(trade[5], 50.0)
 
+class TestSignalQueue(unittest.TestCase):
+    """Unit tests for signal queue ingestion, trigger books and journal"""
+    
+    def _signal(self, signal_id: str, **fields):
+        from signal_queue_risk_system import TradingSignal, SignalPriority
+        
+        values = dict(
+            signal_id=signal_id,
+            symbol="EURUSD",
+            signal_type="economic",
+            direction="BUY",
+            lot_size=0.01,
+            priority=SignalPriority.NORMAL,
+            timestamp=datetime.now()
+        )
+        values.update(fields)
+        return TradingSignal(**values)
+    
+    def test_cancel_follows_add_through_producer_ring(self):
+        """Test a cancel sent through the add's ring is applied after the add"""
+        from signal_queue_risk_system import SignalQueue
+        
+        queue = SignalQueue()
+        queue.submit_cancel("UNRELATED", "default")  # Register another ring first
+        queue.submit(self._signal("B", source="indicator"))
+        queue.submit_cancel("B", "indicator")
+        queue.drain()
+        
+        self.assertNotIn("B", queue.pending_signals)
+    
+    def test_producer_rings_per_thread(self):
+        """Test lock-free rings keep exact counters and refuse a second thread"""
+        import threading
+        from signal_queue_risk_system import SignalQueue
+        
+        queue = SignalQueue(ring_capacity=500)
+        
+        def produce(worker):
+            for i in range(1000):
+                queue.submit(self._signal(f"{worker}_{i}"), producer=f"indicator_{worker}")
+        
+        threads = [threading.Thread(target=produce, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        for worker in range(4):
+            metrics = queue.ingestion_metrics()['producers'][f"indicator_{worker}"]
+            self.assertEqual(metrics['accepted'], 500)
+            self.assertEqual(metrics['rejected'], 500)
+            self.assertEqual(metrics['high_water'], 500)
+        self.assertEqual(queue.drain(budget=10000), 2000)
+        
+        # indicator_0 belongs to its (finished) thread, not to this one
+        with self.assertRaises(RuntimeError):
+            queue.submit(self._signal("LATE"), producer="indicator_0")
+    
+    def test_drain_is_bounded(self):
+        """Test drain stops at its budget and leaves the rest queued"""
+        from signal_queue_risk_system import SignalQueue
+        
+        queue = SignalQueue(ring_capacity=10)
+        for i in range(10):
+            queue.submit(self._signal(f"S{i}", source="indicator"))
+        
+        self.assertEqual(queue.drain(budget=3), 3)
+        self.assertEqual(len(queue.producers['indicator']), 7)
+        self.assertEqual(queue.drain(), 7)
+    
+    def test_journal_recovers_pending_signals(self):
+        """Test a restart rebuilds pending signals from snapshot and journal"""
+        from signal_queue_risk_system import SignalQueue, SignalJournal
+        
+        journal_dir = tempfile.mkdtemp()
+        try:
+            queue = SignalQueue(journal=SignalJournal(journal_dir, snapshot_every=5))
+            queue.add_economic_event_signal({
+                'Time': '2025-08-17 08:30:00',
+                'Currency': 'USD',
+                'Event': 'Non-Farm Payrolls',
+                'Impact': 'High'
+            })
+            for i in range(8):
+                queue.add_price_triggered_signal('EURUSD', 1.1000 - i / 1000, 'BUY', 0.01)
+            queue.drain()
+            queue.cancel_signal(next(iter(queue.pending_signals)))
+            queue.check_price_triggers({'EURUSD': 1.0965})
+            expected = {signal_id: (signal.signal_type, signal.price_threshold, signal.execution_time)
+                        for signal_id, signal in queue.pending_signals.items()}
+            
+            # No close(): every public call is already durable
+            recovered = SignalQueue(journal=SignalJournal(journal_dir))
+            self.assertEqual(
+                {signal_id: (signal.signal_type, signal.price_threshold, signal.execution_time)
+                 for signal_id, signal in recovered.pending_signals.items()},
+                expected)
+            resting = len(recovered.price_signals)
+            self.assertGreater(resting, 0)
+            self.assertEqual(len(recovered.check_price_triggers({'EURUSD': 1.0})), resting)
+        finally:
+            shutil.rmtree(journal_dir)
+    
+    def test_journal_torn_tail_and_corruption(self):
+        """Test only a torn last line is dropped; earlier corruption raises"""
+        from signal_queue_risk_system import SignalQueue, SignalJournal
+        
+        journal_dir = tempfile.mkdtemp()
+        try:
+            queue = SignalQueue(journal=SignalJournal(journal_dir))
+            queue.add_signal(self._signal("A"))
+            queue.add_signal(self._signal("B"))
+            queue.close()
+            
+            journal_path = os.path.join(journal_dir, 'signals.journal')
+            with open(journal_path, 'ab') as f:
+                f.write(b'{"seq":3,"op":"ad')
+            recovered = SignalQueue(journal=SignalJournal(journal_dir))
+            self.assertEqual(set(recovered.pending_signals), {"A", "B"})
+            recovered.add_signal(self._signal("C"))
+            recovered.close()
+            self.assertEqual(set(SignalQueue(journal=SignalJournal(journal_dir)).pending_signals),
+                             {"A", "B", "C"})
+            
+            with open(journal_path, 'rb') as f:
+                lines = f.readlines()
+            lines[0] = b'garbage\n'
+            with open(journal_path, 'wb') as f:
+                f.writelines(lines)
+            with self.assertRaises(ValueError):
+                SignalJournal(journal_dir).load()
+        finally:
+            shutil.rmtree(journal_dir)
+    
+    def test_journal_rejects_unserializable_signal(self):
+        """Test a signal the journal cannot record is not kept in memory"""
+        from signal_queue_risk_system import SignalQueue, SignalJournal
+        
+        journal_dir = tempfile.mkdtemp()
+        try:
+            queue = SignalQueue(journal=SignalJournal(journal_dir))
+            with self.assertRaises(TypeError):
+                queue.add_signal(self._signal("BAD", metadata={'at': datetime.now()}))
+            self.assertNotIn("BAD", queue.pending_signals)
+            queue.close()
+        finally:
+            shutil.rmtree(journal_dir)
+    
+    def test_price_triggers_match_linear_scan(self):
+        """Test trigger books fire exactly the signals a linear scan would"""
+        import random
+        from signal_queue_risk_system import SignalQueue
+        
+        rng = random.Random(42)
+        symbols = ["EURUSD", "GBPUSD", "USDJPY"]
+        queue = SignalQueue()
+        expected = {}  # Reference: every pending signal, scanned in full
+        
+        for step in range(2000):
+            action = rng.random()
+            if action < 0.5:
+                signal = self._signal(
+                    f"S{step}",
+                    symbol=rng.choice(symbols),
+                    signal_type=rng.choice(["price", "price", "economic"]),
+                    direction=rng.choice(["BUY", "SELL", "CLOSE"]),
+                    # Coarse levels so ties and exact hits are common
+                    price_threshold=rng.choice([None, round(rng.uniform(1.0, 1.2), 2)])
+                )
+                queue.add_signal(signal)
+                expected[signal.signal_id] = signal
+            elif action < 0.6 and expected:
+                signal_id = rng.choice(sorted(expected))
+                queue.cancel_signal(signal_id)
+                del expected[signal_id]
+            else:
+                prices = {symbol: round(rng.uniform(1.0, 1.2), 2)
+                          for symbol in rng.sample(symbols, rng.randint(1, len(symbols)))}
+                crossed = set()
+                for signal_id, signal in expected.items():
+                    if signal.signal_type != 'price' or not signal.price_threshold:
+                        continue
+                    current = prices.get(signal.symbol)
+                    if not current:
+                        continue
+                    if (signal.direction == 'BUY' and current <= signal.price_threshold) or \
+                       (signal.direction == 'SELL' and current >= signal.price_threshold):
+                        crossed.add(signal_id)
+                for signal_id in crossed:
+                    del expected[signal_id]
+        
+                triggered = queue.check_price_triggers(prices)
+                self.assertEqual(len(triggered), len(crossed))
+                self.assertEqual({signal.signal_id for signal in triggered}, crossed)
+        
+            self.assertEqual(set(queue.pending_signals), set(expected))
+
+class TestBridgeConnection(unittest.TestCase):
+    """Unit tests for the pipelined MT4 bridge connection against stub servers"""
+    
+    def _signal(self, signal_id: str):
+        from signal_queue_risk_system import TradingSignal, SignalPriority
+        
+        return TradingSignal(
+            signal_id=signal_id,
+            symbol="EURUSD",
+            signal_type="economic",
+            direction="BUY",
+            lot_size=0.01,
+            priority=SignalPriority.NORMAL,
+            timestamp=datetime.now()
+        )
+    
+    def _run(self, handler, scenario):
+        """Serve handler on a free local port and run scenario(port) against it"""
+        connections = []
+        
+        async def serve(reader, writer):
+            connections.append(asyncio.current_task())
+            await handler(reader, writer)
+        
+        async def main():
+            server = await asyncio.start_server(serve, '127.0.0.1', 0)
+            try:
+                return await scenario(server.sockets[0].getsockname()[1])
+            finally:
+                server.close()
+                await server.wait_closed()
+                if connections:
+                    await asyncio.wait(connections, timeout=1)  # Let handlers see the hang-up
+        
+        return asyncio.run(main())
+    
+    def test_out_of_order_acks_matched_by_correlation_id(self):
+        """Test version 2 acks resolve the right sends in any order"""
+        from signal_queue_risk_system import BridgeConnection
+        
+        async def handler(reader, writer):
+            received = []
+            for _ in range(3):
+                header = await reader.readexactly(BridgeConnection.BINARY_HEADER.size)
+                correlation_id, length = BridgeConnection.BINARY_HEADER.unpack(header)
+                message = pickle.loads(await reader.readexactly(length))
+                received.append((correlation_id, message['signal_id']))
+            for correlation_id, signal_id in reversed(received):
+                status = b'NAK' if signal_id == 'B' else b'ACK'
+                writer.write(BridgeConnection.BINARY_ACK.pack(correlation_id, status))
+            await writer.drain()
+            await reader.read()
+        
+        async def scenario(port):
+            bridge = BridgeConnection('127.0.0.1', port, protocol_version=2)
+            try:
+                return await asyncio.gather(*(bridge.send(self._signal(signal_id))
+                                              for signal_id in "ABC"))
+            finally:
+                await bridge.close()
+        
+        self.assertEqual(self._run(handler, scenario), [True, False, True])
+    
+    def test_nak_and_timeout(self):
+        """Test a failed status and a missing ack both report False"""
+        from signal_queue_risk_system import BridgeConnection
+        
+        async def handler(reader, writer):
+            first = json.loads(await reader.readline())
+            await reader.readline()  # Never acknowledged
+            writer.write((json.dumps({'correlation_id': first['correlation_id'],
+                                      'status': 'REJECTED'}) + '\n').encode())
+            await writer.drain()
+            await reader.read()
+        
+        async def scenario(port):
+            bridge = BridgeConnection('127.0.0.1', port, 'json', ack_timeout=0.2, protocol_version=2)
+            try:
+                return await asyncio.gather(bridge.send(self._signal("A")),
+                                            bridge.send(self._signal("B")))
+            finally:
+                await bridge.close()
+        
+        self.assertEqual(self._run(handler, scenario), [False, False])
+    
+    def test_reconnect_after_connection_dropped_before_write(self):
+        """Test a connection the bridge closed is replaced before the next write"""
+        from signal_queue_risk_system import BridgeConnection
+        
+        connections = []
+        
+        async def handler(reader, writer):
+            connections.append(writer)
+            message = json.loads(await reader.readline())
+            writer.write((json.dumps({'correlation_id': message['correlation_id'],
+                                      'status': 'SUCCESS'}) + '\n').encode())
+            await writer.drain()
+            writer.close()  # Bridge hangs up after one signal
+        
+        async def scenario(port):
+            bridge = BridgeConnection('127.0.0.1', port, 'json', protocol_version=2)
+            try:
+                first = await bridge.send(self._signal("A"))
+                await asyncio.sleep(0.05)  # Let the reader see the hang-up
+                second = await bridge.send(self._signal("B"))
+                return first, second
+            finally:
+                await bridge.close()
+        
+        self.assertEqual(self._run(handler, scenario), (True, True))
+        self.assertEqual(len(connections), 2)
+    
+    def test_malformed_ack_lines_are_skipped(self):
+        """Test non-object and invalid JSON ack lines do not kill the reader"""
+        from signal_queue_risk_system import BridgeConnection
+        
+        async def handler(reader, writer):
+            message = json.loads(await reader.readline())
+            writer.write(b'"OK"\n1\n[1, 2]\nnot json\n{"correlation_id": [1]}\n')
+            writer.write((json.dumps({'correlation_id': message['correlation_id'],
+                                      'status': 'SUCCESS'}) + '\n').encode())
+            await writer.drain()
+            await reader.read()
+        
+        async def scenario(port):
+            bridge = BridgeConnection('127.0.0.1', port, 'json', ack_timeout=1, protocol_version=2)
+            try:
+                return await bridge.send(self._signal("A"))
+            finally:
+                await bridge.close()
+        
+        self.assertTrue(self._run(handler, scenario))
+    
+    def test_legacy_protocol_is_default(self):
+        """Test the default framing still talks to a version 1 bridge"""
+        from signal_queue_risk_system import ThreeTierCommunication
+        
+        receiver = ThreeTierCommunication()
+        
+        async def scenario(port):
+            sender = ThreeTierCommunication('127.0.0.1', port, pool_size=1)
+            try:
+                return await asyncio.gather(*(sender.send_signal_binary(self._signal(signal_id))
+                                              for signal_id in "ABC"))
+            finally:
+                await sender.close()
+        
+        self.assertEqual(self._run(receiver.create_mt4_bridge_server(), scenario), [True] * 3)
+        received = [receiver.message_queue.get_nowait()['signal_id'] for _ in range(3)]
+        self.assertEqual(received, ["A", "B", "C"])
+
 # ============== POWERSHELL SCRIPT TESTING ==============
 
 class PowerShellTestRunner:
@@ -0,0 +1,31 @@
+"""Shared pytest setup: import the source trees in place, as bench_reentry_core.py does."""
+import os, pathlib, sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "reentry_core", ROOT / "reentry_service"):
+    if str(path) not in sys.path: sys.path.insert(0, str(path))
+
+# Read by both services at import; kept small so the over-limit requests stay cheap.
+os.environ["REENTRY_BATCH_MAX"] = "100"
+
+from bench_reentry_core import SCENARIOS, sample_combos, synthetic_blueprint  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def small_blueprint():
+    return synthetic_blueprint(*SCENARIOS["small"])
+
+
+@pytest.fixture(scope="session")
+def small_blueprint_path(small_blueprint, tmp_path_factory):
+    import json
+    path = tmp_path_factory.mktemp("blueprint") / "blueprint.json"
+    path.write_text(json.dumps(small_blueprint), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def combos(small_blueprint):
+    return sample_combos(small_blueprint, 20)
@@ -0,0 +1,47 @@
+"""TestClient tests for the batch routes of app.py."""
+import pytest
+
+fastapi = pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app as api  # noqa: E402
+
+
+@pytest.fixture
+def client(small_blueprint_path, monkeypatch):
+    monkeypatch.setattr(api, "DEFAULT_BLUEPRINT_PATH", str(small_blueprint_path))
+    monkeypatch.setattr(api, "DEFAULT_SCHEMA_PATH", "")
+    api._bp_cache.clear()
+    with TestClient(api.app) as c:
+        yield c
+
+
+def test_batch_endpoints_match_single(client, combos):
+    for route in ("/decide", "/cell"):
+        r = client.post(f"{route}/batch", json={"combos": combos})
+        assert r.status_code == 200
+        assert r.json() == {"results": [client.post(route, json={"combo": c}).json() for c in combos]}
+
+
+def test_batch_rejects_invalid_combos_by_index(client, combos):
+    bad = [dict(combos[0], signal_type="NOPE"), combos[1], dict(combos[2], symbol="eur/usd")]
+    for route in ("/decide/batch", "/cell/batch"):
+        r = client.post(route, json={"combos": bad})
+        assert r.status_code == 400
+        assert [e["index"] for e in r.json()["detail"]] == [0, 2]
+
+
+def test_batch_over_limit_rejected(client, combos):
+    assert api.BATCH_MAX == 100
+    for route in ("/decide/batch", "/cell/batch"):
+        assert client.post(route, json={"combos": [combos[0]] * 100}).status_code == 200
+        r = client.post(route, json={"combos": [combos[0]] * 101})
+        assert r.status_code == 422
+        assert r.json()["detail"][0]["loc"][-1] == "combos"
+
+
+def test_batch_with_explicit_blueprint_path(client, combos, small_blueprint_path):
+    r = client.post("/decide/batch", json={"combos": combos[:3], "blueprint_path": str(small_blueprint_path)})
+    assert r.status_code == 200 and len(r.json()["results"]) == 3
+    r = client.post("/decide/batch", json={"combos": combos[:3], "blueprint_path": "/nonexistent.yaml"})
+    assert r.status_code == 400
@@ -0,0 +1,230 @@
+"""Parity and edge-case tests for reentry_core: compiled table, $calc, evaluate_matrix, IDCodec, ComboValidator."""
+import copy, itertools, math
+
+import numpy as np
+import pytest
+
+from bench_reentry_core import SCENARIOS, synthetic_blueprint
+from reentry_core import ComboValidator, IDCodec, RuleEngine
+from reentry_core.table import AXES, blueprint_axes
+from reentry_core.util import compile_calc
+
+
+def _all_combos(bp, symbol="EURUSD"):
+    axes = blueprint_axes(bp)
+    for values in itertools.product(*(axes[f] for f in AXES)):
+        yield dict(zip(AXES, values), symbol=symbol)
+
+
+@pytest.fixture(scope="module", params=["small", "medium"])
+def blueprint(request):
+    return synthetic_blueprint(*SCENARIOS[request.param])
+
+
+def _cell_rule(bp, **set_cell):
+    # Highest-priority cell rule that matches every combination.
+    bp["rules"]["default_cell_rules"].insert(0, {"id": "CELL-TEST", "priority": 10**6, "when": {}, "set_cell": {"action": "SAME_TRADE", **set_cell}})
+    return bp
+
+
+# ---------------- Compiled table ----------------
+def test_compiled_table_matches_interpreter(blueprint):
+    compiled, interp = RuleEngine(blueprint), RuleEngine(blueprint)
+    table = compiled.compile()
+    assert table is not None and len(table) == math.prod(len(v) for v in blueprint_axes(blueprint).values())
+    for combo in _all_combos(blueprint):
+        assert compiled.evaluate_invariants(combo) == interp.evaluate_invariants(combo)
+        assert compiled.evaluate_combination_defaults(combo) == interp.evaluate_combination_defaults(combo)
+        assert compiled.evaluate_cell(combo) == interp.evaluate_cell(combo)
+
+
+def test_compiled_results_are_copies(small_blueprint):
+    engine = RuleEngine(small_blueprint)
+    engine.compile()
+    combo = next(_all_combos(small_blueprint))
+    engine.evaluate_cell(combo)["action"] = "MUTATED"
+    engine.evaluate_decision(combo)["parameter_set"]["size_multiplier"] = -1
+    assert engine.evaluate_cell(combo)["action"] != "MUTATED"
+    assert engine.evaluate_decision(combo)["parameter_set"].get("size_multiplier") != -1
+
+
+def test_values_outside_the_table_fall_back_to_interpreter(small_blueprint):
+    engine = RuleEngine(small_blueprint)
+    engine.compile()
+    combo = dict(next(_all_combos(small_blueprint)), generation=99)
+    assert engine.table.index(combo) is None
+    assert engine.evaluate_cell(combo) == RuleEngine(small_blueprint)._interp_cell(combo)
+
+
+def test_symbol_rules_are_not_compiled(small_blueprint):
+    bp = copy.deepcopy(small_blueprint)
+    bp["rules"]["invariants"][0]["when"] = {"all_of": [{"field": "symbol", "op": "eq", "value": "XAUUSD"}]}
+    engine = RuleEngine(bp)
+    assert engine.compile() is None
+    combo = dict(next(_all_combos(bp)), symbol="XAUUSD")
+    assert engine.evaluate_decision(combo)["decision"] == "END_TRADING"
+
+
+# ---------------- $calc and $ref ----------------
+def test_calc_division_by_zero_fails_only_its_combos(small_blueprint):
+    bp = _cell_rule(copy.deepcopy(small_blueprint), delay_minutes="$calc:10 / (generation - 1)")
+    engine = RuleEngine(bp)
+    assert engine.compile() is None  # Startup survives; the engine stays interpreted
+    combo = next(_all_combos(bp))
+    assert engine.evaluate_cell(dict(combo, generation=3))["delay_minutes"] == 5.0
+    with pytest.raises(ZeroDivisionError):
+        engine.evaluate_cell(dict(combo, generation=1))
+
+
+def test_invalid_calc_fails_only_its_rule(small_blueprint):
+    bp = copy.deepcopy(small_blueprint)
+    bp["rules"]["default_cell_rules"].insert(0, {
+        "id": "CELL-BAD", "priority": 10**6, "when": {"all_of": [{"field": "outcome", "op": "eq", "value": 1}]},
+        "set_cell": {"action": "SAME_TRADE", "size_multiplier": "$calc:__import__('os')"},
+    })
+    engine = RuleEngine(bp)
+    assert engine.compile() is None
+    combo = next(_all_combos(bp))
+    assert engine.evaluate_cell(dict(combo, outcome=2)) == RuleEngine(small_blueprint).evaluate_cell(dict(combo, outcome=2))
+    with pytest.raises(ValueError, match="CELL-BAD"):
+        engine.evaluate_cell(dict(combo, outcome=1))
+
+
+def test_calc_memo_matches_fresh_evaluation(small_blueprint):
+    expr = "0.5 * enumerations.time_category.volatility_factor[time_category] + 0.1 * outcome"
+    consts = {"enumerations": small_blueprint["enumerations"], "defaults": small_blueprint["defaults"]}
+    calc = compile_calc(expr, consts)
+    assert calc.fields == {"time_category", "outcome"}
+    factors = small_blueprint["enumerations"]["time_category"]["volatility_factor"]
+    for _ in range(2):  # Second pass is served from the memo
+        for combo in _all_combos(small_blueprint):
+            expected = 0.5 * factors[combo["time_category"]] + 0.1 * combo["outcome"]
+            assert calc(combo) == expected
+    # Keys are the fields the expression reads; other fields never split the memo.
+    assert len(calc._memo) == len(factors) * len(small_blueprint["enumerations"]["outcome"]["allowed"])
+    with pytest.raises(ValueError, match="Unknown name"):
+        calc({"time_category": "FLASH"})
+
+
+def test_ref_values_resolve_in_table_and_interpreter(small_blueprint):
+    bp = copy.deepcopy(small_blueprint)
+    bp["defaults"]["news_delay"] = 45
+    bp["rules"]["invariants"].insert(0, {
+        "id": "INV-REF", "priority": 10**6,
+        "when": {"all_of": [{"field": "generation", "op": "ge", "value": "$ref.defaults.max_generation"}]},
+        "then": {"decision": "END_TRADING", "parameter_overrides": {"delay_minutes": "$ref.defaults.news_delay"}},
+    })
+    compiled, interp = RuleEngine(bp), RuleEngine(bp)
+    assert compiled.compile() is not None
+    top = bp["defaults"]["max_generation"]
+    for combo in _all_combos(bp):
+        res = compiled.evaluate_decision(combo)
+        assert res == interp.evaluate_decision(combo)
+        if combo["generation"] >= top:
+            assert res == {"decision": "END_TRADING", "parameter_set": {"delay_minutes": 45}}
+
+
+def test_dangling_ref_does_not_fail_compile(small_blueprint):
+    bp = _cell_rule(copy.deepcopy(small_blueprint), delay_minutes="$ref.defaults.missing")
+    engine = RuleEngine(bp)
+    assert engine.compile() is None
+    with pytest.raises(KeyError):
+        engine.evaluate_cell(next(_all_combos(bp)))
+
+
+# ---------------- evaluate_matrix ----------------
+def test_evaluate_matrix_matches_interpreter(blueprint):
+    engine = RuleEngine(blueprint)
+    m = engine.evaluate_matrix("EURUSD")
+    param_cols = [c for c in m if c.startswith("param_")]
+    for i, combo in enumerate(_all_combos(blueprint)):
+        assert {f: (m[f][i].item() if hasattr(m[f][i], "item") else m[f][i]) for f in AXES} == {f: combo[f] for f in AXES}
+        inv = engine.evaluate_invariants(combo)
+        decision = engine.evaluate_decision(combo)
+        assert m["decision"][i] == decision["decision"]
+        assert m["decision_source"][i] == ("invariant" if inv else "default_rules")
+        params = decision["parameter_set"]
+        for col in param_cols:
+            val = m[col][i]
+            key = col[len("param_"):]
+            if key in params: assert val == pytest.approx(params[key])
+            else: assert val is None or np.isnan(val)
+        cell = engine.evaluate_cell(combo)
+        assert m["action"][i] == cell["action"]
+        for k in ("size_multiplier", "confidence_adjustment", "delay_minutes", "max_attempts"):
+            assert m[f"cell_{k}"][i] == pytest.approx(cell[k])
+
+
+# ---------------- IDCodec ----------------
+def test_encode_many_round_trips_matrix(small_blueprint):
+    codec = IDCodec.from_blueprint(small_blueprint)
+    cols = RuleEngine(small_blueprint).evaluate_matrix("EURUSD")
+    keys = codec.encode_many(cols)
+    assert keys.dtype == np.int64 and len(np.unique(keys)) == len(keys)
+    back = codec.decode_many(keys)
+    for f in ("symbol",) + AXES:
+        assert list(back[f]) == [v.item() if hasattr(v, "item") else v for v in cols[f]]
+    combos = list(_all_combos(small_blueprint))
+    assert list(keys[:50]) == [codec.encode(c) for c in combos[:50]]
+    assert codec.encode_many(combos[:50]).tolist() == keys[:50].tolist()
+    # NumPy keys from encode_many parse like plain ints
+    assert codec.parse(keys[7]) == codec.decode(int(keys[7])) == combos[7]
+
+
+def test_symbol_packing_limits(small_blueprint):
+    codec = IDCodec.from_blueprint(small_blueprint)
+    combo = next(_all_combos(small_blueprint))
+    long_symbol = "XAUUSD.MICRO_1"
+    assert codec.decode(codec.encode(dict(combo, symbol=long_symbol)))["symbol"] == long_symbol
+    # Past int64 the batch path switches to Python ints instead of overflowing.
+    keys = codec.encode_many([dict(combo, symbol=long_symbol), combo])
+    assert keys.dtype == object and keys[0] >= 2**63
+    assert list(codec.decode_many(keys)["symbol"]) == [long_symbol, combo["symbol"]]
+    for bad in ("eurusd", "EUR/USD"):
+        with pytest.raises(ValueError, match="outside"):
+            codec.encode(dict(combo, symbol=bad))
+        with pytest.raises(ValueError, match="outside"):
+            codec.encode_many([dict(combo, symbol=bad)])
+
+
+def test_codec_rejects_invalid_keys_and_combos(small_blueprint):
+    codec = IDCodec.from_blueprint(small_blueprint)
+    combo = next(_all_combos(small_blueprint))
+    with pytest.raises(ValueError):
+        codec.encode(dict(combo, context="NOPE"))
+    with pytest.raises(ValueError):
+        codec.encode_many([dict(combo, context="NOPE")])
+    with pytest.raises(ValueError):
+        codec.decode(-1)
+    with pytest.raises(ValueError):
+        codec.decode_many(np.array([-1]))
+    with pytest.raises(ValueError):
+        codec.decode_many(np.array([1.5]))
+    with pytest.raises(ValueError):
+        codec.parse("not-an-id")
+    readable = codec.build(combo)
+    assert codec.parse(readable) == combo
+
+
+# ---------------- ComboValidator ----------------
+def test_validator_reports_invalid_combos(small_blueprint):
+    validator = ComboValidator.from_blueprint(small_blueprint)
+    combo = next(_all_combos(small_blueprint))
+    assert validator.error(combo) is None
+    assert validator.error(dict(combo, signal_type="NOPE")) == "Invalid signal_type: NOPE"
+    assert validator.error(dict(combo, outcome=7)) == "Invalid outcome: 7"
+    assert validator.error(dict(combo, context=["CTX_0"])) == "Invalid context: ['CTX_0']"  # Unhashable
+    assert validator.error(dict(combo, generation=99)).startswith("generation out of range")
+    assert validator.error(dict(combo, symbol="eur usd")).startswith("symbol does not match pattern")
+    with pytest.raises(ValueError):
+        validator.validate(dict(combo, outcome=0))
+    batch = [combo, dict(combo, outcome=0), combo, dict(combo, generation=-1)]
+    assert [e["index"] for e in validator.errors(batch)] == [1, 3]
+
+
+def test_validator_skips_checks_the_blueprint_omits(small_blueprint):
+    bp = copy.deepcopy(small_blueprint)
+    del bp["enumerations"]["context"], bp["enumerations"]["generation"], bp["enumerations"]["symbol"]
+    validator = ComboValidator.from_blueprint(bp)
+    combo = next(_all_combos(small_blueprint))
+    assert validator.error(dict(combo, context="ANY", generation=10**6, symbol="any thing")) is None
@@ -0,0 +1,108 @@
+"""TestClient tests for reentry_service/reentry_service/main.py."""
+import json
+
+import pytest
+
+fastapi = pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient  # noqa: E402
+
+import reentry_service.main as svc  # noqa: E402
+
+
+@pytest.fixture
+def client(small_blueprint_path, monkeypatch):
+    monkeypatch.setattr(svc, "BLUEPRINT_PATH", str(small_blueprint_path))
+    monkeypatch.setattr(svc, "SCHEMA_PATH", None)
+    with TestClient(svc.app) as c:
+        yield c
+
+
+def _ndjson(lines):
+    return "".join(line + "\n" for line in lines).encode("utf-8")
+
+
+def _stream(client, body):
+    r = client.post("/decide/stream", content=body, headers={"content-type": "application/x-ndjson"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in r.text.splitlines()]
+
+
+def test_stream_matches_single_decide(client, combos):
+    out = _stream(client, _ndjson(json.dumps(c) for c in combos))
+    assert out == [client.post("/decide", json=c).json() for c in combos]
+
+
+def test_stream_reports_bad_lines_and_continues(client, combos):
+    bad_enum = dict(combos[1], signal_type="NOPE")
+    body = _ndjson([json.dumps(combos[0]), "not json", "", json.dumps(bad_enum), json.dumps(combos[2])])
+    out = _stream(client, body)
+    assert len(out) == 4  # Blank lines are skipped without taking an index
+    assert out[0]["combination_id"] and out[3]["combination_id"]
+    assert out[1]["index"] == 1 and "error" in out[1]
+    assert out[2] == {"index": 2, "error": "Invalid signal_type: NOPE"}
+
+
+def test_stream_last_line_without_newline(client, combos):
+    out = _stream(client, (json.dumps(combos[0]) + "\n" + json.dumps(combos[1])).encode("utf-8"))
+    assert [o["combination_id"] for o in out] == [client.post("/decide", json=c).json()["combination_id"] for c in combos[:2]]
+
+
+def test_stream_skips_overlong_line(client, combos, monkeypatch):
+    monkeypatch.setattr(svc, "STREAM_MAX_LINE", 256)
+    huge = json.dumps(dict(combos[0], padding="x" * 1000))
+
+    def chunks():
+        # The overlong line arrives split across chunks, so it is dropped while still buffering.
+        yield (json.dumps(combos[0]) + "\n" + huge[:300]).encode("utf-8")
+        yield (huge[300:] + "\n" + json.dumps(combos[1]) + "\n").encode("utf-8")
+
+    out = _stream(client, chunks())
+    assert len(out) == 3
+    assert out[1] == {"index": 1, "error": "line exceeds 256 bytes"}
+    assert out[2] == client.post("/decide", json=combos[1]).json()
+
+    out = _stream(client, _ndjson([huge, json.dumps(combos[1])]))
+    assert out[0] == {"index": 0, "error": "line exceeds 256 bytes"}
+    assert out[1] == client.post("/decide", json=combos[1]).json()
+
+
+def test_stream_evaluates_off_the_event_loop(client, combos, monkeypatch):
+    import asyncio
+    on_loop = []
+    stream_line = svc._stream_line
+
+    def spy(index, line):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(index)
+        except RuntimeError:
+            pass  # Worker thread: no running loop
+        return stream_line(index, line)
+
+    monkeypatch.setattr(svc, "_stream_line", spy)
+    out = _stream(client, (json.dumps(combos[0]) + "\n" + json.dumps(combos[1])).encode("utf-8"))
+    assert len(out) == 2 and on_loop == []
+
+
+def test_batch_endpoints_match_single(client, combos):
+    for route in ("/decide", "/cell"):
+        r = client.post(f"{route}/batch", json={"combos": combos})
+        assert r.status_code == 200
+        assert r.json() == {"results": [client.post(route, json=c).json() for c in combos]}
+
+
+def test_batch_rejects_invalid_combos_by_index(client, combos):
+    bad = [combos[0], dict(combos[1], context="NOPE"), dict(combos[2], generation=99)]
+    for route in ("/decide/batch", "/cell/batch"):
+        r = client.post(route, json={"combos": bad})
+        assert r.status_code == 400
+        assert [e["index"] for e in r.json()["detail"]] == [1, 2]
+
+
+def test_batch_over_limit_rejected(client, combos):
+    assert svc.BATCH_MAX == 100
+    for route in ("/decide/batch", "/cell/batch"):
+        assert client.post(route, json={"combos": [combos[0]] * 100}).status_code == 200
+        r = client.post(route, json={"combos": [combos[0]] * 101})
+        assert r.status_code == 422